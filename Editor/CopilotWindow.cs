@@ -44,6 +44,7 @@ namespace Observater.AiSkills.Editor
         private Foldout _logFoldout;
         private Foldout _settingsFoldout;
         private Toggle _debugToggle;
+        private Toggle _followupToggle;
 
         private VisualElement _currentStatusContainer;
         private Label _currentStatusLabel;
@@ -54,8 +55,11 @@ namespace Observater.AiSkills.Editor
         private bool _historyLoaded = false;
 
         private UnityWebRequest _currentRequest;
+        private string _currentJobId;
+        private JObject _finalResponse;
+        private int _streamedItems;
 
-        private readonly string[] _binaryExtensions = { ".dll", ".exe", ".so", ".png", ".jpg", ".mat", ".prefab", ".meta" };
+        private readonly string[] _binaryExtensions = { ".dll", ".exe", ".so", ".png", ".jpg", ".meta" };
 
         [MenuItem("Tools/AI Copilot")]
         public static void ShowWindow()
@@ -474,6 +478,15 @@ namespace Observater.AiSkills.Editor
                 style = { fontSize = 10, backgroundColor = new Color(0.3f, 0.3f, 0.3f), color = Color.white }
             });
 
+            _followupToggle = new Toggle("Follow-up")
+            {
+                value = false,
+                tooltip = "Patch the previous script instead of regenerating it.",
+                style = { fontSize = 10, marginLeft = 6 }
+            };
+            StyleToggleLabel(_followupToggle);
+            row.Add(_followupToggle);
+
             parent.Add(row);
         }
 
@@ -526,7 +539,8 @@ namespace Observater.AiSkills.Editor
 
             if (path.EndsWith(".cs") || path.EndsWith(".json") || path.EndsWith(".txt") ||
                 path.EndsWith(".xml") || path.EndsWith(".yaml") || path.EndsWith(".shader") ||
-                path.EndsWith(".compute") || path.EndsWith(".md"))
+                path.EndsWith(".compute") || path.EndsWith(".md") || path.EndsWith(".unity") ||
+                path.EndsWith(".prefab") || path.EndsWith(".mat") || path.EndsWith(".asset"))
             {
                 _attachments.Add(path);
                 return true;
@@ -586,6 +600,12 @@ namespace Observater.AiSkills.Editor
 
         private void CancelRequest()
         {
+            if (!string.IsNullOrEmpty(_currentJobId))
+            {
+                var cancelReq = UnityWebRequest.Post($"http://127.0.0.1:{AiSkillsBridge.Config.Port}/jobs/{_currentJobId}/cancel", "{}", "application/json");
+                cancelReq.SendWebRequest().completed += _ => cancelReq.Dispose();
+                _currentJobId = null;
+            }
             if (_currentRequest != null)
             {
                 _currentRequest.Abort();
@@ -650,14 +670,18 @@ namespace Observater.AiSkills.Editor
                 ["model"] = config.Model,
 
                 ["attachments"] = JArray.FromObject(attachments),
-                ["project_root"] = projectRoot
+                ["project_root"] = projectRoot,
+                ["followup"] = _followupToggle != null && _followupToggle.value
             };
 
-            _currentRequest = UnityWebRequest.Post($"http://127.0.0.1:{config.Port}/chat",
+            _currentRequest = UnityWebRequest.Post($"http://127.0.0.1:{config.Port}/chat/stream",
                 json.ToString(), "application/json");
 
-            _currentRequest.downloadHandler = new DownloadHandlerBuffer();
-            _currentRequest.timeout = 300;
+            _currentJobId = null;
+            _finalResponse = null;
+            _streamedItems = 0;
+            _currentRequest.downloadHandler = new NdjsonDownloadHandler(HandleStreamEvent);
+            _currentRequest.timeout = 0;
             _currentRequest.disposeUploadHandlerOnDispose = true;
             _currentRequest.disposeDownloadHandlerOnDispose = true;
 
@@ -678,9 +702,10 @@ namespace Observater.AiSkills.Editor
             if (_currentRequest.result == UnityWebRequest.Result.Success)
             {
                 HandleStatusLog("[Net] Response Received");
+                if (_streamedItems > 0) HandleStatusLog($"[Info] Streamed {_streamedItems} items");
                 try
                 {
-                    var root = JObject.Parse(_currentRequest.downloadHandler.text);
+                    var root = _finalResponse ?? throw new Exception("Stream ended without a result");
                     string aiReply = root["reply"]?.ToString() ?? "No reply";
                     string summary = root["summary"]?.ToString();
 
@@ -707,6 +732,15 @@ namespace Observater.AiSkills.Editor
                         HandleStatusLog($"[Summary] {summary}");
                     }
 
+                    var patch = root["patch"];
+                    if (patch != null && patch.Type == JTokenType.Object)
+                    {
+                        if (patch["applied"]?.Value<bool>() == true)
+                            HandleStatusLog($"[Patch] Applied ({patch["mode"]})");
+                        else
+                            HandleStatusLog($"[Error] Patch Failed: {patch["error"]}");
+                    }
+
                     AddMessage("AI", skillHeader + aiReply, false);
 
                     if (root["execution"] != null)
@@ -714,6 +748,11 @@ namespace Observater.AiSkills.Editor
                         var exec = root["execution"];
                         string status = exec["status"]?.ToString();
                         string msg = exec["message"]?.ToString() ?? "";
+                        if (exec["logs"] is JObject logs)
+                        {
+                            HandleStatusLog($"[Log] Script printed {logs["total"]} lines ({logs["dropped"]} dropped)");
+                            foreach (var line in logs["lines"] ?? new JArray()) HandleStatusLog($"[Log] {line}");
+                        }
                         if (status == "error") HandleStatusLog($"[Error] Unity Execution: {msg}");
                         else HandleStatusLog($"[OK] Unity Execution: {msg}");
                     }
@@ -726,6 +765,37 @@ namespace Observater.AiSkills.Editor
 
             _currentRequest.Dispose();
             _currentRequest = null;
+            _currentJobId = null;
+        }
+
+        private void HandleStreamEvent(JObject evt)
+        {
+            switch (evt["event"]?.ToString())
+            {
+                case "reply":
+                    HandleStatusLog("[Net] Script generated, running in Unity...");
+                    break;
+                case "job":
+                    _currentJobId = evt["job_id"]?.ToString();
+                    break;
+                case "repair":
+                    HandleStatusLog($"[Net] Script failed, retrying with a fix (attempt {evt["attempt"]})...");
+                    break;
+                case "progress":
+                    int done = evt["done"]?.Value<int>() ?? 0;
+                    int total = evt["total"]?.Value<int>() ?? 0;
+                    string label = evt["label"]?.ToString();
+                    string percent = total > 0 ? $" ({done * 100 / total}%)" : "";
+                    if (_currentStatusLabel != null) _currentStatusLabel.text = $"{label} {done}/{total}{percent}".Trim();
+                    break;
+                case "chunk":
+                    _streamedItems += (evt["items"] as JArray)?.Count ?? 0;
+                    if (_currentStatusLabel != null) _currentStatusLabel.text = $"Receiving results... {_streamedItems} items";
+                    break;
+                case "done":
+                    _finalResponse = evt;
+                    break;
+            }
         }
 
         private void SetPadding(IStyle s, float v) { s.paddingTop = v; s.paddingBottom = v; s.paddingLeft = v; s.paddingRight = v; }
@@ -0,0 +1,65 @@
+using System;
+using System.Text;
+using Newtonsoft.Json.Linq;
+using UnityEngine;
+using UnityEngine.Networking;
+
+namespace Observater.AiSkills.Editor
+{
+    internal class NdjsonDownloadHandler : DownloadHandlerScript
+    {
+        private readonly Action<JObject> _onEvent;
+        private readonly Decoder _decoder = Encoding.UTF8.GetDecoder();
+        private readonly StringBuilder _pending = new StringBuilder();
+
+        public NdjsonDownloadHandler(Action<JObject> onEvent) : base(new byte[16 * 1024])
+        {
+            _onEvent = onEvent;
+        }
+
+        protected override bool ReceiveData(byte[] data, int dataLength)
+        {
+            if (data == null || dataLength == 0) return true;
+
+            var chars = new char[_decoder.GetCharCount(data, 0, dataLength)];
+            _decoder.GetChars(data, 0, dataLength, chars, 0);
+            _pending.Append(chars);
+            Flush(false);
+            return true;
+        }
+
+        protected override void CompleteContent()
+        {
+            Flush(true);
+        }
+
+        private void Flush(bool final)
+        {
+            string text = _pending.ToString();
+            int start = 0;
+            int newline;
+            while ((newline = text.IndexOf('\n', start)) >= 0)
+            {
+                Emit(text.Substring(start, newline - start));
+                start = newline + 1;
+            }
+
+            _pending.Clear();
+            if (final) Emit(text.Substring(start));
+            else _pending.Append(text, start, text.Length - start);
+        }
+
+        private void Emit(string line)
+        {
+            if (string.IsNullOrWhiteSpace(line)) return;
+            try
+            {
+                _onEvent(JObject.Parse(line));
+            }
+            catch (Exception e)
+            {
+                Debug.LogWarning($"[AiSkills] Bad stream event: {e.Message}");
+            }
+        }
+    }
+}
@@ -0,0 +1,107 @@
+using System;
+using System.Collections.Generic;
+using UnityEditor;
+using UnityEngine;
+using Object = UnityEngine.Object;
+
+namespace Observater.AiSkills.Runtime.Core
+{
+    public static partial class AiSkillsBridge
+    {
+        public static class Bulk
+        {
+            public const string UNDO_NAME = "AI Skills Bulk";
+
+            public static int SetTransforms(string[] names, float[] packed, string layout = "prs")
+            {
+                return Apply(ResolveNames(names), packed, layout);
+            }
+
+            public static int SetTransforms(int[] instanceIds, float[] packed, string layout = "prs")
+            {
+                return Apply(ResolveIds(instanceIds), packed, layout);
+            }
+
+            public static int[] SpawnPrefab(string path, float[] positions, string parentName = null, string namePrefix = null)
+            {
+                var prefab = AssetDatabase.LoadAssetAtPath<GameObject>(path);
+                if (prefab == null) throw new ArgumentException($"Prefab not found: {path}");
+                if (positions == null || positions.Length % 3 != 0)
+                    throw new ArgumentException("positions must contain x, y, z for every instance.");
+
+                Transform parent = null;
+                if (!string.IsNullOrEmpty(parentName))
+                {
+                    var parentObj = Hierarchy.Find(parentName);
+                    if (parentObj == null) throw new ArgumentException($"Parent not found: {parentName}");
+                    parent = parentObj.transform;
+                }
+
+                var ids = new int[positions.Length / 3];
+                for (int i = 0; i < ids.Length; i++)
+                {
+                    var go = (GameObject)PrefabUtility.InstantiatePrefab(prefab, parent);
+                    go.transform.position = new Vector3(positions[i * 3], positions[i * 3 + 1], positions[i * 3 + 2]);
+                    if (namePrefix != null) go.name = namePrefix + i;
+                    Undo.RegisterCreatedObjectUndo(go, UNDO_NAME);
+                    ids[i] = go.GetInstanceID();
+                }
+                return ids;
+            }
+
+            private static Transform[] ResolveNames(string[] names)
+            {
+                var result = new Transform[names.Length];
+                for (int i = 0; i < names.Length; i++)
+                {
+                    result[i] = Hierarchy.Find(names[i])?.transform;
+                }
+                return result;
+            }
+
+            private static Transform[] ResolveIds(int[] instanceIds)
+            {
+                var result = new Transform[instanceIds.Length];
+                for (int i = 0; i < instanceIds.Length; i++)
+                {
+                    var obj = EditorUtility.InstanceIDToObject(instanceIds[i]);
+                    result[i] = obj is GameObject go ? go.transform : obj as Transform;
+                }
+                return result;
+            }
+
+            private static int Apply(Transform[] targets, float[] packed, string layout)
+            {
+                if (string.IsNullOrEmpty(layout) || layout.Trim('p', 'r', 's').Length > 0)
+                    throw new ArgumentException($"Invalid layout '{layout}', expected a combination of p, r and s.");
+                int stride = layout.Length * 3;
+                if (packed == null || packed.Length != targets.Length * stride)
+                    throw new ArgumentException($"packed must contain {stride} floats per target ({targets.Length * stride}), got {packed?.Length ?? 0}.");
+
+                var found = new List<Object>(targets.Length);
+                foreach (var t in targets)
+                {
+                    if (t != null) found.Add(t);
+                }
+                if (found.Count == 0) return 0;
+                Undo.RecordObjects(found.ToArray(), UNDO_NAME);
+
+                for (int i = 0; i < targets.Length; i++)
+                {
+                    var t = targets[i];
+                    if (t == null) continue;
+                    int o = i * stride;
+                    foreach (char c in layout)
+                    {
+                        var v = new Vector3(packed[o], packed[o + 1], packed[o + 2]);
+                        o += 3;
+                        if (c == 'p') t.position = v;
+                        else if (c == 'r') t.rotation = Quaternion.Euler(v);
+                        else t.localScale = v;
+                    }
+                }
+                return found.Count;
+            }
+        }
+    }
+}
@@ -0,0 +1,331 @@
+using System;
+using System.Collections.Generic;
+using UnityEditor;
+using UnityEditor.SceneManagement;
+using UnityEngine;
+using UnityEngine.SceneManagement;
+
+namespace Observater.AiSkills.Runtime.Core
+{
+    public static partial class AiSkillsBridge
+    {
+        public static class Hierarchy
+        {
+            private const int MAX_INCREMENTAL_CHANGES = 256;
+
+            private sealed class Entry
+            {
+                public int Id;
+                public GameObject GameObject;
+                public string Name;
+                public string Path;
+                public readonly List<int> Children = new List<int>();
+                public readonly List<Type> Types = new List<Type>();
+            }
+
+            private static readonly Dictionary<int, Entry> _entries = new Dictionary<int, Entry>();
+            private static readonly Dictionary<string, Dictionary<int, GameObject>> _byName = new Dictionary<string, Dictionary<int, GameObject>>();
+            private static readonly Dictionary<string, GameObject> _byPath = new Dictionary<string, GameObject>();
+            private static readonly Dictionary<Type, Dictionary<int, GameObject>> _byType = new Dictionary<Type, Dictionary<int, GameObject>>();
+            private static readonly Dictionary<string, Type> _typeNames = new Dictionary<string, Type>();
+            private static readonly HashSet<int> _pending = new HashSet<int>();
+            private static bool _dirty = true;
+            private static bool _changedSinceHierarchyEvent;
+
+            public static int Version { get; private set; }
+
+            public static int Count
+            {
+                get
+                {
+                    EnsureBuilt();
+                    return _entries.Count;
+                }
+            }
+
+            static Hierarchy()
+            {
+                EditorApplication.hierarchyChanged += OnHierarchyChanged;
+                ObjectChangeEvents.changesPublished += OnChangesPublished;
+                EditorSceneManager.sceneOpened += (scene, mode) => Invalidate();
+                EditorSceneManager.sceneClosed += scene => Invalidate();
+                EditorApplication.playModeStateChanged += state => Invalidate();
+            }
+
+            public static void Invalidate()
+            {
+                _dirty = true;
+                Version++;
+            }
+
+            public static GameObject Find(string nameOrPath)
+            {
+                if (string.IsNullOrEmpty(nameOrPath)) return null;
+                EnsureBuilt();
+
+                GameObject found = null;
+                if (nameOrPath.IndexOf('/') >= 0)
+                {
+                    var path = nameOrPath.TrimStart('/');
+                    if (_byPath.TryGetValue(path, out var go) && go != null && go.activeInHierarchy && GetPath(go) == path)
+                        found = go;
+                }
+                else if (_byName.TryGetValue(nameOrPath, out var named))
+                {
+                    foreach (var go in named.Values)
+                    {
+                        if (go != null && go.activeInHierarchy && go.name == nameOrPath)
+                        {
+                            found = go;
+                            break;
+                        }
+                    }
+                }
+                if (found != null) return found;
+
+                found = GameObject.Find(nameOrPath);
+                if (found != null && !_entries.ContainsKey(found.GetInstanceID()))
+                    Add(found, GetParentPath(found.transform));
+                return found;
+            }
+
+            public static GameObject[] FindAll(string name, bool includeInactive = false)
+            {
+                EnsureBuilt();
+                if (string.IsNullOrEmpty(name) || !_byName.TryGetValue(name, out var named)) return Array.Empty<GameObject>();
+                return Filter(named, go => go.name == name, includeInactive);
+            }
+
+            public static GameObject[] FindWithComponent(Type type, bool includeInactive = false)
+            {
+                EnsureBuilt();
+                if (type == null || !_byType.TryGetValue(type, out var typed)) return Array.Empty<GameObject>();
+                return Filter(typed, go => go.GetComponent(type) != null, includeInactive);
+            }
+
+            public static GameObject[] FindWithComponent(string typeName, bool includeInactive = false)
+            {
+                EnsureBuilt();
+                return _typeNames.TryGetValue(typeName ?? "", out var type)
+                    ? FindWithComponent(type, includeInactive)
+                    : Array.Empty<GameObject>();
+            }
+
+            public static string GetPath(GameObject go)
+            {
+                if (go == null) return null;
+                var parent = GetParentPath(go.transform);
+                return parent == null ? go.name : parent + "/" + go.name;
+            }
+
+            private static string GetParentPath(Transform t)
+            {
+                var parent = t.parent;
+                if (parent == null) return null;
+                var names = new List<string>();
+                for (; parent != null; parent = parent.parent) names.Add(parent.name);
+                names.Reverse();
+                return string.Join("/", names);
+            }
+
+            private static GameObject[] Filter(Dictionary<int, GameObject> bucket, Func<GameObject, bool> isCurrent, bool includeInactive)
+            {
+                var result = new List<GameObject>(bucket.Count);
+                foreach (var go in bucket.Values)
+                {
+                    if (go != null && (includeInactive || go.activeInHierarchy) && isCurrent(go)) result.Add(go);
+                }
+                return result.ToArray();
+            }
+
+            private static void OnHierarchyChanged()
+            {
+                if (!_changedSinceHierarchyEvent) _dirty = true;
+                _changedSinceHierarchyEvent = false;
+                Version++;
+            }
+
+            private static void OnChangesPublished(ref ObjectChangeEventStream stream)
+            {
+                for (int i = 0; i < stream.length; i++)
+                {
+                    switch (stream.GetEventType(i))
+                    {
+                        case ObjectChangeKind.CreateGameObjectHierarchy:
+                            stream.GetCreateGameObjectHierarchyEvent(i, out var created);
+                            _pending.Add(created.instanceId);
+                            break;
+                        case ObjectChangeKind.DestroyGameObjectHierarchy:
+                            stream.GetDestroyGameObjectHierarchyEvent(i, out var destroyed);
+                            _pending.Add(destroyed.instanceId);
+                            break;
+                        case ObjectChangeKind.ChangeGameObjectParent:
+                            stream.GetChangeGameObjectParentEvent(i, out var reparented);
+                            _pending.Add(reparented.instanceId);
+                            break;
+                        case ObjectChangeKind.ChangeGameObjectStructure:
+                            stream.GetChangeGameObjectStructureEvent(i, out var structure);
+                            _pending.Add(structure.instanceId);
+                            break;
+                        case ObjectChangeKind.ChangeGameObjectStructureHierarchy:
+                            stream.GetChangeGameObjectStructureHierarchyEvent(i, out var structureHierarchy);
+                            _pending.Add(structureHierarchy.instanceId);
+                            break;
+                        case ObjectChangeKind.ChangeGameObjectOrComponentProperties:
+                            stream.GetChangeGameObjectOrComponentPropertiesEvent(i, out var properties);
+                            _pending.Add(properties.instanceId);
+                            break;
+                        case ObjectChangeKind.UpdatePrefabInstances:
+                            stream.GetUpdatePrefabInstancesEvent(i, out var prefabs);
+                            foreach (var id in prefabs.instanceIds) _pending.Add(id);
+                            break;
+                        case ObjectChangeKind.CreateAssetObject:
+                        case ObjectChangeKind.DestroyAssetObject:
+                        case ObjectChangeKind.ChangeAssetObjectProperties:
+                            continue;
+                        default:
+                            _dirty = true;
+                            break;
+                    }
+                    _changedSinceHierarchyEvent = true;
+                }
+                Version++;
+            }
+
+            private static void EnsureBuilt()
+            {
+                if (_dirty || _pending.Count > MAX_INCREMENTAL_CHANGES)
+                {
+                    Rebuild();
+                    return;
+                }
+                if (_pending.Count == 0) return;
+
+                foreach (var id in _pending) Refresh(id);
+                _pending.Clear();
+            }
+
+            private static void Rebuild()
+            {
+                _entries.Clear();
+                _byName.Clear();
+                _byPath.Clear();
+                _byType.Clear();
+                _typeNames.Clear();
+                _pending.Clear();
+
+                for (int i = 0; i < SceneManager.sceneCount; i++)
+                {
+                    var scene = SceneManager.GetSceneAt(i);
+                    if (!scene.isLoaded) continue;
+                    foreach (var root in scene.GetRootGameObjects()) Add(root, null);
+                }
+                _dirty = false;
+            }
+
+            private static void Refresh(int instanceId)
+            {
+                var obj = EditorUtility.InstanceIDToObject(instanceId);
+                var go = obj as GameObject ?? (obj as Component)?.gameObject;
+                var id = go != null ? go.GetInstanceID() : instanceId;
+
+                string parentPath = null;
+                if (_entries.TryGetValue(id, out var old)) Remove(old, old.Path);
+                if (go == null || EditorUtility.IsPersistent(go) || !go.scene.IsValid()) return;
+                if (go.transform.parent != null)
+                {
+                    parentPath = GetParentPath(go.transform);
+                    if (_entries.TryGetValue(go.transform.parent.gameObject.GetInstanceID(), out var parent) && !parent.Children.Contains(id))
+                        parent.Children.Add(id);
+                }
+                Add(go, parentPath);
+            }
+
+            private static void Add(GameObject root, string parentPath)
+            {
+                var stack = new Stack<(Transform, string)>();
+                stack.Push((root.transform, parentPath));
+                var components = new List<Component>();
+                while (stack.Count > 0)
+                {
+                    var (t, parent) = stack.Pop();
+                    var go = t.gameObject;
+                    var id = go.GetInstanceID();
+                    var entry = new Entry
+                    {
+                        Id = id,
+                        GameObject = go,
+                        Name = go.name,
+                        Path = parent == null ? go.name : parent + "/" + go.name,
+                    };
+                    if (_entries.TryGetValue(id, out var stale)) Unlink(stale);
+                    _entries[id] = entry;
+
+                    AddTo(_byName, entry.Name, id, go);
+                    if (!_byPath.ContainsKey(entry.Path)) _byPath[entry.Path] = go;
+
+                    go.GetComponents(components);
+                    foreach (var c in components)
+                    {
+                        if (c == null) continue;
+                        for (var type = c.GetType(); type != null && type != typeof(Component); type = type.BaseType)
+                        {
+                            if (entry.Types.Contains(type)) continue;
+                            entry.Types.Add(type);
+                            AddTo(_byType, type, id, go);
+                            _typeNames[type.Name] = type;
+                            _typeNames[type.FullName] = type;
+                        }
+                    }
+
+                    for (int i = t.childCount - 1; i >= 0; i--)
+                    {
+                        var child = t.GetChild(i);
+                        entry.Children.Add(child.gameObject.GetInstanceID());
+                        stack.Push((child, entry.Path));
+                    }
+                }
+            }
+
+            private static void Remove(Entry entry, string path)
+            {
+                var stack = new Stack<Entry>();
+                stack.Push(entry);
+                while (stack.Count > 0)
+                {
+                    var e = stack.Pop();
+                    Unlink(e);
+                    foreach (var childId in e.Children)
+                    {
+                        if (_entries.TryGetValue(childId, out var child) && child.Path.StartsWith(path + "/", StringComparison.Ordinal))
+                            stack.Push(child);
+                    }
+                }
+            }
+
+            private static void Unlink(Entry entry)
+            {
+                var go = entry.GameObject;
+                if (_entries.TryGetValue(entry.Id, out var current) && current == entry) _entries.Remove(entry.Id);
+
+                if (_byName.TryGetValue(entry.Name, out var named)) RemoveFrom(named, entry.Id, go);
+                if (_byPath.TryGetValue(entry.Path, out var pathed) && ReferenceEquals(pathed, go)) _byPath.Remove(entry.Path);
+                foreach (var type in entry.Types)
+                {
+                    if (_byType.TryGetValue(type, out var typed)) RemoveFrom(typed, entry.Id, go);
+                }
+            }
+
+            private static void RemoveFrom(Dictionary<int, GameObject> bucket, int id, GameObject go)
+            {
+                if (bucket.TryGetValue(id, out var current) && ReferenceEquals(current, go)) bucket.Remove(id);
+            }
+
+            private static void AddTo<TKey>(Dictionary<TKey, Dictionary<int, GameObject>> map, TKey key, int id, GameObject go)
+            {
+                if (!map.TryGetValue(key, out var bucket)) map[key] = bucket = new Dictionary<int, GameObject>();
+                bucket[id] = go;
+            }
+        }
+    }
+}
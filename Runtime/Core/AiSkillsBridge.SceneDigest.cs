@@ -0,0 +1,250 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text;
+using System.Text.RegularExpressions;
+using Newtonsoft.Json;
+using Newtonsoft.Json.Linq;
+using UnityEngine;
+using UnityEngine.SceneManagement;
+
+namespace Observater.AiSkills.Runtime.Core
+{
+    public static partial class AiSkillsBridge
+    {
+        public static class SceneDigest
+        {
+            public const int DEFAULT_MAX_DEPTH = 4;
+            public const int DEFAULT_MAX_CHARS = 4000;
+
+            private static readonly string _epoch = Guid.NewGuid().ToString("N").Substring(0, 8);
+            private static readonly Regex _numberSuffix = new Regex(@"^(.*?)[ _\-]?\(?(\d+)\)?$");
+
+            private static readonly Dictionary<string, string> _codes = new Dictionary<string, string>
+            {
+                { "MeshFilter", "MF" }, { "MeshRenderer", "MR" }, { "SkinnedMeshRenderer", "SMR" },
+                { "BoxCollider", "BC" }, { "SphereCollider", "SC" }, { "CapsuleCollider", "CC" },
+                { "MeshCollider", "MC" }, { "TerrainCollider", "TC" }, { "Terrain", "Ter" },
+                { "Rigidbody", "RB" }, { "CharacterController", "CCT" }, { "Camera", "Cam" },
+                { "Light", "L" }, { "AudioSource", "AS" }, { "AudioListener", "AL" }, { "Animator", "An" },
+                { "ParticleSystem", "PS" }, { "SpriteRenderer", "SR" }, { "LineRenderer", "LR" },
+                { "Rigidbody2D", "RB2" }, { "BoxCollider2D", "BC2" }, { "CircleCollider2D", "CC2" },
+                { "Canvas", "Cv" }, { "CanvasScaler", "CvS" }, { "GraphicRaycaster", "GR" },
+                { "Image", "Img" }, { "RawImage", "RImg" }, { "Text", "Txt" }, { "TextMeshProUGUI", "TMP" },
+                { "Button", "Btn" }, { "Toggle", "Tgl" }, { "Slider", "Sld" }, { "ScrollRect", "Scr" },
+                { "EventSystem", "ES" }, { "StandaloneInputModule", "SIM" }, { "NavMeshAgent", "NMA" },
+                { "ReflectionProbe", "RP" }, { "LightProbeGroup", "LPG" },
+            };
+
+            private static readonly HashSet<string> _skipped = new HashSet<string> { "Transform", "RectTransform", "CanvasRenderer" };
+
+            private static string _cached;
+            private static (int, int, int) _cachedKey;
+
+            public static string Version => $"{_epoch}-{Hierarchy.Version}";
+
+            public static string Reply(JObject query)
+            {
+                int maxDepth = query.Value<int?>("max_depth") ?? DEFAULT_MAX_DEPTH;
+                int maxChars = query.Value<int?>("max_chars") ?? DEFAULT_MAX_CHARS;
+                string version = Version;
+                if (query.Value<string>("since") == version)
+                    return JsonConvert.SerializeObject(new { status = "ok", version, unchanged = true });
+                return JsonConvert.SerializeObject(new { status = "ok", version, digest = Get(maxDepth, maxChars) });
+            }
+
+            public static string Get(int maxDepth = DEFAULT_MAX_DEPTH, int maxChars = DEFAULT_MAX_CHARS)
+            {
+                var key = (Hierarchy.Version, maxDepth, maxChars);
+                if (_cached != null && _cachedKey == key) return _cached;
+
+                string text = null;
+                for (int depth = Math.Max(1, maxDepth); text == null; depth--)
+                {
+                    text = Build(depth, maxChars, depth <= 1);
+                }
+                _cached = text;
+                _cachedKey = key;
+                return text;
+            }
+
+            private sealed class Writer
+            {
+                public readonly StringBuilder Body = new StringBuilder();
+                public readonly SortedDictionary<string, string> Legend = new SortedDictionary<string, string>();
+                public int MaxDepth;
+                public int MaxChars;
+                public int Reserved;
+                public int LegendChars;
+                public bool Truncate;
+                public bool Full;
+                public int Skipped;
+            }
+
+            private static string DepthLine(int maxDepth)
+            {
+                return $"Depth <= {maxDepth}; \"(+N)\" = N hidden descendants; \"xN\" = N similar siblings; \"(off)\" = inactive\n";
+            }
+
+            private static string SkippedLine(long skipped)
+            {
+                return $"... {skipped} more object(s) not shown\n";
+            }
+
+            private static string Build(int maxDepth, int maxChars, bool truncate)
+            {
+                var w = new Writer
+                {
+                    MaxDepth = maxDepth,
+                    MaxChars = maxChars,
+                    Reserved = DepthLine(maxDepth).Length + SkippedLine(int.MaxValue).Length,
+                    Truncate = truncate
+                };
+                var header = new StringBuilder();
+                for (int i = 0; i < SceneManager.sceneCount; i++)
+                {
+                    var scene = SceneManager.GetSceneAt(i);
+                    if (!scene.isLoaded) continue;
+                    var roots = scene.GetRootGameObjects();
+                    var title = $"Scene: {scene.name} ({Count(roots)} objects)\n";
+                    if (w.Full || !Fits(w, title.Length, null))
+                    {
+                        w.Full = true;
+                        w.Skipped += Count(roots);
+                    }
+                    else
+                    {
+                        w.Body.Append(title);
+                        WriteLevel(w, roots.Select(r => r.transform).ToList(), 0);
+                    }
+                    if (w.Full && !truncate) return null;
+                }
+
+                if (w.Legend.Count > 0)
+                    header.Append("Codes: ").Append(string.Join(" ", w.Legend.Select(kv => $"{kv.Key}={kv.Value}"))).Append('\n');
+                header.Append(DepthLine(maxDepth));
+                if (w.Skipped > 0) w.Body.Append(SkippedLine(w.Skipped));
+                var text = header.Append(w.Body).ToString();
+                if (text.Length <= maxChars) return text;
+                return truncate ? text.Substring(0, Math.Max(0, maxChars)) : null;
+            }
+
+            private static bool Fits(Writer w, int chars, Dictionary<string, string> added)
+            {
+                int legend = w.LegendChars;
+                if (added != null)
+                {
+                    foreach (var kv in added) legend += kv.Key.Length + kv.Value.Length + 2;
+                }
+                if (legend > 0) legend += "Codes: ".Length;
+                return w.Body.Length + chars + w.Reserved + legend <= w.MaxChars;
+            }
+
+            private static void WriteLevel(Writer w, List<Transform> level, int depth)
+            {
+                foreach (var group in GroupSiblings(level))
+                {
+                    var first = group[0];
+                    if (w.Full)
+                    {
+                        w.Skipped += group.Sum(t => t.GetComponentsInChildren<Transform>(true).Length);
+                        continue;
+                    }
+
+                    var line = new StringBuilder(new string(' ', depth * 2));
+                    line.Append(group.Count > 1 ? GroupName(group) : first.name);
+                    if (group.Count > 1) line.Append(" x").Append(group.Count);
+
+                    var added = new Dictionary<string, string>();
+                    var codes = Codes(w, first.gameObject, added);
+                    if (codes.Length > 0) line.Append(" [").Append(codes).Append(']');
+                    if (!first.gameObject.activeSelf) line.Append(" (off)");
+
+                    bool descend = first.childCount > 0 && depth + 1 < w.MaxDepth;
+                    if (first.childCount > 0 && !descend)
+                        line.Append(" (+").Append(first.GetComponentsInChildren<Transform>(true).Length - 1).Append(')');
+
+                    if (!Fits(w, line.Length + 1, added))
+                    {
+                        w.Full = true;
+                        w.Skipped += group.Sum(t => t.GetComponentsInChildren<Transform>(true).Length);
+                        continue;
+                    }
+                    w.Body.Append(line).Append('\n');
+                    foreach (var kv in added)
+                    {
+                        w.Legend[kv.Key] = kv.Value;
+                        w.LegendChars += kv.Key.Length + kv.Value.Length + 2;
+                    }
+
+                    if (descend)
+                    {
+                        var children = new List<Transform>(first.childCount);
+                        foreach (Transform child in first) children.Add(child);
+                        WriteLevel(w, children, depth + 1);
+                    }
+                }
+            }
+
+            private static List<List<Transform>> GroupSiblings(List<Transform> level)
+            {
+                var groups = new List<List<Transform>>();
+                var index = new Dictionary<string, List<Transform>>();
+                foreach (var t in level)
+                {
+                    var match = _numberSuffix.Match(t.name);
+                    var stem = match.Success ? match.Groups[1].Value : t.name;
+                    var key = $"{stem}|{Signature(t.gameObject)}|{t.childCount}";
+                    if (!index.TryGetValue(key, out var group))
+                    {
+                        index[key] = group = new List<Transform>();
+                        groups.Add(group);
+                    }
+                    group.Add(t);
+                }
+                return groups;
+            }
+
+            private static int Count(GameObject[] roots)
+            {
+                int total = 0;
+                foreach (var root in roots) total += root.GetComponentsInChildren<Transform>(true).Length;
+                return total;
+            }
+
+            private static string GroupName(List<Transform> group)
+            {
+                var first = group[0].name;
+                var last = group[group.Count - 1].name;
+                return first == last ? first : $"{first}..{last}";
+            }
+
+            private static string Signature(GameObject go)
+            {
+                return string.Join(",", go.GetComponents<Component>().Select(c => c == null ? "?" : c.GetType().Name));
+            }
+
+            private static string Codes(Writer w, GameObject go, Dictionary<string, string> added)
+            {
+                var parts = new List<string>();
+                foreach (var c in go.GetComponents<Component>())
+                {
+                    if (c == null)
+                    {
+                        parts.Add("Missing");
+                        continue;
+                    }
+                    var name = c.GetType().Name;
+                    if (_skipped.Contains(name)) continue;
+                    if (_codes.TryGetValue(name, out var code))
+                    {
+                        if (!w.Legend.ContainsKey(code)) added[code] = name;
+                        parts.Add(code);
+                    }
+                    else parts.Add(name);
+                }
+                return string.Join(",", parts);
+            }
+        }
+    }
+}
@@ -11,13 +11,15 @@ using System.Collections.Concurrent;
 using System.Diagnostics;
 using System.IO;
 using System.Linq;
+using System.Collections.Generic;
 using Newtonsoft.Json;
+using Newtonsoft.Json.Linq;
 using Debug = UnityEngine.Debug;
 
 namespace Observater.AiSkills.Runtime.Core
 {
     [InitializeOnLoad]
-    public static class AiSkillsBridge
+    public static partial class AiSkillsBridge
     {
         public static event Action<string> OnStatusLog;
 
@@ -27,7 +29,9 @@ namespace Observater.AiSkills.Runtime.Core
 
         private const int UNITY_PORT = 8081;
 
-        private const string CMD_SHUTDOWN_LISTENER = "@@INTERNAL_STOP@@";
+        private const int DEFAULT_FRAME_BUDGET_MS = 10;
+
+        private const string MSG_SHUTDOWN_LISTENER = "{\"type\":\"shutdown\"}";
 
         private const string PACKAGE_NAME = "com.observater.aiskills";
 
@@ -44,10 +48,15 @@ namespace Observater.AiSkills.Runtime.Core
         private static TcpListener _listener;
         private static Thread _serverThread;
         private static volatile bool _isRunning = false;
-        private static NetworkStream _currentStream;
         private static Process _pythonProcess;
 
-        private static readonly ConcurrentQueue<string> _commandQueue = new ConcurrentQueue<string>();
+        private static readonly List<BridgeClient> _clients = new List<BridgeClient>();
+        private static readonly ConcurrentQueue<BridgeCommand> _commandQueue = new ConcurrentQueue<BridgeCommand>();
+        private static BridgeCommand _currentCommand;
+        private static BridgeCommand _activeBatch;
+        private static LogCapture _logCapture;
+        private static readonly List<BridgeCommand> _jobs = new List<BridgeCommand>();
+        private static long _lastJobId;
 
         static AiSkillsBridge()
         {
@@ -254,10 +263,9 @@ namespace Observater.AiSkills.Runtime.Core
                     if (result.AsyncWaitHandle.WaitOne(200))
                     {
                         client.EndConnect(result);
-                        using (var stream = client.GetStream())
+                        using (var bridgeClient = new BridgeClient(client))
                         {
-                            byte[] data = Encoding.UTF8.GetBytes(CMD_SHUTDOWN_LISTENER);
-                            stream.Write(data, 0, data.Length);
+                            bridgeClient.WriteFrame(MSG_SHUTDOWN_LISTENER);
                         }
                     }
                 }
@@ -270,11 +278,17 @@ namespace Observater.AiSkills.Runtime.Core
             _isRunning = false;
 
             try { _listener?.Stop(); } catch { }
-            try { _currentStream?.Close(); _currentStream?.Dispose(); } catch { }
             _listener = null;
-            _currentStream = null;
+
+            lock (_clients)
+            {
+                foreach (var client in _clients) client.Dispose();
+                _clients.Clear();
+            }
 
             while (_commandQueue.TryDequeue(out _)) { }
+            _activeBatch = null;
+            _jobs.Clear();
             while (_logQueue.TryDequeue(out _)) { }
 
             if (_serverThread != null && _serverThread.IsAlive)
@@ -290,33 +304,93 @@ namespace Observater.AiSkills.Runtime.Core
             {
                 try
                 {
-                    var client = _listener.AcceptTcpClient();
-                    _currentStream = client.GetStream();
+                    var client = new BridgeClient(_listener.AcceptTcpClient());
+                    lock (_clients) _clients.Add(client);
+                    new Thread(() => ClientLoop(client)) { IsBackground = true }.Start();
+                }
+                catch { }
+            }
+        }
 
-                    byte[] buffer = new byte[1024 * 1024];
-                    int bytesRead = _currentStream.Read(buffer, 0, buffer.Length);
+        private static void ClientLoop(BridgeClient client)
+        {
+            try
+            {
+                while (_isRunning)
+                {
+                    string frame = client.ReadFrame();
+                    if (frame == null) break;
 
-                    if (bytesRead > 0)
-                    {
-                        string data = Encoding.UTF8.GetString(buffer, 0, bytesRead);
+                    var msg = JObject.Parse(frame);
+                    string type = msg.Value<string>("type");
+                    long id = msg.Value<long?>("id") ?? 0;
 
-                        if (data == CMD_SHUTDOWN_LISTENER)
-                        {
+                    switch (type)
+                    {
+                        case "ping":
+                            client.WriteFrame(JsonConvert.SerializeObject(new { id, type = "pong" }));
+                            break;
+                        case "shutdown":
                             _isRunning = false;
-                            client.Close();
+                            try { _listener?.Stop(); } catch { }
+                            return;
+                        case "exec":
+                            string code = msg.Value<string>("code") ?? "";
+                            LogToUI($"[In] Received Python Command #{id} ({code.Length} chars)");
+                            Enqueue(new BridgeCommand
+                            {
+                                Client = client,
+                                Id = id,
+                                Code = code,
+                                BudgetMs = msg.Value<int?>("budget_ms") ?? DEFAULT_FRAME_BUDGET_MS
+                            });
+                            break;
+                        case "batch":
+                            var scripts = msg["scripts"]?.ToObject<string[]>() ?? new string[0];
+                            int budget = msg.Value<int?>("budget_ms") ?? DEFAULT_FRAME_BUDGET_MS;
+                            LogToUI($"[In] Received Python Batch #{id} ({scripts.Length} scripts, {budget}ms/frame)");
+                            Enqueue(new BridgeCommand
+                            {
+                                Client = client,
+                                Id = id,
+                                Scripts = scripts,
+                                BudgetMs = budget,
+                                StopOnError = msg.Value<bool?>("stop_on_error") ?? false,
+                                Results = new List<string>()
+                            });
+                            break;
+                        case "scene":
+                            Enqueue(new BridgeCommand { Client = client, Id = id, Query = msg });
+                            break;
+                        case "cancel":
+                            long target = msg.Value<long?>("target") ?? 0;
+                            if (client.Commands.TryGetValue(target, out var cancelled))
+                            {
+                                cancelled.Cancelled = true;
+                                LogToUI($"[In] Cancel requested for #{target}");
+                            }
+                            break;
+                        default:
+                            LogToUI($"[Warn] Unknown message type: {type}");
                             break;
-                        }
-
-                        LogToUI($"[In] Received Python Command ({bytesRead} bytes)");
-                        _commandQueue.Enqueue(data);
-                    }
-                    else
-                    {
-                        client.Close();
                     }
                 }
-                catch { }
             }
+            catch (Exception e)
+            {
+                if (_isRunning) LogToUI($"[Warn] Client disconnected: {e.Message}");
+            }
+            finally
+            {
+                lock (_clients) _clients.Remove(client);
+                client.Dispose();
+            }
+        }
+
+        private static void Enqueue(BridgeCommand command)
+        {
+            command.Client.Commands[command.Id] = command;
+            _commandQueue.Enqueue(command);
         }
 
         private static void OnUpdate()
@@ -326,10 +400,162 @@ namespace Observater.AiSkills.Runtime.Core
                 OnStatusLog?.Invoke(logMsg);
             }
 
-            if (_commandQueue.TryDequeue(out string pythonCode))
+            var frame = Stopwatch.StartNew();
+            StepJobs();
+
+            int budget = DEFAULT_FRAME_BUDGET_MS;
+            do
+            {
+                var command = _activeBatch;
+                if (command == null && !_commandQueue.TryDequeue(out command)) break;
+
+                if (!command.Client.IsConnected)
+                {
+                    LogToUI($"[Warn] Skipped command #{command.Id}: client disconnected");
+                    _activeBatch = null;
+                    continue;
+                }
+
+                if (command.Cancelled && _activeBatch == null)
+                {
+                    LogToUI($"[Warn] Skipped command #{command.Id}: cancelled");
+                    WriteResult(command, JsonConvert.SerializeObject(new { status = "error", message = "Cancelled before start." }));
+                    continue;
+                }
+
+                if (command.IsQuery)
+                {
+                    WriteResult(command, SceneDigest.Reply(command.Query));
+                }
+                else if (command.IsBatch)
+                {
+                    budget = command.BudgetMs;
+                    if (!command.IsFinished) RunBatchStep(command);
+
+                    _activeBatch = command.IsFinished ? null : command;
+                    if (_activeBatch == null) SendBatchResult(command);
+                }
+                else
+                {
+                    LogToUI($"[Run] Executing Python Code #{command.Id}...");
+                    RunCommand(command, command.Code);
+                }
+            }
+            while (frame.ElapsedMilliseconds < budget);
+        }
+
+        private static void StepJobs()
+        {
+            if (_jobs.Count == 0) return;
+
+            foreach (var job in _jobs.ToArray())
+            {
+                if (!job.Client.IsConnected) job.Cancelled = true;
+
+                int slice = Math.Max(1, job.BudgetMs / _jobs.Count);
+                _currentCommand = job;
+                try
+                {
+                    PythonRunner.RunString($"import aiskills.runtime as _rt\n_rt.step_job({job.JobId}, {slice})");
+                }
+                catch (Exception e)
+                {
+                    Debug.LogError(e);
+                    SendError($"Unity Error: {e.Message}");
+                }
+                finally
+                {
+                    EndLogCapture();
+                    _currentCommand = null;
+                }
+
+                if (job.Responded)
+                {
+                    _jobs.Remove(job);
+                    LogToUI($"[OK] Job #{job.JobId} Finished ({job.Elapsed.ElapsedMilliseconds}ms)");
+                }
+            }
+        }
+
+        public static long BeginJob()
+        {
+            var command = _currentCommand;
+            if (command == null) throw new InvalidOperationException("No command is executing");
+            if (command.IsBatch) throw new InvalidOperationException("Generator scripts cannot run inside a batch");
+
+            command.JobId = ++_lastJobId;
+            command.Elapsed = Stopwatch.StartNew();
+            _jobs.Add(command);
+            LogToUI($"[Run] Command #{command.Id} continues as Job #{command.JobId}...");
+            return command.JobId;
+        }
+
+        public static void BeginLogCapture(Action<string> sink)
+        {
+            if (_logCapture != null) return;
+            _logCapture = new LogCapture(Debug.unityLogger.logHandler, sink);
+            Debug.unityLogger.logHandler = _logCapture;
+        }
+
+        public static void EndLogCapture()
+        {
+            if (_logCapture == null) return;
+            Debug.unityLogger.logHandler = _logCapture.Inner;
+            _logCapture = null;
+        }
+
+        public static void AttachLogs(string logsJson)
+        {
+            var command = _currentCommand;
+            if (command != null && !command.Responded) command.Logs = logsJson;
+        }
+
+        public static bool IsCancelled() => _currentCommand?.Cancelled ?? false;
+
+        public static void Progress(int done, int total, string label)
+        {
+            var command = _currentCommand;
+            if (command == null || command.Responded) return;
+
+            if (command.JobId == 0)
+            {
+                EditorUtility.DisplayProgressBar("AI Skills", $"{label} {done}/{total}", total > 0 ? (float)done / total : 0f);
+                command.ProgressShown = true;
+            }
+
+            try
+            {
+                command.Client.WriteFrame(JsonConvert.SerializeObject(new { id = command.Id, type = "progress", done, total, label }));
+            }
+            catch (Exception e)
+            {
+                LogToUI($"[Error] Send Progress Failed: {e.Message}");
+            }
+        }
+
+        private static void RunBatchStep(BridgeCommand command)
+        {
+            int index = command.Next++;
+            LogToUI($"[Run] Executing Batch #{command.Id} [{index + 1}/{command.Scripts.Length}]...");
+
+            command.Responded = false;
+            command.Chunks = 0;
+            RunCommand(command, command.Scripts[index]);
+
+            if (!command.Responded) command.Results.Add("{\"status\":\"ok\",\"message\":\"Done.\"}");
+        }
+
+        private static void RunCommand(BridgeCommand command, string code)
+        {
+            _currentCommand = command;
+            try
             {
-                LogToUI("[Run] Executing Python Code...");
-                RunPythonCode(pythonCode);
+                RunPythonCode(code);
+            }
+            finally
+            {
+                EndLogCapture();
+                _currentCommand = null;
             }
         }
 
@@ -361,24 +587,87 @@ namespace Observater.AiSkills.Runtime.Core
             SendResponse($"{{\"status\":\"ok\", \"data\": {jsonContent}}}");
 
         public static void SendError(string error) =>
-            SendResponse(JsonConvert.SerializeObject(new { status = "error", message = error }));
+            SendResponse(JsonConvert.SerializeObject(new { status = "error", message = error }), true);
 
-        private static void SendResponse(string jsonPackage)
+        public static void SendChunk(string jsonFragment)
         {
-            if (_currentStream != null && _currentStream.CanWrite)
+            var command = _currentCommand;
+            if (command == null || command.Responded)
             {
-                try
-                {
-                    LogToUI($"[Out] Sending Response ({jsonPackage.Length} bytes)...");
-                    byte[] bytes = Encoding.UTF8.GetBytes(jsonPackage);
-                    _currentStream.Write(bytes, 0, bytes.Length);
-                    _currentStream.Flush();
-                    LogToUI($"[Done] Interaction Complete");
-                }
-                catch (Exception e)
-                {
-                    LogToUI($"[Error] Send Failed: {e.Message}");
-                }
+                LogToUI("[Warn] Chunk dropped: no command is streaming");
+                return;
+            }
+
+            try
+            {
+                string frame = command.IsBatch
+                    ? JsonConvert.SerializeObject(new { id = command.Id, type = "chunk", index = command.Next - 1, seq = command.Chunks, data = jsonFragment })
+                    : JsonConvert.SerializeObject(new { id = command.Id, type = "chunk", seq = command.Chunks, data = jsonFragment });
+                command.Client.WriteFrame(frame);
+                command.Chunks++;
+            }
+            catch (Exception e)
+            {
+                LogToUI($"[Error] Send Chunk Failed: {e.Message}");
+            }
+        }
+
+        public static void EndResult(string msg) =>
+            SendResponse(JsonConvert.SerializeObject(new { status = "ok", message = msg, streamed = true }));
+
+        private static void SendResponse(string jsonPackage, bool failed = false)
+        {
+            var command = _currentCommand;
+            if (command == null)
+            {
+                LogToUI("[Warn] Response dropped: no command is executing");
+                return;
+            }
+            if (command.Responded) return;
+            command.Responded = true;
+
+            if (command.Logs != null)
+            {
+                jsonPackage = jsonPackage.Substring(0, jsonPackage.LastIndexOf('}')) + $",\"logs\":{command.Logs}}}";
+                command.Logs = null;
+            }
+
+            if (command.IsBatch)
+            {
+                command.Results.Add(jsonPackage);
+                if (failed) command.Failed = true;
+                return;
+            }
+
+            WriteResult(command, jsonPackage);
+        }
+
+        private static void SendBatchResult(BridgeCommand command)
+        {
+            string status = command.Failed ? "error" : "ok";
+            string message = JsonConvert.SerializeObject($"{command.Results.Count}/{command.Scripts.Length} scripts executed");
+            WriteResult(command, $"{{\"status\":\"{status}\",\"message\":{message},\"results\":[{string.Join(",", command.Results)}]}}");
+        }
+
+        private static void WriteResult(BridgeCommand command, string jsonPackage)
+        {
+            command.Client.Commands.TryRemove(command.Id, out _);
+            if (command.ProgressShown)
+            {
+                EditorUtility.ClearProgressBar();
+                command.ProgressShown = false;
+            }
+
+            try
+            {
+                string streamed = command.Chunks > 0 ? $", after {command.Chunks} chunks" : "";
+                LogToUI($"[Out] Sending Response #{command.Id} ({jsonPackage.Length} bytes{streamed})...");
+                command.Client.WriteFrame($"{{\"id\":{command.Id},\"type\":\"result\",\"payload\":{jsonPackage}}}");
+                LogToUI($"[Done] Interaction Complete");
+            }
+            catch (Exception e)
+            {
+                LogToUI($"[Error] Send Failed: {e.Message}");
             }
         }
     }
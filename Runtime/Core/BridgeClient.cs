@@ -0,0 +1,113 @@
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Net.Sockets;
+using System.Text;
+using Newtonsoft.Json.Linq;
+
+namespace Observater.AiSkills.Runtime.Core
+{
+    internal sealed class BridgeClient : IDisposable
+    {
+        public const int MAX_FRAME_BYTES = 64 * 1024 * 1024;
+
+        private readonly TcpClient _client;
+        private readonly NetworkStream _stream;
+        private readonly object _writeLock = new object();
+        private volatile bool _closed;
+
+        public readonly ConcurrentDictionary<long, BridgeCommand> Commands = new ConcurrentDictionary<long, BridgeCommand>();
+
+        public BridgeClient(TcpClient client)
+        {
+            _client = client;
+            _client.NoDelay = true;
+            _stream = client.GetStream();
+        }
+
+        public bool IsConnected => !_closed && _client.Connected;
+
+        public string ReadFrame()
+        {
+            byte[] header = ReadExactly(4);
+            if (header == null) return null;
+
+            uint length = (uint)(header[0] << 24 | header[1] << 16 | header[2] << 8 | header[3]);
+            if (length > MAX_FRAME_BYTES)
+            {
+                Dispose();
+                throw new InvalidDataException($"Frame too large: {length} bytes (max {MAX_FRAME_BYTES})");
+            }
+
+            byte[] body = ReadExactly((int)length);
+            return body == null ? null : Encoding.UTF8.GetString(body);
+        }
+
+        public void WriteFrame(string json)
+        {
+            byte[] body = Encoding.UTF8.GetBytes(json);
+            byte[] frame = new byte[body.Length + 4];
+            frame[0] = (byte)(body.Length >> 24);
+            frame[1] = (byte)(body.Length >> 16);
+            frame[2] = (byte)(body.Length >> 8);
+            frame[3] = (byte)body.Length;
+            Buffer.BlockCopy(body, 0, frame, 4, body.Length);
+
+            lock (_writeLock)
+            {
+                _stream.Write(frame, 0, frame.Length);
+                _stream.Flush();
+            }
+        }
+
+        private byte[] ReadExactly(int count)
+        {
+            byte[] buffer = new byte[count];
+            int offset = 0;
+            while (offset < count)
+            {
+                int read = _stream.Read(buffer, offset, count - offset);
+                if (read <= 0) return null;
+                offset += read;
+            }
+            return buffer;
+        }
+
+        public void Dispose()
+        {
+            _closed = true;
+            try { _stream.Close(); } catch { }
+            try { _client.Close(); } catch { }
+        }
+    }
+
+    internal sealed class BridgeCommand
+    {
+        public BridgeClient Client;
+        public long Id;
+        public string Code;
+        public bool Responded;
+        public int Chunks;
+        public bool ProgressShown;
+        public string Logs;
+        public volatile bool Cancelled;
+
+        public long JobId;
+        public Stopwatch Elapsed;
+
+        public string[] Scripts;
+        public int BudgetMs;
+        public bool StopOnError;
+        public int Next;
+        public bool Failed;
+        public List<string> Results;
+
+        public JObject Query;
+
+        public bool IsBatch => Scripts != null;
+        public bool IsQuery => Query != null;
+        public bool IsFinished => !IsBatch || Next >= Scripts.Length || (StopOnError && Failed) || Cancelled;
+    }
+}
@@ -0,0 +1,40 @@
+using System;
+using System.Threading;
+using UnityEngine;
+using Object = UnityEngine.Object;
+
+namespace Observater.AiSkills.Runtime.Core
+{
+    internal sealed class LogCapture : ILogHandler
+    {
+        public readonly ILogHandler Inner;
+        private readonly Action<string> _sink;
+        private readonly int _threadId = Thread.CurrentThread.ManagedThreadId;
+
+        public LogCapture(ILogHandler inner, Action<string> sink)
+        {
+            Inner = inner;
+            _sink = sink;
+        }
+
+        public void LogFormat(LogType logType, Object context, string format, params object[] args)
+        {
+            if (logType != LogType.Log || Thread.CurrentThread.ManagedThreadId != _threadId)
+            {
+                Inner.LogFormat(logType, context, format, args);
+                return;
+            }
+
+            try
+            {
+                _sink(args == null || args.Length == 0 ? format : string.Format(format, args));
+            }
+            catch (Exception)
+            {
+                Inner.LogFormat(logType, context, format, args);
+            }
+        }
+
+        public void LogException(Exception exception, Object context) => Inner.LogException(exception, context);
+    }
+}
@@ -2,26 +2,50 @@
 import os
 import argparse
 import json
-from flask import Flask, request, jsonify
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, request, jsonify, Response
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 from openai import OpenAI
-from config import DEFAULT_API_KEY, DEFAULT_API_BASE, DEFAULT_MODEL, SKILLS_DIR
-from utils import process_attachments, extract_python_code
+from config import (DEFAULT_API_KEY, DEFAULT_API_BASE, DEFAULT_MODEL, SKILLS_DIR, USE_HELPER_LIB, STREAM_QUEUE_SIZE,
+                    UNITY_BATCH_BUDGET_MS, BATCH_MAX_WORKERS, UNITY_BATCH_ASSET_EDITING, UNITY_CAPTURE_LOGS,
+                    VALIDATE_SCRIPTS, OPTIMIZE_SCRIPTS, AUTO_REPAIR, AUTO_REPAIR_MAX_ATTEMPTS,
+                    AUTO_REPAIR_DEADLINE, SCENE_CONTEXT, ASSET_CONTEXT, ASSET_CONTEXT_MAX, ATTACHMENT_CS_OUTLINE)
+from utils import extract_python_code
+from attachments import process_attachments, FULL_MARKER
 from skills import SkillManager
-from unity_bridge import execute_in_unity
+from unity_bridge import execute_in_unity, execute_many
 from history import HistoryManager
+from jobs import JobRegistry
+from patcher import build_followup_prompt, build_patch_error_prompt, apply_patch, PatchError
+from helper_lib import get_helper_lib
+from cassette import Cassette, CassetteError
+from validator import validate, build_repair_prompt, build_error_repair_prompt
+from optimizer import optimize
+from scene_context import SceneContext, build_scene_prompt
+from asset_index import get_asset_index, build_asset_prompt
+from asset_graph import get_asset_graph
 
 app = Flask(__name__)
 
 if not os.path.isabs(SKILLS_DIR):
     SKILLS_DIR = os.path.join(current_dir, SKILLS_DIR)
 
-sm = SkillManager(SKILLS_DIR)
+sm = SkillManager(SKILLS_DIR, helper_lib=get_helper_lib() if USE_HELPER_LIB else None)
 hm = None 
+jobs = JobRegistry()
+scene_context = SceneContext()
+last_project_root = None  # 最近一次对话请求中的 project_root，/assets 接口未指定时使用
+cassette = None  # --record / --replay 时为 Cassette
+
+def _elapsed_ms(t0):
+    return round((time.perf_counter() - t0) * 1000, 1)
 
 def generate_summary(client, model, user_prompt, ai_reply):
     try:
@@ -43,27 +67,138 @@ def generate_summary(client, model, user_prompt, ai_reply):
     except:
         return "Interaction completed."
 
-@app.route('/chat', methods=['POST'])
-def handle_chat():
-    global hm
-    d = request.json
-    sm.scan()
+def _usage_dict(usage):
+    if not usage:
+        return {}
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens
+    }
+
+def _validate_script(code):
+    lib = sm.helper_lib
+    return validate(code, exports=lib.exports if lib else (), package=lib.package if lib else "aiskills",
+                    references=sm.reference_functions())
+
+def _optimize_script(d, code, timings):
+    """按请求的 optimize 开关改写脚本中的热点写法，返回 (code, 已应用的改写说明)"""
+    if not d.get('optimize', OPTIMIZE_SCRIPTS):
+        return code, []
+    t0 = time.perf_counter()
+    code, applied = optimize(code)
+    timings["optimize_ms"] = timings.get("optimize_ms", 0) + _elapsed_ms(t0)
+    if applied:
+        print(f"[Optimizer] {applied}")
+    return code, applied
+
+def validate_and_repair(client, model, messages, raw_content, code, timings):
+    """
+    静态预检脚本：可机械修复的问题直接改写，其余问题连同模型的回复发回模型修复一次。
+    :return: (code, raw_content, validation, usage) — usage 为修复回合的 token 用量 (未修复时为 None)
+    """
+    t0 = time.perf_counter()
+    code, fixes, problems = _validate_script(code)
+    timings["validate_ms"] = _elapsed_ms(t0)
+    validation = {"fixes": fixes, "problems": problems, "repaired": False}
+    if not problems:
+        return code, raw_content, validation, None
+
+    print(f"[Validator] {len(problems)} problem(s), requesting repair: {problems}")
+    t0 = time.perf_counter()
+    res = client.chat.completions.create(
+        model=model,
+        messages=messages + [{"role": "assistant", "content": raw_content},
+                             {"role": "user", "content": build_repair_prompt(problems)}],
+        temperature=0.1
+    )
+    timings["repair_ms"] = _elapsed_ms(t0)
+    repaired_reply = res.choices[0].message.content
+    repaired = extract_python_code(repaired_reply)
+    if repaired:
+        repaired, more_fixes, remaining = _validate_script(repaired)
+        validation.update(fixes=fixes + more_fixes, problems=remaining, repaired=not remaining)
+        code, raw_content = repaired, repaired_reply
+    return code, raw_content, validation, _usage_dict(res.usage)
+
+def repair_patch(client, model, messages, raw_content, previous_script, error, timings):
+    """
+    补丁无法应用 (上下文找不到、SEARCH 匹配多处) 时把错误连同模型的回复发回模型，重新生成补丁一次。
+    :return: (code, mode, raw_content, usage)；重试的补丁仍无法应用时抛出 PatchError
+    """
+    print(f"[Patch] {error}, requesting a corrected patch")
+    t0 = time.perf_counter()
+    res = client.chat.completions.create(
+        model=model,
+        messages=messages + [{"role": "assistant", "content": raw_content},
+                             {"role": "user", "content": build_patch_error_prompt(error)}],
+        temperature=0.1
+    )
+    timings["patch_repair_ms"] = _elapsed_ms(t0)
+    reply = res.choices[0].message.content
+    code, mode = apply_patch(previous_script, reply)
+    return code, mode, reply, _usage_dict(res.usage)
+
+def generate_script(d, record=True, turn=None, context=None):
+    """
+    调用模型生成脚本但不执行，返回响应字典。
+    execution 只有在生成阶段已确定结果 (如补丁失败) 时才会填充。
+    record: 是否写入历史记录 (批量生成时由调用方按顺序统一写入)
+    turn: cassette 的录制/回放轮次，模型调用经由它录制或回放
+    context: 可选的字典，填入 client、model 与最终对话消息，供执行失败后的自动修复复用同一前缀
+    返回的 timings 为各阶段耗时 (毫秒)，供基准测试区分模型耗时与服务端开销。
+    """
+    t_start = time.perf_counter()
+    timings = {}
 
     client = OpenAI(
         api_key=d.get('api_key', DEFAULT_API_KEY),
         base_url=d.get('base_url', DEFAULT_API_BASE)
     )
+    if turn is not None:
+        client = turn.wrap_client(client)
 
     prompt = d.get('prompt', '')
     
     attachment_paths = d.get('attachments', [])
     project_root = d.get('project_root', None) 
-    attachment_context = process_attachments(attachment_paths, project_root)
+    if project_root:
+        global last_project_root
+        last_project_root = project_root
+    t0 = time.perf_counter()
+    # 提示中包含 "!full" 时附加的 C# 脚本发送原文
+    cs_outline = d.get('cs_outline', ATTACHMENT_CS_OUTLINE) and FULL_MARKER not in prompt
+    attachment_context = process_attachments(attachment_paths, project_root, cs_outline)
+    timings["attachments_ms"] = _elapsed_ms(t0)
     
+    t0 = time.perf_counter()
     selected_skills = sm.select(client, d.get('model', DEFAULT_MODEL), prompt)
+    timings["select_ms"] = _elapsed_ms(t0)
     sys_prompt = sm.build_system_prompt(selected_skills)
-    
-    current_full_prompt = prompt + attachment_context
+
+    # 场景快照附加在本轮用户消息末尾，不写入历史记录
+    scene_digest = None
+    if d.get('scene_context', SCENE_CONTEXT) and sm.needs_scene(selected_skills):
+        t0 = time.perf_counter()
+        scene_digest = turn.wrap_scene(scene_context.get)() if turn else scene_context.get()
+        timings["scene_ms"] = _elapsed_ms(t0)
+
+    # 提示中按名称提到的资源：直接查服务端索引，不访问 Unity
+    asset_matches = []
+    if d.get('asset_context', ASSET_CONTEXT) and sm.needs_assets(selected_skills):
+        t0 = time.perf_counter()
+        index = get_asset_index(project_root)
+        if index is not None:
+            asset_matches = index.match_prompt(prompt, limit=ASSET_CONTEXT_MAX)
+        timings["assets_ms"] = _elapsed_ms(t0)
+
+    current_full_prompt = (prompt + attachment_context + build_scene_prompt(scene_digest)
+                           + build_asset_prompt(asset_matches))
+
+    # 追问模式：附带上一轮脚本，让模型只返回补丁
+    previous_script = hm.get_last_script() if (hm and d.get('followup', False)) else None
+    if previous_script:
+        current_full_prompt = build_followup_prompt(current_full_prompt, previous_script)
 
     messages = [{"role": "system", "content": sys_prompt}]
     
@@ -76,47 +211,386 @@ def handle_chat():
     usage_info = {}
     raw_content = ""
     summary = ""
+    patch_info = None
+    exec_result = None
+    validation = None
+    optimizations = []
     
     try:
+        t0 = time.perf_counter()
         res = client.chat.completions.create(
             model=d.get('model', DEFAULT_MODEL),
             messages=messages,
             temperature=0.1
         )
+        timings["completion_ms"] = _elapsed_ms(t0)
         raw_content = res.choices[0].message.content
-        code_to_run = extract_python_code(raw_content)
 
-        if res.usage:
-            usage_info = {
-                "prompt_tokens": res.usage.prompt_tokens,
-                "completion_tokens": res.usage.completion_tokens,
-                "total_tokens": res.usage.total_tokens
-            }
+        code_to_run = None
+        usage_info = _usage_dict(res.usage)
+        if previous_script:
+            retried = False
+            try:
+                try:
+                    code_to_run, patch_mode = apply_patch(previous_script, raw_content)
+                except PatchError as e:
+                    retried = True
+                    code_to_run, patch_mode, raw_content, patch_usage = repair_patch(
+                        client, d.get('model', DEFAULT_MODEL), messages, raw_content, previous_script, e, timings)
+                    usage_info = {k: usage_info.get(k, 0) + v for k, v in patch_usage.items()}
+                if code_to_run is not None:
+                    patch_info = {"mode": patch_mode, "applied": True, "retried": retried}
+            except PatchError as e:
+                patch_info = {"applied": False, "error": str(e), "retried": retried}
+                exec_result = {"status": "error", "message": f"Patch Error: {e}"}
 
-        if hm:
+        if code_to_run is None and exec_result is None:
+            code_to_run = extract_python_code(raw_content)
+
+        # 发送到 Unity 前做静态预检，修复回合后仍有问题时不再执行
+        if code_to_run and exec_result is None and d.get('validate', VALIDATE_SCRIPTS):
+            code_to_run, raw_content, validation, repair_usage = validate_and_repair(
+                client, d.get('model', DEFAULT_MODEL), messages, raw_content, code_to_run, timings)
+            if repair_usage:
+                usage_info = {k: usage_info.get(k, 0) + v for k, v in repair_usage.items()}
+            if validation["problems"]:
+                exec_result = {"status": "error",
+                               "message": "Validation failed: " + "; ".join(validation["problems"])}
+        elif code_to_run and patch_info:
+            # 未启用预检时，补丁后的脚本至少做语法校验
+            try:
+                compile(code_to_run, "<patched>", "exec")
+            except SyntaxError as e:
+                exec_result = {"status": "error", "message": f"Patched script is invalid: {e}"}
+
+        if code_to_run and exec_result is None:
+            code_to_run, optimizations = _optimize_script(d, code_to_run, timings)
+
+        if context is not None:
+            context.update(client=client, model=d.get('model', DEFAULT_MODEL),
+                           messages=messages + [{"role": "assistant", "content": raw_content}])
+
+        if hm and record:
             hm.add_entry("user", prompt) 
+            t0 = time.perf_counter()
             summary = generate_summary(client, d.get('model', DEFAULT_MODEL), prompt, raw_content)
-            hm.add_entry("assistant", raw_content, summary=summary)
+            timings["summary_ms"] = _elapsed_ms(t0)
+            hm.add_entry("assistant", raw_content, summary=summary,
+                         script=code_to_run if exec_result is None else None)
 
     except Exception as e:
         import traceback
         traceback.print_exc()
-        return jsonify({"status": "error", "reply": f"AI Error: {e}"})
-
-    exec_result = None
-    if code_to_run:
-        exec_result = execute_in_unity(code_to_run)
-    else:
-        exec_result = {"status": "ok", "message": "No code generated."}
+        return {"status": "error", "reply": f"AI Error: {e}"}
 
-    return jsonify({
+    return {
         "status": "ok",
         "reply": raw_content,
         "selected_skills": selected_skills,
         "usage": usage_info,
         "execution": exec_result,
-        "summary": summary
-    })
+        "summary": summary,
+        "script": code_to_run,
+        "patch": patch_info,
+        "validation": validation,
+        "optimizations": optimizations,
+        "scene_chars": len(scene_digest) if scene_digest else 0,
+        "asset_matches": asset_matches,
+        "timings": dict(timings, generate_ms=_elapsed_ms(t_start))
+    }
+
+def auto_repair(d, result, context, run_script, token, emit=None):
+    """
+    执行失败后的自动修复：把错误信息与失败的脚本发回模型 (沿用本轮对话消息作为前缀，便于命中提示词缓存)，
+    预检后重新执行，最多 repair_attempts 次且不超过 repair_deadline 秒。
+    结果写回 result (reply / script / execution / usage)，统计写入 result["auto_repair"] 与 timings。
+    """
+    max_attempts = d.get('repair_attempts', AUTO_REPAIR_MAX_ATTEMPTS)
+    deadline = time.perf_counter() + d.get('repair_deadline', AUTO_REPAIR_DEADLINE)
+    t_start = time.perf_counter()
+    messages = list(context["messages"])
+    stats = {"attempts": 0, "succeeded": False, "time_to_success_ms": None, "steps": []}
+    result["auto_repair"] = stats
+    timings = result["timings"]
+    usage = result["usage"]
+
+    error = result["execution"].get("message") or ""
+    script = result["script"]
+    while stats["attempts"] < max_attempts and time.perf_counter() < deadline and not token.cancelled:
+        stats["attempts"] += 1
+        attempt = {"attempt": stats["attempts"]}
+        messages.append({"role": "user", "content": build_error_repair_prompt(error, script)})
+        print(f"[Repair] Attempt {stats['attempts']}/{max_attempts}: {(error.strip().splitlines() or [''])[-1]}")
+
+        t0 = time.perf_counter()
+        try:
+            res = context["client"].chat.completions.create(model=context["model"], messages=messages,
+                                                            temperature=0.1)
+        except Exception as e:
+            attempt.update(status="error", message=f"AI Error: {e}")
+            stats["steps"].append(attempt)
+            break
+        timings["auto_repair_llm_ms"] = timings.get("auto_repair_llm_ms", 0) + _elapsed_ms(t0)
+        reply = res.choices[0].message.content
+        messages.append({"role": "assistant", "content": reply})
+        for k, v in _usage_dict(res.usage).items():
+            usage[k] = usage.get(k, 0) + v
+
+        fixed = extract_python_code(reply)
+        if not fixed:
+            error = "No ```python block was returned."
+            attempt.update(status="error", message=error)
+            stats["steps"].append(attempt)
+            continue
+        t0 = time.perf_counter()
+        fixed, _, problems = _validate_script(fixed)
+        timings["validate_ms"] = timings.get("validate_ms", 0) + _elapsed_ms(t0)
+        if problems:
+            error = "Static validation failed:\n" + "\n".join(problems)
+            script = fixed
+            attempt.update(status="error", message=error)
+            stats["steps"].append(attempt)
+            continue
+
+        fixed, applied = _optimize_script(d, fixed, timings)
+        result["optimizations"] = applied
+        if emit:
+            emit({"event": "repair", "attempt": stats["attempts"], "error": error, "script": fixed})
+        script = fixed
+        execution = run_script(fixed)
+        result.update(reply=reply, script=fixed, execution=execution)
+        attempt.update(status=execution.get("status"), message=execution.get("message"))
+        stats["steps"].append(attempt)
+        if execution.get("status") != "error":
+            stats["succeeded"] = True
+            stats["time_to_success_ms"] = _elapsed_ms(t_start)
+            if hm:
+                hm.set_last_script(fixed)
+            break
+        error = execution.get("message") or ""
+
+    timings["auto_repair_ms"] = _elapsed_ms(t_start)
+
+def run_chat(d, emit=None):
+    """
+    处理一轮对话并返回响应字典。
+    emit: 可选的事件回调，流式接口用它实时推送模型回复与 Unity 的分块结果
+    """
+    t_start = time.perf_counter()
+    sm.scan()
+    try:
+        turn = cassette.begin_turn(d.get('prompt', '')) if cassette else None
+    except CassetteError as e:
+        return {"status": "error", "reply": f"Cassette Error: {e}"}
+    try:
+        context = {}
+        result = generate_script(d, turn=turn, context=context)
+        if result["status"] != "ok":
+            return result
+
+        if emit:
+            emit({"event": "reply", "reply": result["reply"], "selected_skills": result["selected_skills"],
+                  "script": result["script"]})
+
+        if result["execution"] is None:
+            if result["script"]:
+                job = jobs.start(d.get('prompt', ''))
+                result["job_id"] = job["id"]
+                if emit:
+                    emit({"event": "job", "job_id": job["id"]})
+                on_chunk = (lambda items: emit({"event": "chunk", "items": items})) if emit else None
+
+                def on_progress(progress):
+                    jobs.update(job["id"], progress)
+                    if emit:
+                        emit(dict(progress, event="progress"))
+
+                execute = turn.wrap_execute(execute_in_unity) if turn else execute_in_unity
+
+                def run_script(script):
+                    t0 = time.perf_counter()
+                    try:
+                        return execute(
+                            script, on_chunk=on_chunk,
+                            batch_assets=d.get('batch_assets', UNITY_BATCH_ASSET_EDITING),
+                            budget_ms=d.get('budget_ms', UNITY_BATCH_BUDGET_MS),
+                            capture_logs=d.get('capture_logs', UNITY_CAPTURE_LOGS),
+                            revert_on_error=d.get('auto_repair', AUTO_REPAIR),
+                            on_progress=on_progress,
+                            cancel_token=job["token"])
+                    finally:
+                        result["timings"]["unity_ms"] = result["timings"].get("unity_ms", 0) + _elapsed_ms(t0)
+
+                try:
+                    result["execution"] = run_script(result["script"])
+                    if d.get('auto_repair', AUTO_REPAIR) and result["execution"].get("status") == "error":
+                        auto_repair(d, result, context, run_script, job["token"], emit)
+                finally:
+                    jobs.finish(job["id"])
+                    # 脚本在执行前已写入历史；与 /chat/batch 一致，执行失败的脚本不作为追问补丁的基准
+                    if hm and (result["execution"] or {}).get("status") != "ok":
+                        hm.set_last_script(None)
+            else:
+                result["execution"] = {"status": "ok", "message": "No code generated."}
+        result["timings"]["total_ms"] = _elapsed_ms(t_start)
+        return result
+    finally:
+        # 生成失败提前返回或抛出异常时同样写入录制，回放时才能复现这一轮
+        if turn:
+            cassette.end_turn(turn)
+
+@app.route('/chat', methods=['POST'])
+def handle_chat():
+    return jsonify(run_chat(request.json))
+
+@app.route('/chat/batch', methods=['POST'])
+def handle_chat_batch():
+    """
+    批量对话：prompts 中的每条提示并发生成脚本，再作为一个批次发送到 Unity，
+    在同一帧预算内尽可能多地执行，一次返回全部结果。其余字段与 /chat 相同，对所有提示共用。
+    """
+    d = request.json
+    prompts = d.get('prompts', [])
+    if not prompts:
+        return jsonify({"status": "error", "reply": "No prompts."})
+    sm.scan()
+
+    with ThreadPoolExecutor(max_workers=min(len(prompts), BATCH_MAX_WORKERS)) as pool:
+        results = list(pool.map(lambda p: generate_script(dict(d, prompt=p, followup=False), record=False), prompts))
+
+    pending = [r for r in results if r["status"] == "ok" and r["execution"] is None and r["script"]]
+    job = jobs.start(f"[batch x{len(pending)}] " + prompts[0])
+    try:
+        outcomes = execute_many([r["script"] for r in pending], budget_ms=d.get('budget_ms', UNITY_BATCH_BUDGET_MS),
+                                batch_assets=d.get('batch_assets', UNITY_BATCH_ASSET_EDITING),
+                                capture_logs=d.get('capture_logs', UNITY_CAPTURE_LOGS),
+                                cancel_token=job["token"])
+    finally:
+        jobs.finish(job["id"])
+    for r, outcome in zip(pending, outcomes):
+        r["execution"] = outcome
+
+    for prompt, r in zip(prompts, results):
+        if r["status"] != "ok":
+            continue
+        if r["execution"] is None:
+            r["execution"] = {"status": "ok", "message": "No code generated."}
+        if hm:
+            hm.add_entry("user", prompt)
+            hm.add_entry("assistant", r["reply"], script=r["script"] if r["execution"].get("status") == "ok" else None)
+
+    return jsonify({"status": "ok", "results": results})
+
+@app.route('/chat/stream', methods=['POST'])
+def handle_chat_stream():
+    """
+    流式对话 (NDJSON，每行一个事件)：
+    reply -> job -> (chunk | progress)* -> done。done 事件即 /chat 的完整响应，其中已推送过的分块数据不再重复。
+    progress 事件为 {"done", "total", "label"}，由 Unity 脚本的 Progress / tqdm 汇报 (已限流)。
+    job 事件携带 job_id，可用于 /jobs/<job_id>/cancel。
+    """
+    d = request.json
+    events = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    dropped = [0]
+    disconnected = threading.Event()
+
+    def emit(event):
+        # 客户端读取过慢时丢弃分块与进度，避免阻塞 Unity 连接的读线程
+        if disconnected.is_set():
+            return
+        try:
+            events.put_nowait(event)
+        except queue.Full:
+            dropped[0] += 1
+
+    def worker():
+        try:
+            result = run_chat(d, emit)
+        except Exception as e:
+            result = {"status": "error", "reply": f"AI Error: {e}"}
+        execution = result.get("execution")
+        if isinstance(execution, dict) and "data" in execution:
+            result["execution"] = {k: v for k, v in execution.items() if k != "data"}
+        result["dropped_chunks"] = dropped[0]
+        # done 事件不能丢弃，但客户端断开后队列可能一直是满的：按间隔重试直到放入或客户端断开
+        while not disconnected.is_set():
+            try:
+                events.put(dict(result, event="done"), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    threading.Thread(target=worker, daemon=True).start()
+
+    def generate():
+        try:
+            while True:
+                event = events.get()
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+                if event.get("event") == "done":
+                    return
+        finally:
+            # 客户端断开时生成器被关闭 (GeneratorExit)，通知工作线程不再等待队列
+            disconnected.set()
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    return jsonify({"status": "ok", "jobs": jobs.list()})
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    if jobs.cancel(job_id):
+        return jsonify({"status": "ok", "message": f"Cancel requested for {job_id}."})
+    return jsonify({"status": "error", "message": f"Job {job_id} not found."})
+
+def _request_asset_index():
+    index = get_asset_index(request.args.get('project_root') or last_project_root)
+    if index is None:
+        return None, jsonify({"status": "error", "message": "Unknown project_root (no Assets folder)."})
+    return index, None
+
+@app.route('/assets/search', methods=['GET'])
+def search_assets():
+    index, error = _request_asset_index()
+    if error:
+        return error
+    results = index.search(request.args.get('q', ''), limit=request.args.get('limit', 10, type=int),
+                           ext=request.args.get('ext'))
+    return jsonify({"status": "ok", "results": results, "count": len(index), "stats": index.stats})
+
+@app.route('/assets/guid/<guid>', methods=['GET'])
+def asset_by_guid(guid):
+    index, error = _request_asset_index()
+    if error:
+        return error
+    path = index.path_of(guid)
+    if path is None:
+        return jsonify({"status": "error", "message": f"GUID {guid} not found."})
+    return jsonify({"status": "ok", "guid": guid.lower(), "path": path})
+
+@app.route('/assets/references', methods=['GET'])
+def asset_references():
+    index, error = _request_asset_index()
+    if error:
+        return error
+    target = request.args.get('path') or request.args.get('guid', '')
+    graph = get_asset_graph(index)
+    path = graph.resolve(target)
+    if path is None:
+        return jsonify({"status": "error", "message": f"Asset {target} not found."})
+    return jsonify({"status": "ok", "asset": path, "references": graph.references_to(path),
+                    "dependencies": graph.dependencies_of(path) or [], "stats": graph.stats})
+
+@app.route('/assets/unused', methods=['GET'])
+def unused_assets():
+    index, error = _request_asset_index()
+    if error:
+        return error
+    graph = get_asset_graph(index)
+    unused = graph.unused(request.args.get('folder', 'Assets'), ext=request.args.get('ext'))
+    return jsonify({"status": "ok", "unused": unused, "count": len(unused), "stats": graph.stats})
 
 @app.route('/history/clear', methods=['POST'])
 def clear_history():
@@ -153,11 +627,19 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--port", type=int, default=5000)
     parser.add_argument("--history", type=str, default="chat_history.json")
+    parser.add_argument("--record", type=str, default=None, help="录制每轮的模型调用与 Unity 回复到 cassette 文件")
+    parser.add_argument("--replay", type=str, default=None, help="从 cassette 文件回放，不访问模型与 Unity")
+    parser.add_argument("--replay-latency", choices=["original", "zero"], default="original")
     args = parser.parse_args()
     
     print(f"Starting AI Server on port {args.port}...")
     print(f"History file: {args.history}")
     
     hm = HistoryManager(args.history)
+    if args.record:
+        cassette = Cassette(args.record, "record")
+        print(f"[Cassette] Recording to {args.record}")
+    elif args.replay:
+        cassette = Cassette(args.replay, "replay", args.replay_latency)
     
     app.run(host='127.0.0.1', port=args.port, debug=False)
\ No newline at end of file
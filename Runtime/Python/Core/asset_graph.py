@@ -0,0 +1,250 @@
+"""
+离线资源引用图 (不经过编辑器)。
+
+在 ProcessPoolExecutor 中并行扫描 .unity / .prefab / .mat / .asset / .controller 等文本 YAML 资源中的
+"guid: ..." 引用，结合 asset_index 的 GUID -> 路径映射建立反向依赖图，回答 "谁引用了 X" 与 "未被引用的资源"。
+每个文件的引用按内容哈希缓存 (内容相同的文件共用一份)，文件以 (mtime, size) 判断是否需要重新解析；
+缓存写入 Library/AiSkills/asset_graph.json，服务端重启后只解析变化的文件。
+"""
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+import threading
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+from config import (ASSET_GRAPH_EXTENSIONS, ASSET_GRAPH_POOL_MIN_FILES, ASSET_GRAPH_MAX_WORKERS,
+                    ASSET_INDEX_RESCAN_INTERVAL)
+
+CACHE_VERSION = 1
+CACHE_FILE = os.path.join("Library", "AiSkills", "asset_graph.json")
+
+# 按块读取，场景文件可能有上百 MB；块之间保留末尾若干字节，避免引用被块边界截断
+_CHUNK_BYTES = 1024 * 1024
+_CHUNK_OVERLAP = 64
+_GUID_REF = re.compile(rb"guid: ?([0-9a-f]{32})")
+
+# 可能通过名称或代码加载的资源：即使没有被引用也不视为未使用
+UNUSED_IGNORED_FOLDERS = {"Resources", "Editor", "Editor Default Resources", "StreamingAssets", "Plugins", "Gizmos"}
+UNUSED_IGNORED_EXTENSIONS = {".cs", ".asmdef", ".asmref", ".rsp", ".dll", ".so", ".jslib",
+                             ".shader", ".cginc", ".hlsl", ".compute"}
+
+
+def _scan_file(path):
+    """
+    进程池中执行：返回 (内容哈希, 引用的 guid 列表, 是否为文本 YAML)；读取失败返回 None。
+    二进制序列化的资源无法解析引用，只计算哈希。
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    guids = set()
+    text = None
+    tail = b""
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(_CHUNK_BYTES)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                if text is None:
+                    text = chunk.startswith(b"%YAML")
+                if text:
+                    buf = tail + chunk
+                    guids.update(_GUID_REF.findall(buf))
+                    tail = buf[-_CHUNK_OVERLAP:]
+    except OSError:
+        return None
+    return digest.hexdigest(), sorted(g.decode("ascii") for g in guids), bool(text)
+
+
+class AssetGraph:
+    def __init__(self, index, extensions=ASSET_GRAPH_EXTENSIONS):
+        self.index = index
+        self.project_root = index.project_root
+        self.extensions = tuple(extensions)
+        self._lock = threading.Lock()
+        self._files = {}    # 资源路径 -> (mtime, size, 内容哈希)
+        self._refs = {}     # 内容哈希 -> [guid]
+        self._reverse = collections.defaultdict(set)  # guid -> {引用它的资源路径}
+        self._last_scan = 0.0
+        self.stats = {"scans": 0, "files": 0, "parsed": 0, "binary": 0, "workers": 0, "scan_ms": 0.0}
+        self._load_cache()
+
+    # --- 扫描 ---
+
+    def _sources(self):
+        """需要解析引用的文件：索引中指定扩展名的资源，以及 ProjectSettings 下的设置 (Build Settings 中的场景等)"""
+        by_path, folders = self.index.snapshot()
+        sources = [p for p in by_path if p.lower().endswith(self.extensions) and p not in folders]
+        settings = os.path.join(self.project_root, "ProjectSettings")
+        sources += [f"ProjectSettings/{os.path.basename(p)}" for p in glob.glob(os.path.join(settings, "*.asset"))]
+        return sources
+
+    def refresh(self, min_interval=ASSET_INDEX_RESCAN_INTERVAL):
+        """重新检查所有来源文件的 (mtime, size)，只解析变化的文件；距上次扫描不足 min_interval 秒时跳过"""
+        with self._lock:
+            if self._last_scan and time.monotonic() - self._last_scan < min_interval:
+                return False
+            t0 = time.perf_counter()
+            self.index.refresh(min_interval)
+            sources = self._sources()
+
+            changed = []
+            for path in sources:
+                try:
+                    st = os.stat(os.path.join(self.project_root, path))
+                except OSError:
+                    continue
+                cached = self._files.get(path)
+                if cached is None or cached[0] != st.st_mtime_ns or cached[1] != st.st_size:
+                    changed.append((path, st.st_mtime_ns, st.st_size))
+
+            removed = set(self._files).difference(sources)
+            for path in removed:
+                self._set_file(path, None)
+            if changed:
+                for (path, mtime, size), result in zip(changed, self._parse([c[0] for c in changed])):
+                    if result is None:
+                        self._set_file(path, None)
+                        continue
+                    digest, guids, text = result
+                    self._refs[digest] = guids
+                    self._set_file(path, (mtime, size, digest))
+                    self.stats["binary"] += 0 if text else 1
+                self.stats["parsed"] += len(changed)
+            if changed or removed:
+                self._save_cache()
+
+            self._last_scan = time.monotonic()
+            self.stats["scans"] += 1
+            self.stats["files"] = len(self._files)
+            self.stats["scan_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            return True
+
+    def _parse(self, paths):
+        full = [os.path.join(self.project_root, p) for p in paths]
+        if len(full) < ASSET_GRAPH_POOL_MIN_FILES:
+            self.stats["workers"] = 0
+            return [_scan_file(p) for p in full]
+        workers = ASSET_GRAPH_MAX_WORKERS or os.cpu_count() or 1
+        self.stats["workers"] = workers
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_scan_file, full, chunksize=max(1, len(full) // (workers * 4))))
+
+    def _set_file(self, path, entry):
+        """更新文件记录并同步反向索引；entry 为 None 表示文件已删除"""
+        old = self._files.pop(path, None)
+        if old is not None:
+            for guid in self._refs.get(old[2], ()):
+                referrers = self._reverse.get(guid)
+                if referrers is not None:
+                    referrers.discard(path)
+                    if not referrers:
+                        del self._reverse[guid]
+        if entry is None:
+            return
+        self._files[path] = entry
+        own = self.index.guid_of(path)
+        for guid in self._refs.get(entry[2], ()):
+            if guid != own:
+                self._reverse[guid].add(path)
+
+    # --- 缓存 ---
+
+    def _cache_path(self):
+        return os.path.join(self.project_root, CACHE_FILE)
+
+    def _load_cache(self):
+        try:
+            with open(self._cache_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        self._refs = data.get("refs", {})
+        for path, entry in data.get("files", {}).items():
+            if entry[2] in self._refs:
+                self._set_file(path, tuple(entry))
+
+    def _save_cache(self):
+        """只在 Unity 项目 (存在 Library 目录) 中写缓存；未被任何文件使用的哈希不写入"""
+        if not os.path.isdir(os.path.join(self.project_root, "Library")):
+            return
+        used = {entry[2] for entry in self._files.values()}
+        self._refs = {digest: guids for digest, guids in self._refs.items() if digest in used}
+        path = self._cache_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "files": self._files, "refs": self._refs}, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[AssetGraph] Failed to write cache: {e}")
+
+    # --- 查询 ---
+
+    def resolve(self, target):
+        """资源路径或 guid -> 资源路径；不在索引中时返回 None"""
+        target = (target or "").replace("\\", "/")
+        return target if self.index.guid_of(target) else self.index.path_of(target)
+
+    def references_to(self, target):
+        """引用了 target (资源路径或 guid) 的文件路径；target 不在索引中时返回 None"""
+        guid = self.index.guid_of(self.resolve(target))
+        if guid is None:
+            return None
+        with self._lock:
+            return sorted(self._reverse.get(guid, ()))
+
+    def dependencies_of(self, path):
+        """path 直接引用的资源路径 (内置资源等不在索引中的 guid 忽略)；path 未被解析时返回 None"""
+        with self._lock:
+            entry = self._files.get((path or "").replace("\\", "/"))
+            guids = self._refs.get(entry[2], ()) if entry else None
+        if guids is None:
+            return None
+        return sorted({p for p in map(self.index.path_of, guids) if p and p != path})
+
+    def unused(self, folder="Assets", ext=None):
+        """
+        folder 下没有被任何已解析文件引用的资源。
+        Resources / Editor / StreamingAssets 等目录中的资源与脚本、着色器等可能被名称或代码加载的资源不计入；
+        场景只有在 Build Settings 中时才算被引用。二进制序列化的资源中的引用无法解析，结果可能偏多。
+        """
+        prefix = folder.replace("\\", "/").rstrip("/") + "/"
+        ext = ("." + ext.lstrip(".")).lower() if ext else None
+        result = []
+        by_path, folders = self.index.snapshot()
+        with self._lock:
+            for path, guid in by_path.items():
+                if not path.startswith(prefix) or path in folders or guid in self._reverse:
+                    continue
+                lower = path.lower()
+                if ext and not lower.endswith(ext):
+                    continue
+                if os.path.splitext(lower)[1] in UNUSED_IGNORED_EXTENSIONS:
+                    continue
+                if UNUSED_IGNORED_FOLDERS.intersection(path.split("/")[:-1]):
+                    continue
+                result.append(path)
+        return sorted(result)
+
+
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def get_asset_graph(index, refresh=True):
+    """按资源索引复用引用图实例；refresh 时增量更新"""
+    with _graphs_lock:
+        graph = _graphs.get(index.project_root)
+        if graph is None:
+            graph = _graphs[index.project_root] = AssetGraph(index)
+    if refresh:
+        graph.refresh()
+    return graph
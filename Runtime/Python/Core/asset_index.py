@@ -0,0 +1,273 @@
+"""
+服务端的 Unity 项目资源索引 (不经过编辑器)。
+
+直接扫描 project_root 下 Assets 与 Packages 中的 .meta 文件，建立 GUID <-> 路径 映射，
+并对资源名建立三元组 (trigram) 索引用于模糊搜索。
+增量更新：记录每个目录的 mtime，重新扫描时只重新列出 mtime 变化的目录 (增删、改名文件会改变目录 mtime)，
+其中只重新解析 mtime 变化的 .meta；目录未变化时不访问其中的文件。
+路径统一为相对 project_root、以 / 分隔的 Unity 资源路径，如 Assets/Materials/Red.mat。
+"""
+import os
+import re
+import time
+import threading
+import collections
+
+from config import ASSET_INDEX_RESCAN_INTERVAL
+
+# 扫描的顶层目录
+ASSET_ROOTS = ("Assets", "Packages")
+
+# .meta 中只需要开头的 guid 行
+_META_HEAD_BYTES = 512
+_GUID = re.compile(rb"^guid:\s*([0-9a-fA-F]{32})", re.M)
+_WORD = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_\-.]*")
+
+# 匹配提示中的资源名时忽略的常见词
+_STOPWORDS = {"the", "and", "for", "with", "all", "new", "add", "set", "get", "use", "from", "into", "this", "that"}
+
+
+def _ignored(name):
+    """Unity 不导入的文件与目录：以 . 开头或以 ~ 结尾"""
+    return name.startswith(".") or name.endswith("~")
+
+
+def _trigrams(text):
+    text = f"  {text.lower()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class AssetIndex:
+    def __init__(self, project_root, roots=ASSET_ROOTS):
+        self.project_root = os.path.abspath(project_root)
+        self.roots = roots
+        self._lock = threading.Lock()
+        self._dirs = {}      # 目录路径 -> (mtime, 子目录列表, .meta 文件名列表)
+        self._metas = {}     # 资源路径 -> .meta 的 mtime
+        self.by_guid = {}    # guid -> 资源路径
+        self.by_path = {}    # 资源路径 -> guid
+        self.folders = set()  # 文件夹资源 (folderAsset: yes) 的路径
+        self._names = {}     # 资源路径 -> (小写资源名, trigram 数)
+        self._by_name = collections.defaultdict(set)   # 小写资源名 (不含扩展名) -> {资源路径}
+        self._trigrams = collections.defaultdict(set)  # trigram -> {资源路径}
+        self._last_scan = 0.0
+        self.stats = {"scans": 0, "dirs_listed": 0, "metas_parsed": 0, "scan_ms": 0.0}
+
+    def __len__(self):
+        return len(self.by_path)
+
+    # --- 扫描 ---
+
+    def refresh(self, min_interval=ASSET_INDEX_RESCAN_INTERVAL, full=False):
+        """
+        增量重新扫描；距上次扫描不足 min_interval 秒时跳过。
+        full: 忽略目录 mtime，重新检查所有 .meta 的 mtime (原地修改 guid 等不改变目录 mtime 的情况)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not full and self._last_scan and now - self._last_scan < min_interval:
+                return False
+            t0 = time.perf_counter()
+            for root in self.roots:
+                self._scan(root, full)
+            self._last_scan = time.monotonic()
+            self.stats["scans"] += 1
+            self.stats["scan_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            return True
+
+    def _scan(self, root, full):
+        stack = [root]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self.project_root, rel)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                self._drop_dir(rel)
+                continue
+
+            cached = self._dirs.get(rel)
+            if cached is not None and cached[0] == mtime and not full:
+                stack.extend(cached[1])
+                continue
+
+            subdirs, metas = [], []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if _ignored(entry.name):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(f"{rel}/{entry.name}")
+                        elif entry.name.endswith(".meta"):
+                            metas.append(entry.name)
+            except OSError:
+                self._drop_dir(rel)
+                continue
+            self.stats["dirs_listed"] += 1
+
+            if cached is not None:
+                for gone in set(cached[1]) - set(subdirs):
+                    self._drop_dir(gone)
+                for gone in set(cached[2]) - set(metas):
+                    self._remove(f"{rel}/{gone[:-5]}")
+            self._dirs[rel] = (mtime, subdirs, metas)
+
+            for name in metas:
+                self._update_meta(f"{rel}/{name[:-5]}")
+            stack.extend(subdirs)
+
+    def _update_meta(self, asset):
+        try:
+            mtime = os.stat(os.path.join(self.project_root, asset + ".meta")).st_mtime_ns
+        except OSError:
+            self._remove(asset)
+            return
+        if self._metas.get(asset) == mtime:
+            return
+        try:
+            with open(os.path.join(self.project_root, asset + ".meta"), "rb") as f:
+                head = f.read(_META_HEAD_BYTES)
+        except OSError:
+            head = b""
+        self.stats["metas_parsed"] += 1
+        self._remove(asset)
+        match = _GUID.search(head)
+        if match:
+            self._add(asset, match.group(1).decode("ascii").lower(), b"folderAsset: yes" in head)
+        self._metas[asset] = mtime
+
+    def _drop_dir(self, rel):
+        """目录被删除：移除其下所有目录与资源"""
+        cached = self._dirs.pop(rel, None)
+        if cached is None:
+            return
+        for sub in cached[1]:
+            self._drop_dir(sub)
+        for name in cached[2]:
+            self._remove(f"{rel}/{name[:-5]}")
+
+    def _add(self, asset, guid, folder=False):
+        self.by_guid[guid] = asset
+        self.by_path[asset] = guid
+        if folder:
+            self.folders.add(asset)
+        name = os.path.splitext(asset.rsplit("/", 1)[-1])[0].lower()
+        grams = _trigrams(name)
+        self._names[asset] = (name, len(grams))
+        self._by_name[name].add(asset)
+        for gram in grams:
+            self._trigrams[gram].add(asset)
+
+    def _remove(self, asset):
+        self._metas.pop(asset, None)
+        guid = self.by_path.pop(asset, None)
+        if guid is None:
+            return
+        if self.by_guid.get(guid) == asset:
+            del self.by_guid[guid]
+        self.folders.discard(asset)
+        name, _ = self._names.pop(asset)
+        self._by_name[name].discard(asset)
+        if not self._by_name[name]:
+            del self._by_name[name]
+        for gram in _trigrams(name):
+            postings = self._trigrams.get(gram)
+            if postings is not None:
+                postings.discard(asset)
+                if not postings:
+                    del self._trigrams[gram]
+
+    # --- 查询 ---
+
+    def path_of(self, guid):
+        return self.by_guid.get((guid or "").lower())
+
+    def guid_of(self, path):
+        return self.by_path.get((path or "").replace("\\", "/"))
+
+    def snapshot(self):
+        """(资源路径 -> guid, 文件夹资源路径) 的副本，供其他线程遍历 (refresh 会修改 by_path 与 folders)"""
+        with self._lock:
+            return dict(self.by_path), set(self.folders)
+
+    def search(self, query, limit=10, ext=None, min_score=0.3):
+        """
+        按资源名模糊搜索，返回 [{"path", "guid", "score"}]，score 为 0~1 (完全相同为 1，包含查询串不低于 0.8)。
+        ext: 只返回该扩展名的资源，如 ".mat" 或 "mat"
+        """
+        query = (query or "").strip().lower()
+        if not query:
+            return []
+        ext = ("." + ext.lstrip(".")).lower() if ext else None
+        grams = _trigrams(query)
+        with self._lock:
+            counts = collections.Counter()
+            for gram in grams:
+                counts.update(self._trigrams.get(gram, ()))
+            results = []
+            # Dice 系数不低于 min_score 至少需要共享 min_score * len(grams) / 2 个 trigram；
+            # 包含查询串的名称至少共享除两端补空格外的全部 trigram
+            min_shared = min(min_score * len(grams) / 2, len(grams) - 3)
+            for asset, shared in counts.items():
+                if shared < min_shared or (ext and not asset.lower().endswith(ext)):
+                    continue
+                name, name_grams = self._names[asset]
+                score = 2.0 * shared / (len(grams) + name_grams)
+                if name == query:
+                    score = 1.0
+                elif query in name:
+                    score = max(score, 0.8)
+                if score >= min_score:
+                    results.append({"path": asset, "guid": self.by_path[asset], "score": round(score, 3)})
+        results.sort(key=lambda r: (-r["score"], len(r["path"])))
+        return results[:limit]
+
+    def match_prompt(self, prompt, limit=20):
+        """
+        提示中按名称 (不区分大小写，单词或相邻两个单词) 精确提到的资源路径，供组装提示时附加。
+        """
+        words = [w.strip(".-") for w in _WORD.findall(prompt or "")]
+        words = [w for w in words if w]
+        candidates = []
+        for i, w in enumerate(words):
+            if len(w) >= 3 and w.lower() not in _STOPWORDS:
+                candidates += [w.lower(), os.path.splitext(w)[0].lower()]
+            if i + 1 < len(words):
+                candidates += [f"{w} {words[i + 1]}".lower(), f"{w}_{words[i + 1]}".lower()]
+        found = []
+        with self._lock:
+            for name in dict.fromkeys(candidates):
+                for asset in sorted(self._by_name.get(name, ())):
+                    if asset not in found and asset not in self.folders:
+                        found.append(asset)
+        return found[:limit]
+
+
+ASSET_PROMPT = """
+
+## Project Assets
+Assets in this project whose names appear in the request (exact paths, use them instead of searching):
+{assets}"""
+
+
+def build_asset_prompt(assets):
+    return ASSET_PROMPT.format(assets="\n".join(f"- {a}" for a in assets)) if assets else ""
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_asset_index(project_root, refresh=True):
+    """按 project_root 复用索引实例；refresh 时按 ASSET_INDEX_RESCAN_INTERVAL 节流做增量扫描"""
+    if not project_root or not os.path.isdir(os.path.join(project_root, "Assets")):
+        return None
+    key = os.path.normcase(os.path.abspath(project_root))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = AssetIndex(project_root)
+    if refresh:
+        index.refresh()
+    return index
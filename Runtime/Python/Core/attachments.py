@@ -0,0 +1,411 @@
+"""
+附件读取：把用户附加的文件格式化为 Prompt 上下文。
+
+每个文件只打开一次：先用开头的 1KB 判断编码 (BOM、无 BOM 的 UTF-16) 与是否为二进制，
+小文件直接读入，大文件用 mmap 只取需要的部分。超过单文件字节 / token 上限的文件保留开头与结尾
+(在换行处切分)，中间省略并在文件标题中说明；所有附件共享一个总 token 上限，超出后其余文件不再发送。
+路径可以带行号选择器，"Assets/Scripts/Player.cs:100-200" 只发送第 100 到 200 行 (":100-" 表示到文件末尾)。
+较大的 C# 脚本默认只发送结构摘要 (cs_outline.py)；路径末尾加 "!full" 时发送原文。
+"""
+import os
+import re
+import mmap
+import glob
+import codecs
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (ATTACHMENT_FILE_MAX_BYTES, ATTACHMENT_FILE_MAX_TOKENS, ATTACHMENT_TOTAL_MAX_TOKENS,
+                    ATTACHMENT_MMAP_MIN_BYTES, ATTACHMENT_CACHE_MAX_BYTES, ATTACHMENT_READ_WORKERS,
+                    ATTACHMENT_EXPAND_MAX_FILES, ATTACHMENT_CS_OUTLINE, ATTACHMENT_CS_OUTLINE_MIN_BYTES)
+from utils import estimate_tokens
+from unity_yaml import UNITY_YAML_EXTENSIONS, summarize as summarize_unity_yaml
+from asset_index import get_asset_index
+from cs_outline import outline as outline_cs
+
+# 定义常见的二进制扩展名黑名单，避免读取
+# (.unity / .asset / .prefab / .mat 通常是文本 YAML，由 unity_yaml 生成摘要)
+BINARY_EXTENSIONS = {
+    '.dll', '.exe', '.so', '.dylib', '.png', '.jpg', '.jpeg', '.tga', '.psd',
+    '.fbx', '.obj', '.blend', '.meta',
+    '.cache', '.pdf', '.zip', '.7z'
+}
+
+_SAMPLE_BYTES = 1024
+# 截断时开头保留的比例，其余留给结尾 (日志的最新内容在末尾)
+_HEAD_RATIO = 2 / 3
+# 剩余总 token 不足此数时不再发送后续文件
+_MIN_FILE_TOKENS = 200
+# UTF-32 的 BOM 以 UTF-16 LE 的 BOM 开头，需要先判断
+_BOMS = ((codecs.BOM_UTF32_LE, "utf-32-le"), (codecs.BOM_UTF32_BE, "utf-32-be"), (codecs.BOM_UTF8, "utf-8"),
+         (codecs.BOM_UTF16_LE, "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16-be"))
+_SELECTOR = re.compile(r"^(.+?):(\d+)(?:-(\d*))?$")
+FULL_MARKER = "!full"
+# 无 BOM 的 UTF-16：0 字节所在的奇偶位至少是另一位的这么多倍
+_UTF16_ZERO_RATIO = 8
+_CONTROL = re.compile(r"[\x00-\x08\x0e-\x1f]")
+# 结构摘要不短于原文的此比例时直接发送原文
+_OUTLINE_MAX_RATIO = 0.7
+
+
+def parse_selector(path):
+    """拆分行号选择器："a.cs:100-200" -> ("a.cs", (100, 200))；":100" 只取一行，":100-" 到文件末尾"""
+    match = _SELECTOR.match(path)
+    if not match:
+        return path, None
+    start = max(1, int(match.group(2)))
+    end = match.group(3)
+    if end is None:
+        return match.group(1), (start, start)
+    return match.group(1), (start, int(end) if end else None)
+
+
+def _detect_encoding(sample):
+    """返回 (编码, BOM 长度)；含 null 字节且不像 UTF-16 时视为二进制，返回 (None, 0)"""
+    for bom, codec in _BOMS:
+        if sample.startswith(bom):
+            return codec, len(bom)
+    if b"\0" not in sample:
+        return "utf-8", 0
+    # 无 BOM 的 UTF-16：ASCII 字符的高字节为 0，null 集中在奇数位 (LE) 或偶数位 (BE)。
+    # 中文等字符的两个字节通常都不为 0，因此不要求 0 的比例，只要求 0 几乎都在同一奇偶位
+    # (U+xx00 的字符会在另一位产生少量 0)，且样本能按该编码解码为不含控制字符的文本
+    sample = sample[:len(sample) & ~1]
+    even, odd = sample[0::2].count(0), sample[1::2].count(0)
+    for zeros, other, codec in ((odd, even, "utf-16-le"), (even, odd, "utf-16-be")):
+        if zeros and other * _UTF16_ZERO_RATIO <= zeros:
+            try:
+                text = codecs.getincrementaldecoder(codec)().decode(sample, False)
+            except UnicodeDecodeError:
+                continue
+            if not _CONTROL.search(text):
+                return codec, 0
+    return None, 0
+
+
+class _Source:
+    """编码已确定的文件内容 (bytes 或 mmap)；按编码单元对齐查找换行，UTF-16 中的 0x0A 字节不一定是换行"""
+
+    def __init__(self, buf, codec, base):
+        self.buf = buf
+        self.codec = codec
+        self.base = base
+        self.newline = "\n".encode(codec)
+        self.unit = len(self.newline)
+
+    def align(self, pos):
+        return pos - (pos - self.base) % self.unit
+
+    def find_newline(self, start, end):
+        pos = self.buf.find(self.newline, start, end)
+        while pos != -1 and (pos - self.base) % self.unit:
+            pos = self.buf.find(self.newline, pos + 1, end)
+        return pos
+
+    def rfind_newline(self, start, end):
+        pos = self.buf.rfind(self.newline, start, end)
+        while pos != -1 and (pos - self.base) % self.unit:
+            pos = self.buf.rfind(self.newline, start, pos + self.unit - 1)
+        return pos
+
+    def skip_lines(self, pos, count):
+        """从 pos 往后跳过 count 行，返回下一行的起始位置 (不足时为文件末尾)"""
+        end = len(self.buf)
+        for _ in range(count):
+            found = self.find_newline(pos, end)
+            if found == -1:
+                return end
+            pos = found + self.unit
+        return pos
+
+    def window(self, lo, hi, budget):
+        """[lo, hi) 超过 budget 字节时返回开头与结尾两段 ((a, b), (c, d))，在换行处切分；否则返回 ((lo, hi), None)"""
+        if hi - lo <= budget:
+            return (lo, hi), None
+        head = self.rfind_newline(lo, lo + int(budget * _HEAD_RATIO))
+        head = head + self.unit if head != -1 else self.align(lo + int(budget * _HEAD_RATIO))
+        tail_budget = budget - (head - lo)
+        tail = self.find_newline(hi - tail_budget, hi - self.unit)
+        tail = tail + self.unit if tail != -1 else self.align(hi - tail_budget)
+        return (lo, head), (max(tail, head), hi)
+
+    def decode(self, start, end, notes):
+        data = self.buf[start:end]
+        try:
+            return data.decode(self.codec)
+        except UnicodeDecodeError:
+            text = data.decode(self.codec, errors="replace")
+            # 零星的非法字节 (截断的日志等) 替换后发送；大量非法字节说明是其他编码 (GBK 等)，交给调用方跳过
+            if text.count("\ufffd") > len(text) // 100 + 1:
+                raise
+            note = f"invalid {self.codec} bytes replaced"
+            if note not in notes:
+                notes.append(note)
+            return text
+
+
+def _size(n):
+    return f"{n / 1048576:.1f} MB" if n >= 1048576 else f"{n / 1024:.1f} KB"
+
+
+def read_text(path, line_range=None, max_bytes=ATTACHMENT_FILE_MAX_BYTES, max_tokens=ATTACHMENT_FILE_MAX_TOKENS):
+    """
+    读取文本文件 (只打开一次)，返回 (文本, 说明列表)；二进制文件返回 None。
+    line_range: (起始行, 结束行或 None)，从 1 开始且包含结束行。
+    超过 max_bytes / max_tokens 时保留开头与结尾，中间替换为省略标记，说明列表中记录截断与编码信息。
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        sample = f.read(_SAMPLE_BYTES)
+        codec, base = _detect_encoding(sample)
+        if codec is None:
+            return None
+        if size < ATTACHMENT_MMAP_MIN_BYTES:
+            return _read(_Source(sample + f.read(), codec, base), size, line_range, max_bytes, max_tokens)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _read(_Source(mm, codec, base), size, line_range, max_bytes, max_tokens)
+
+
+def _read(src, size, line_range, max_bytes, max_tokens):
+    notes = [] if src.codec == "utf-8" else [src.codec]
+    lo, hi = src.base, len(src.buf)
+    if line_range:
+        start, end = line_range
+        lo = src.skip_lines(lo, start - 1)
+        if end is not None:
+            hi = src.skip_lines(lo, max(0, end - start + 1))
+        notes.append(f"lines {start}-{end or 'end'}")
+
+    budget = max_bytes
+    for _ in range(3):
+        head, tail = src.window(lo, hi, budget)
+        text = src.decode(*head, notes)
+        if tail is not None:
+            text += f"\n... [{_size(tail[0] - head[1])} omitted] ...\n" + src.decode(*tail, notes)
+        tokens = estimate_tokens(text)
+        if tokens <= max_tokens:
+            break
+        # token 超出 (CJK 等字节/token 比例较低的文本)：按比例缩小窗口后重新切分
+        budget = int(min(budget, hi - lo) * max_tokens / tokens * 0.9)
+    if tail is not None:
+        notes.append(f"truncated: first {_size(head[1] - head[0])} and last {_size(tail[1] - tail[0])} "
+                     f"of {_size(size)}")
+    return text, notes
+
+
+def _read_cs_outline(path, max_tokens):
+    """较大的 C# 脚本返回结构摘要；文件较小、无法解析或摘要没有明显变短时返回 None"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < ATTACHMENT_CS_OUTLINE_MIN_BYTES:
+            return None
+        data = f.read()
+    codec, base = _detect_encoding(data[:_SAMPLE_BYTES])
+    if codec is None:
+        return None
+    source = data[base:].decode(codec)
+    summary = outline_cs(source)
+    if summary is None or len(summary) > len(source) * _OUTLINE_MAX_RATIO or estimate_tokens(summary) > max_tokens:
+        return None
+    return summary
+
+
+def _read_attachment(label, full_path, line_range, project_root, max_tokens, outline=False):
+    """返回 (格式化后的代码块, 说明列表)；无法发送时返回 (None, 原因)"""
+    ext = os.path.splitext(full_path)[1].lower()
+    # 较大的 C# 脚本只发送类型与成员签名，方法体省略 (标注行号，可以再用行号选择器附加)
+    if ext == ".cs" and outline and not line_range:
+        summary = _read_cs_outline(full_path, max_tokens)
+        if summary is not None:
+            return f"\nFile: {label} (outline, method bodies elided)\n```cs\n{summary}\n```\n", ["outline"]
+    # 场景、Prefab、材质等 Unity 资源发送层级与字段摘要，原文通常远超 token 上限
+    if ext in UNITY_YAML_EXTENSIONS and not line_range:
+        index = get_asset_index(project_root)
+        summary = summarize_unity_yaml(full_path, label, index.path_of if index else None)
+        if summary is None:
+            return None, "binary-serialized asset"
+        return f"\nFile: {label} (summary)\n```text\n{summary}\n```\n", []
+    if ext in BINARY_EXTENSIONS:
+        return None, "binary file"
+
+    result = read_text(full_path, line_range, max_tokens=max_tokens)
+    if result is None:
+        return None, "binary file"
+    content, notes = result
+    # 获取文件扩展名用于 Markdown 语法高亮
+    ext_tag = ext.lstrip('.') or "text"
+    header = f"File: {label}" + (f" ({'; '.join(notes)})" if notes else "")
+    return f"\n{header}\n```{ext_tag}\n{content}\n```\n", notes
+
+
+class AttachmentCache:
+    """
+    格式化后的附件代码块与 token 数，按 (标签, 绝对路径, mtime, size, 行号选择器, token 上限) 缓存；
+    连续几轮附加同一批脚本时只需 stat 一次。总大小 (UTF-8 字节) 超过 max_bytes 时淘汰最久未使用的条目。
+    """
+
+    def __init__(self, max_bytes=ATTACHMENT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()  # key -> (代码块, 说明列表, token 数, 字节数)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[:3]
+
+    def put(self, key, block, notes, tokens):
+        size = len(block.encode("utf-8")) if block else 0
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[3]
+            self._entries[key] = (block, notes, tokens, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.stats["evictions"] += 1
+            self.stats["entries"] = len(self._entries)
+            self.stats["bytes"] = self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.stats["entries"] = self.stats["bytes"] = 0
+
+
+attachment_cache = AttachmentCache()
+_pool = ThreadPoolExecutor(max_workers=ATTACHMENT_READ_WORKERS, thread_name_prefix="attachments")
+
+
+def _load(label, full_path, line_range, outline, project_root, max_tokens):
+    """带缓存读取单个附件，返回 (代码块, 说明列表, token 数)；无法发送时代码块为 None，说明为原因"""
+    st = os.stat(full_path)
+    key = (label, os.path.abspath(full_path), st.st_mtime_ns, st.st_size, line_range, outline, max_tokens)
+    cached = attachment_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        block, notes = _read_attachment(label, full_path, line_range, project_root, max_tokens, outline)
+    except UnicodeDecodeError:
+        block, notes = None, "non-utf-8 file"
+    tokens = estimate_tokens(block) if block else 0
+    attachment_cache.put(key, block, notes, tokens)
+    return block, notes, tokens
+
+
+def _expand(paths, project_root, outline):
+    """
+    解析路径、行号选择器与 "!full" 标记，展开目录与通配符 (按路径排序，跳过 .meta 与二进制扩展名)，
+    返回 [(标签, 文件路径, 行号范围, 是否使用结构摘要)]
+    """
+    root = project_root or ""
+    entries = []
+    seen = set()
+
+    def add(label, full_path, line_range=None):
+        key = (os.path.normcase(os.path.abspath(full_path)), line_range)
+        if key not in seen:
+            seen.add(key)
+            entries.append((label, full_path, line_range, outline and not full))
+
+    def add_expanded(label, full_path):
+        ext = os.path.splitext(full_path)[1].lower()
+        if ext in BINARY_EXTENSIONS or os.path.basename(full_path).startswith("."):
+            return
+        if os.path.isfile(full_path):
+            add(label, full_path)
+
+    for p in paths:
+        full = p.endswith(FULL_MARKER)
+        if full:
+            p = p[:-len(FULL_MARKER)]
+        # 路径解析：如果是相对路径，且提供了 project_root，则拼接
+        full_path = os.path.join(root, p)
+        if os.path.isdir(full_path):
+            found = []
+            for dirpath, dirnames, filenames in os.walk(full_path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                found += [os.path.join(dirpath, f) for f in sorted(filenames)]
+            for f in found:
+                add_expanded(p.rstrip("/\\") + "/" + os.path.relpath(f, full_path).replace("\\", "/"), f)
+        elif any(ch in p for ch in "*?[") and not os.path.isfile(full_path):
+            for f in sorted(glob.glob(full_path, recursive=True)):
+                label = os.path.relpath(f, root).replace("\\", "/") if project_root else f
+                add_expanded(label, f)
+        elif os.path.isfile(full_path):
+            add(p, full_path)
+        else:
+            path, line_range = parse_selector(p)
+            full_path = os.path.join(root, path)
+            if line_range and os.path.isfile(full_path):
+                add(path, full_path, line_range)
+    return entries
+
+
+def process_attachments(paths, project_root=None, outline=ATTACHMENT_CS_OUTLINE):
+    """
+    读取附件文件内容并格式化为 Prompt 上下文。
+    :param paths: 文件路径列表 (可以是相对路径，可以带 ":起始行-结束行" 选择器或 "!full" 标记，也可以是目录或通配符)
+    :param project_root: Unity 项目根目录绝对路径，用于解析相对路径
+    :param outline: 较大的 C# 脚本只发送结构摘要
+    """
+    if not paths: return ""
+
+    entries = _expand(paths, project_root, outline)
+    omitted = []
+    if len(entries) > ATTACHMENT_EXPAND_MAX_FILES:
+        omitted = [e[0] for e in entries[ATTACHMENT_EXPAND_MAX_FILES:]]
+        entries = entries[:ATTACHMENT_EXPAND_MAX_FILES]
+
+    def load(entry):
+        try:
+            return _load(*entry, project_root, ATTACHMENT_FILE_MAX_TOKENS)
+        except Exception as e:
+            return e
+
+    # 先按单文件上限在线程池中并行读取 (大多命中缓存)，再按顺序扣除总 token 上限
+    results = _pool.map(load, entries) if len(entries) > 1 else map(load, entries)
+
+    blocks = []
+    remaining = ATTACHMENT_TOTAL_MAX_TOKENS
+    for (label, full_path, line_range, cs_outline), result in zip(entries, results):
+        if isinstance(result, Exception):
+            print(f"[Error] Failed to read {label}: {result}")
+            continue
+        block, notes, tokens = result
+        if block is None:
+            print(f"[Warn] Skipped {notes}: {label}")
+            continue
+        if tokens > remaining and remaining >= _MIN_FILE_TOKENS:
+            # 剩余额度不足以放下整个文件：按剩余额度重新截断
+            try:
+                block, notes, tokens = _load(label, full_path, line_range, cs_outline, project_root, remaining)
+            except Exception as e:
+                print(f"[Error] Failed to read {label}: {e}")
+                continue
+        if block is None or tokens > remaining:
+            omitted.append(label)
+            continue
+        remaining -= tokens
+        if any(n.startswith(("truncated", "invalid")) for n in notes):
+            print(f"[Attach] {label}: {'; '.join(notes)}")
+        blocks.append(block)
+
+    if omitted:
+        print(f"[Warn] Attachment size limit reached, omitted {len(omitted)} files")
+        blocks.append(f"\n(Omitted {len(omitted)} files over the attachment size limit: {', '.join(omitted)})\n")
+    if not blocks:
+        return ""
+    return "\n\n### User Provided Files:\n" + "".join(blocks)
@@ -0,0 +1,222 @@
+"""
+对话录制与回放 (cassette)。
+
+录制模式：每轮 /chat 的上游流量 (技能选择、主生成、修复、总结等模型调用，Unity 的每次回复与场景快照) 连同耗时
+追加写入 cassette 文件。文件为 JSON Lines，每行一轮；较长的消息内容 (如 system prompt) 只在第一次
+出现时以 blob 行写入，之后按 hash 引用。路径以 .gz 结尾时使用 gzip 压缩。
+回放模式：按 prompt 取出录制的轮次 (同一 prompt 录制多次时轮流使用)，以原始耗时或零耗时返回，
+不访问模型与 Unity，用于复现性能问题与可重复的基准测试。
+"""
+import gzip
+import json
+import time
+import hashlib
+import threading
+import collections
+from types import SimpleNamespace
+
+# 超过此长度的消息内容存为 blob，在文件内去重
+BLOB_MIN_CHARS = 256
+
+
+class CassetteError(Exception):
+    pass
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _kind(request):
+    """按请求内容标注调用类型，仅用于查看与统计，回放按调用顺序匹配"""
+    messages = request.get("messages") or []
+    first = (messages[0].get("content") or "") if messages else ""
+    if first.startswith("You are a skill selector"):
+        return "select"
+    if len(messages) == 1 and request.get("temperature") == 0:
+        return "summary"
+    last = (messages[-1].get("content") or "") if messages else ""
+    if last.startswith(("The script above fails static validation", "The script failed when executed")):
+        return "repair"
+    return "completion"
+
+
+def _fake_response(recorded):
+    usage = recorded.get("usage")
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=recorded.get("content")))],
+        usage=SimpleNamespace(**usage) if usage else None)
+
+
+class _Turn:
+    """一轮对话的录制或回放状态，只在处理该请求的线程中使用"""
+
+    def __init__(self, prompt, recorded=None, replay_latency=True):
+        self.prompt = prompt
+        self.replaying = recorded is not None
+        self.replay_latency = replay_latency
+        self.calls = list(recorded["calls"]) if recorded else []
+        # 每次执行一条记录 (自动修复时一轮会执行多次)
+        self.unity = list(recorded.get("unity") or []) if recorded else []
+        # 本轮附加到提示中的场景快照 (未使用时为 None)
+        self.scene = recorded.get("scene") if recorded else None
+        self._next = 0
+        self._next_unity = 0
+
+    def _sleep(self, latency_ms):
+        if self.replay_latency and latency_ms:
+            time.sleep(latency_ms / 1000.0)
+
+    def wrap_client(self, client):
+        """返回只提供 chat.completions.create 的客户端代理"""
+        create = self._replay_call if self.replaying else (lambda **kw: self._record_call(client, kw))
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    def _record_call(self, client, kwargs):
+        t0 = time.perf_counter()
+        res = client.chat.completions.create(**kwargs)
+        usage = None
+        if res.usage:
+            usage = {"prompt_tokens": res.usage.prompt_tokens, "completion_tokens": res.usage.completion_tokens,
+                     "total_tokens": res.usage.total_tokens}
+        request = {k: kwargs.get(k) for k in ("model", "temperature", "messages")}
+        self.calls.append({
+            "kind": _kind(request),
+            "request": request,
+            "response": {"content": res.choices[0].message.content, "usage": usage},
+            "latency_ms": round((time.perf_counter() - t0) * 1000, 1),
+        })
+        return res
+
+    def _replay_call(self, **kwargs):
+        if self._next >= len(self.calls):
+            raise CassetteError(f"Turn '{self.prompt[:60]}' has only {len(self.calls)} recorded model call(s)")
+        call = self.calls[self._next]
+        self._next += 1
+        self._sleep(call.get("latency_ms"))
+        return _fake_response(call["response"])
+
+    def wrap_scene(self, fetch):
+        """包装 SceneContext.get：录制场景快照与耗时，或直接返回录制的快照"""
+        def run():
+            if self.replaying:
+                if self.scene is None:
+                    return None
+                self._sleep(self.scene.get("latency_ms"))
+                return self.scene.get("digest")
+            t0 = time.perf_counter()
+            digest = fetch()
+            self.scene = {"digest": digest, "latency_ms": round((time.perf_counter() - t0) * 1000, 1)}
+            return digest
+        return run
+
+    def wrap_execute(self, execute):
+        """包装 execute_in_unity：录制回复与耗时，或直接返回录制的回复"""
+        def run(code, **kwargs):
+            if self.replaying:
+                if self._next_unity >= len(self.unity):
+                    raise CassetteError(f"Turn '{self.prompt[:60]}' has only {len(self.unity)} recorded Unity reply(s)")
+                recorded = self.unity[self._next_unity]
+                self._next_unity += 1
+                self._sleep(recorded.get("latency_ms"))
+                reply = dict(recorded["reply"])
+                if kwargs.get("on_chunk") and isinstance(reply.get("data"), list):
+                    kwargs["on_chunk"](reply["data"])
+                return reply
+            t0 = time.perf_counter()
+            reply = execute(code, **kwargs)
+            self.unity.append({"code_sha": _hash(code), "reply": reply,
+                               "latency_ms": round((time.perf_counter() - t0) * 1000, 1)})
+            return reply
+        return run
+
+
+class Cassette:
+    """
+    mode: "record" 或 "replay"
+    replay_latency: "original" 按录制时的耗时等待，"zero" 立即返回
+    """
+
+    def __init__(self, path, mode, replay_latency="original"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency != "zero"
+        self._lock = threading.Lock()
+        self._blobs = {}
+        self._turns = collections.defaultdict(collections.deque)
+        try:
+            self._load()
+        except FileNotFoundError:
+            if mode == "replay":
+                raise CassetteError(f"Cassette not found: {path}")
+
+    def _load(self):
+        with _open(self.path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "blob" in entry:
+                    self._blobs[entry["blob"]] = entry["text"]
+                elif self.mode == "replay":
+                    self._turns[entry["prompt"]].append(self._expand(entry))
+        if self.mode == "replay":
+            print(f"[Cassette] Loaded {sum(len(q) for q in self._turns.values())} turn(s) from {self.path}")
+
+    def _expand(self, entry):
+        for call in entry["calls"]:
+            for m in call["request"].get("messages") or []:
+                if "blob" in m:
+                    m["content"] = self._blobs[m.pop("blob")]
+        return entry
+
+    @property
+    def prompts(self):
+        return list(self._turns)
+
+    def begin_turn(self, prompt):
+        if self.mode == "record":
+            return _Turn(prompt)
+        with self._lock:
+            recorded = self._turns.get(prompt)
+            if not recorded:
+                raise CassetteError(f"No recorded turn for prompt: {prompt[:80]}")
+            turn = recorded[0]
+            recorded.rotate(-1)
+        return _Turn(prompt, turn, self.replay_latency)
+
+    def end_turn(self, turn):
+        """录制模式下把完成的一轮追加写入文件"""
+        if self.mode != "record" or turn.replaying:
+            return
+        with self._lock:
+            lines = []
+            calls = []
+            for call in turn.calls:
+                messages = []
+                for m in call["request"].get("messages") or []:
+                    content = m.get("content") or ""
+                    if len(content) < BLOB_MIN_CHARS:
+                        messages.append(m)
+                        continue
+                    key = _hash(content)
+                    if key not in self._blobs:
+                        self._blobs[key] = content
+                        lines.append({"blob": key, "text": content})
+                    messages.append({"role": m.get("role"), "blob": key})
+                calls.append(dict(call, request=dict(call["request"], messages=messages)))
+            entry = {"prompt": turn.prompt, "calls": calls, "unity": turn.unity}
+            if turn.scene is not None:
+                entry["scene"] = turn.scene
+            lines.append(entry)
+            with _open(self.path, "a") as f:
+                for entry in lines:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -1,10 +1,83 @@
 import os
 
 # --- 基础配置 ---
-# Unity 监听的执行端口
-UNITY_EXEC_PORT = 8081
-# Unity 主机地址
-UNITY_HOST = '127.0.0.1'
+# Unity 监听的执行端口与主机地址 (可用环境变量覆盖，例如指向 Tests/Python/unity_emulator.py 替身)
+UNITY_EXEC_PORT = int(os.environ.get("AISKILLS_UNITY_PORT", 8081))
+UNITY_HOST = os.environ.get("AISKILLS_UNITY_HOST", '127.0.0.1')
+# 连接 Unity 的重试次数 (指数退避，从 50ms 开始，最长 1s)
+UNITY_CONNECT_RETRIES = 6
+# 单次执行等待回复的超时 (秒)
+UNITY_EXEC_TIMEOUT = 300
+# 常驻连接的心跳间隔与超时 (秒)
+UNITY_HEARTBEAT_INTERVAL = 5
+UNITY_HEARTBEAT_TIMEOUT = 15
+# 分块流式结果：单次执行最多保留的条目数 (超出部分只计数，仍会实时转发给客户端)
+UNITY_STREAM_MAX_ITEMS = 5000
+# 分块流式结果：增量解码缓冲区上限 (字节)，单个条目超过此大小视为错误
+UNITY_STREAM_MAX_BUFFER = 8 * 1024 * 1024
+# /chat/stream 待推送事件队列长度，客户端读取过慢时多出的分块会被丢弃
+STREAM_QUEUE_SIZE = 1024
+# 批量执行：Unity 每帧用于执行脚本的时间预算 (毫秒)，超出后剩余脚本顺延到下一帧
+UNITY_BATCH_BUDGET_MS = 10
+# /chat/batch 并发调用模型的最大线程数
+BATCH_MAX_WORKERS = 4
+# 默认在 AssetDatabase.StartAssetEditing/StopAssetEditing 中执行脚本 (请求中的 batch_assets 可覆盖)
+# 开启后脚本内新建的资源在执行结束前无法被读取，因此默认关闭
+UNITY_BATCH_ASSET_EDITING = False
+# 默认捕获脚本的 print 与 Debug.Log (请求中的 capture_logs 可覆盖)：日志去重截断后随执行结果返回，
+# Console 中只写一行摘要，避免逐条输出上千条日志拖慢执行
+UNITY_CAPTURE_LOGS = False
+# 默认在发送到 Unity 前静态预检生成的脚本 (请求中的 validate 可覆盖)：可机械修复的问题直接改写，
+# 其余问题 (语法错误、调用未定义的参考函数等) 发回模型修复一次
+VALIDATE_SCRIPTS = True
+# 默认对生成的脚本做 ast 优化 (请求中的 optimize 可覆盖)：循环中的 GameObject.Find 改为缓存查找、
+# 逐元素填充的 C# 数组改为一次转换、循环中逐条的 Debug.Log 合并为一条
+OPTIMIZE_SCRIPTS = True
+# 执行失败后自动修复 (请求中的 auto_repair 可覆盖)：把错误信息与失败的脚本发回模型，预检后重新执行，
+# 最多 AUTO_REPAIR_MAX_ATTEMPTS 次且总耗时不超过 AUTO_REPAIR_DEADLINE 秒 (repair_attempts / repair_deadline 可覆盖)
+AUTO_REPAIR = False
+AUTO_REPAIR_MAX_ATTEMPTS = 2
+AUTO_REPAIR_DEADLINE = 120
+# 场景快照 (请求中的 scene_context 可覆盖)：选中的 Skill 在 frontmatter 中声明 scene: true 时，
+# 从 Unity 拉取当前场景的层级摘要附加到本轮提示中，避免模型猜测不存在的物体名称与路径
+SCENE_CONTEXT = True
+# 场景快照的最大层级深度与字符数上限 (超出时先减小深度，深度为 1 仍超出则截断)
+SCENE_DIGEST_MAX_DEPTH = 4
+SCENE_DIGEST_MAX_CHARS = 4000
+# 拉取场景快照的超时 (秒)，超时或 Unity 未连接时本轮不附加快照
+SCENE_DIGEST_TIMEOUT = 2
+# 项目资源索引 (请求中的 asset_context 可覆盖)：选中的 Skill 在 frontmatter 中声明 assets: true 时，
+# 把提示中按名称提到的资源的完整路径附加到本轮提示中；索引在服务端直接扫描 .meta 建立，不访问 Unity
+ASSET_CONTEXT = True
+# 每轮最多附加的资源路径数
+ASSET_CONTEXT_MAX = 20
+# 两次增量扫描之间的最小间隔 (秒)
+ASSET_INDEX_RESCAN_INTERVAL = 2
+# 资源引用图：扫描这些 YAML 资源中的 guid 引用，离线回答 "谁引用了 X" 与 "未被引用的资源"
+ASSET_GRAPH_EXTENSIONS = (".unity", ".prefab", ".mat", ".asset", ".controller")
+# 需要重新解析的文件不少于此数量时才启动进程池，否则在当前线程内解析 (进程启动本身约需 100ms)
+ASSET_GRAPH_POOL_MIN_FILES = 64
+# 进程池的最大进程数 (None 表示 CPU 核数)
+ASSET_GRAPH_MAX_WORKERS = None
+# 附件中的场景 / Prefab / 材质等 Unity 文本 YAML 资源改为发送摘要 (unity_yaml.py)：层级的最大深度与字符数上限
+ATTACHMENT_YAML_MAX_DEPTH = 6
+ATTACHMENT_YAML_MAX_CHARS = 6000
+# 附件大小上限：单个文件的字节数与 token 数、所有附件合计的 token 数；超出单文件上限时保留开头与结尾，
+# 超出合计上限后其余文件不再发送 (均在文件标题或附件末尾注明)
+ATTACHMENT_FILE_MAX_BYTES = 48 * 1024
+ATTACHMENT_FILE_MAX_TOKENS = 12000
+ATTACHMENT_TOTAL_MAX_TOKENS = 32000
+# 不小于此大小的附件用 mmap 读取，只取开头、结尾或选中的行
+ATTACHMENT_MMAP_MIN_BYTES = 1024 * 1024
+# 附件缓存 (按路径、mtime 与大小) 的总大小上限，超出时淘汰最久未使用的条目
+ATTACHMENT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# 并行读取附件的线程数；目录与通配符附件最多展开的文件数
+ATTACHMENT_READ_WORKERS = 8
+ATTACHMENT_EXPAND_MAX_FILES = 200
+# 不小于此大小的 C# 脚本附件只发送结构摘要 (类型、序列化字段、属性与方法签名，方法体省略；请求中的 cs_outline 可覆盖)，
+# 提示中包含 "!full" 或附件路径以 "!full" 结尾时发送原文
+ATTACHMENT_CS_OUTLINE = True
+ATTACHMENT_CS_OUTLINE_MIN_BYTES = 8 * 1024
 
 # --- AI 模型默认配置 ---
 DEFAULT_API_KEY = "sk-placeholder"
@@ -19,4 +92,10 @@ CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 # 解析：从 Scripts 目录往上退一级，进入 Skills 目录
 SKILLS_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", "Skills"))
 
+# Unity 内预装函数库所在目录 -> .../Runtime/Python/UnityLib
+HELPER_LIB_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", "UnityLib"))
+HELPER_LIB_PACKAGE = "aiskills"
+# 启用后 Skill 参考代码只发送函数签名，生成的脚本直接 import 预装库
+USE_HELPER_LIB = True
+
 SHOW_RAW_RESPONSE = True
\ No newline at end of file
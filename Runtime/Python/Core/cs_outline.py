@@ -0,0 +1,238 @@
+"""
+C# 脚本的结构摘要 (outline)，用于附件。
+
+附加大型脚本通常只是为了让模型知道类型、序列化字段与方法签名，不需要方法体。
+这里用一个正则分词器跳过注释、字符串与预处理指令，只跟踪 { } ; 三种分隔符：
+声明头 (两个分隔符之间的文本) 按所在作用域分类，命名空间与类型保留结构，方法体替换为 "{ … }" 并注明行号
+(可以再用 "path:起始行-结束行" 附加某个方法)，属性只保留访问器，未序列化的私有字段只计数。
+不是完整的语法分析：遇到无法配对的花括号时返回 None，由调用方发送原文。
+"""
+import re
+import bisect
+
+_TOKEN = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<pre>^[ \t]*\#[^\n]*)
+  | (?P<string>"""[\s\S]*?"""
+              | (?:\$@|@\$|@)"(?:[^"]|"")*"
+              | \$"(?:\{[^{}]*\}|\\.|[^"\\\n])*"
+              | "(?:\\.|[^"\\\n])*"
+              | '(?:\\.|[^'\\\n]){1,8}')
+  | (?P<punct>[{};])
+''', re.S | re.M | re.X)
+
+_TYPE_DECL = re.compile(r"^(?:(?:public|private|protected|internal|static|abstract|sealed|partial|unsafe|new|readonly|"
+                        r"ref|file)\s+)*(class|struct|interface|enum|record)\b")
+_ATTRIBUTES = re.compile(r"^(?:\[[^\]]*\]\s*)+")
+_NESTED = re.compile(r"\([^()]*\)|\[[^\[\]]*\]")
+_VISIBLE = {"public", "protected", "internal", "const"}
+_NOT_FIELDS = {"using", "event", "delegate", "extern"}
+_SERIALIZED = re.compile(r"\bSerialize(?:Field|Reference)\b")
+# 保留的初始化表达式 / 表达式体的最大长度，更长的替换为 "…"
+_MAX_INLINE = 40
+_INDENT = "    "
+
+
+def _top_level(header, token):
+    """header 中不在括号、方括号或字符串内的第一个 token 的位置 ('=' 不匹配 '==' '=>' 等)，没有时返回 -1"""
+    depth = 0
+    quote = None
+    i = 0
+    while i < len(header):
+        ch = header[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif depth == 0 and header.startswith(token, i):
+            if token != "=" or (header[i + 1:i + 2] not in ("=", ">") and header[i - 1:i] not in "=!<>+-*/%&|^?"):
+                return i
+        i += 1
+    return -1
+
+
+def _flat(header):
+    """去掉括号与方括号中的内容 (参数列表、特性)，用于判断声明的种类"""
+    while True:
+        flat = _NESTED.sub("", header)
+        if flat == header:
+            return flat
+        header = flat
+
+
+def _shorten(header, idx, sep):
+    """保留 sep 之前的声明，短的初始化表达式原样保留，长的替换为 "…" """
+    value = header[idx + len(sep):].strip()
+    return f"{header[:idx].rstrip()} {sep} {value if len(value) <= _MAX_INLINE else '…'}"
+
+
+class _Scope:
+    __slots__ = ("kind", "header", "start", "depth", "accessors", "hidden", "interface")
+
+    def __init__(self, kind, header="", start=0, depth=0):
+        self.kind = kind        # ns / type / enum / method / prop / body
+        self.header = header
+        self.start = start      # 声明所在行 (method) 或 "{" 之后的偏移 (enum)
+        self.depth = depth      # 输出缩进层级
+        self.accessors = []
+        self.hidden = 0         # 省略的私有字段数
+        self.interface = False  # 接口成员没有访问修饰符，全部保留
+
+
+def outline(source):
+    """生成 C# 源码的结构摘要；花括号无法配对时返回 None"""
+    newlines = [m.start() for m in re.finditer("\n", source)]
+
+    def line_of(pos):
+        return bisect.bisect_left(newlines, pos) + 1
+
+    out = []
+    stack = [_Scope("ns")]
+    parts = []
+    pos = 0
+    first = None            # 当前声明头中第一个代码字符的位置
+    skip_statement = False  # 带花括号的初始化表达式结束后，跳过到下一个 ";" 为止的剩余部分
+
+    for m in _TOKEN.finditer(source):
+        kind = m.lastgroup
+        if kind == "string":
+            continue
+        scope = stack[-1]
+        in_body = scope.kind in ("body", "method")
+        if not in_body:
+            piece = source[pos:m.start()]
+            if first is None and piece.strip():
+                first = pos + len(piece) - len(piece.lstrip())
+            parts.append(piece)
+        pos = m.end()
+        if kind != "punct":
+            continue
+
+        ch = m.group()
+        if in_body:
+            if ch == "{":
+                stack.append(_Scope("body"))
+            elif ch == "}":
+                stack.pop()
+                if scope.kind == "method":
+                    header = scope.header
+                    out.append(f"{_INDENT * scope.depth}{header} {{ … }}  // L{scope.start}-{line_of(m.start())}")
+                elif not stack:
+                    return None
+                elif stack[-1].kind in ("ns", "type"):
+                    skip_statement = True
+            continue
+
+        header = " ".join("".join(parts).split())
+        start = line_of(first) if first is not None else line_of(m.start())
+        parts = []
+        first = None
+        indent = _INDENT * scope.depth
+
+        if ch == "}":
+            stack.pop()
+            if not stack:
+                return None
+            if scope.kind == "enum":
+                members = " ".join(_TOKEN.sub(_keep_strings, source[scope.start:m.start()]).split())
+                out.append(f"{indent}{scope.header} {{ {members} }}")
+            elif scope.kind == "prop":
+                out.append(f"{indent}{scope.header} {{ {' '.join(a + ';' for a in scope.accessors)} }}")
+            elif scope.kind == "type":
+                if scope.hidden:
+                    out.append(f"{_INDENT * scope.depth}// {scope.hidden} private field(s) omitted")
+                out.append(f"{_INDENT * (scope.depth - 1)}}}")
+            elif scope.kind == "ns" and scope.depth:
+                out.append(f"{_INDENT * (scope.depth - 1)}}}")
+            continue
+
+        if scope.kind == "prop":
+            # 访问器：get; / private set; / get { ... } / get => ...;
+            accessor = header.split("=>")[0].strip()
+            if accessor:
+                scope.accessors.append(_ATTRIBUTES.sub("", accessor))
+            if ch == "{":
+                stack.append(_Scope("body"))
+            continue
+        if scope.kind == "enum":
+            if ch == "{":
+                stack.append(_Scope("body"))
+            continue
+
+        if ch == ";":
+            line = None if skip_statement or not header else _statement(header, scope)
+            skip_statement = False
+            if line:
+                out.append(f"{indent}{line};")
+            continue
+
+        # ch == "{"
+        if skip_statement:
+            stack.append(_Scope("body"))
+            continue
+        bare = _ATTRIBUTES.sub("", header)
+        flat = _flat(header)
+        declared = _TYPE_DECL.match(bare)
+        if re.match(r"^(?:file\s+)?namespace\b", bare):
+            out.append(f"{indent}{header} {{")
+            stack.append(_Scope("ns", header, depth=scope.depth + 1))
+        elif declared and declared.group(1) == "enum":
+            stack.append(_Scope("enum", header, m.end(), scope.depth))
+        elif declared:
+            out.append(f"{indent}{header} {{")
+            stack.append(_Scope("type", header, depth=scope.depth + 1))
+            stack[-1].interface = declared.group(1) == "interface"
+        elif not header:
+            stack.append(_Scope("body"))
+        elif _top_level(header, "=>") != -1 or (_top_level(header, "=") != -1 and "operator" not in flat.split()):
+            # 带花括号的初始化表达式或表达式体 (集合初始化、lambda)
+            line = _statement(header, scope, elided=True)
+            if line:
+                out.append(f"{indent}{line};")
+            stack.append(_Scope("body"))
+        elif "(" in bare:
+            stack.append(_Scope("method", header, start, scope.depth))
+        else:
+            stack.append(_Scope("prop", header, start, scope.depth))
+
+    if len(stack) != 1:
+        return None
+    return "\n".join(out)
+
+
+def _keep_strings(match):
+    return match.group() if match.lastgroup in ("string", "punct") else ""
+
+
+def _statement(header, scope, elided=False):
+    """
+    类型或命名空间中的声明 (字段、事件、委托、抽象方法、表达式体成员、using)，返回输出行 (不含 ";")；
+    省略的私有字段返回 None。elided 表示初始化表达式中含花括号 (集合初始化、lambda)，替换为 "…"。
+    """
+    # 属性初始化 "{ get; set; } = 100;" 在属性结束后剩下的部分
+    if header.startswith("="):
+        return None
+    attributes = _ATTRIBUTES.match(header)
+    attributes = attributes.group() if attributes else ""
+    assign = _top_level(header, "=") if "operator" not in _flat(header).split() else -1
+    arrow = _top_level(header, "=>")
+    idx, sep = min(((i, s) for i, s in ((assign, "="), (arrow, "=>")) if i != -1), default=(-1, None))
+    decl = header[:idx] if sep else header
+    words = set(_flat(decl).split())
+    is_field = sep != "=>" and "(" not in decl[len(attributes):] and not words & _NOT_FIELDS
+    if (is_field and scope.kind == "type" and not scope.interface and not words & _VISIBLE
+            and not _SERIALIZED.search(attributes)):
+        scope.hidden += 1
+        return None
+    if sep is None:
+        return header
+    if elided:
+        return f"{decl.rstrip()} {sep} …"
+    return _shorten(header, idx, sep)
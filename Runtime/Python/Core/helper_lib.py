@@ -0,0 +1,126 @@
+import ast
+import os
+import re
+from config import HELPER_LIB_DIR, HELPER_LIB_PACKAGE
+
+# 启用预装函数库时，替换 unity.md 中 "库函数陷阱" 一节的规则
+HELPER_LIB_RULES = """## 预装函数库 (Helper Library)
+
+Skill Reference 中只给出签名的函数已预装在 Unity 环境的 `{package}` 模块中 (v{version})。
+* 直接导入后调用：`from {package} import create_object, set_transform`
+* **禁止**将这些函数的实现复制到生成的代码中。
+* 未在 `{package}` 中提供的逻辑仍需自行编写。
+"""
+
+_PY_BLOCK = re.compile(r"(```python[ \t]*\n)(.*?)(```|\Z)", re.DOTALL)
+_TRAP_SECTION = re.compile(r"## 库函数陷阱.*?(?=\n## |\Z)", re.DOTALL)
+
+
+class HelperLibrary:
+    """
+    服务端对 Unity 预装函数库 (UnityLib/aiskills) 的描述：
+    版本号、导出函数列表，以及用于提示词的签名化处理。
+    该包依赖 UnityEngine，只能在 Unity 内导入，这里通过 ast 静态解析。
+    """
+
+    def __init__(self, lib_dir=HELPER_LIB_DIR, package=HELPER_LIB_PACKAGE):
+        self.lib_dir = lib_dir
+        self.package = package
+        self.version = None
+        self.exports = set()
+        self._load()
+
+    def _load(self):
+        init_path = os.path.join(self.lib_dir, self.package, "__init__.py")
+        try:
+            with open(init_path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read())
+        except Exception as e:
+            print(f"[HelperLib] Load failed: {e}")
+            return
+
+        for node in tree.body:
+            if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+                continue
+            target = node.targets[0]
+            if not isinstance(target, ast.Name):
+                continue
+            if target.id == "__version__":
+                self.version = ast.literal_eval(node.value)
+            elif target.id == "__all__":
+                self.exports = set(ast.literal_eval(node.value))
+
+    @property
+    def available(self):
+        return bool(self.version and self.exports)
+
+    def rules(self):
+        return HELPER_LIB_RULES.format(package=self.package, version=self.version)
+
+    def apply_rules(self, core_body):
+        """将核心规则中的 "库函数陷阱" 替换为预装库说明"""
+        if _TRAP_SECTION.search(core_body):
+            return _TRAP_SECTION.sub(lambda _: self.rules().rstrip() + "\n", core_body, count=1)
+        return core_body + "\n\n" + self.rules()
+
+    def _stub_code(self, code):
+        """
+        将代码块中已预装的函数替换为 "签名 + docstring + ..."，其余代码保持原样。
+        """
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return code
+
+        lines = code.splitlines()
+        stubbed = []
+        # 倒序替换，避免行号偏移
+        for node in reversed(tree.body):
+            if not isinstance(node, ast.FunctionDef) or node.name not in self.exports:
+                continue
+            first = node.body[0]
+            has_doc = (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                       and isinstance(first.value.value, str))
+            keep_end = first.end_lineno if has_doc else first.lineno - 1
+            start = (node.decorator_list[0].lineno if node.decorator_list else node.lineno) - 1
+            indent = " " * first.col_offset
+            lines[start:node.end_lineno] = lines[start:keep_end] + [f"{indent}..."]
+            stubbed.append(node.name)
+
+        if not stubbed:
+            return code
+
+        names = ", ".join(reversed(stubbed))
+        header = f"# 已预装，直接使用: from {self.package} import {names}"
+        return header + "\n" + "\n".join(lines) + "\n"
+
+    def stub_references(self, body):
+        """对 Skill 正文中的所有 python 代码块做签名化处理"""
+        return _PY_BLOCK.sub(
+            lambda m: m.group(1) + self._stub_code(m.group(2)) + m.group(3), body)
+
+    def install_snippet(self):
+        """
+        生成在 Unity 内执行的安装代码：每个 Python.NET 解释器只加载一次，
+        版本不一致时清理旧模块并重新导入。
+        """
+        return f"""
+import sys as _sys
+_lib_dir = {self.lib_dir!r}
+if _lib_dir not in _sys.path: _sys.path.insert(0, _lib_dir)
+_lib = _sys.modules.get({self.package!r})
+if _lib is None or getattr(_lib, "__version__", None) != {self.version!r}:
+    for _name in [n for n in _sys.modules if n == {self.package!r} or n.startswith({self.package + '.'!r})]:
+        del _sys.modules[_name]
+    import {self.package}
+"""
+
+
+_instance = None
+
+def get_helper_lib():
+    """获取全局 HelperLibrary 实例；加载失败时返回 None"""
+    global _instance
+    if _instance is None:
+        _instance = HelperLibrary()
+    return _instance if _instance.available else None
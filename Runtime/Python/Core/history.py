@@ -28,12 +28,13 @@ class HistoryManager:
         except Exception as e:
             print(f"[History] Save failed: {e}")
 
-    def add_entry(self, role, content, summary=None):
+    def add_entry(self, role, content, summary=None, script=None):
         """
         添加一条记录
         :param role: "user" 或 "assistant"
         :param content: 对话原始内容
         :param summary: 该轮对话的总结（通常附在 assistant 回复后）
+        :param script: 该轮最终执行的脚本（用于追问模式生成补丁）
         """
         entry = {
             "timestamp": time.time(),
@@ -42,6 +43,8 @@ class HistoryManager:
         }
         if summary:
             entry["summary"] = summary
+        if script:
+            entry["script"] = script
         
         self.history.append(entry)
         self.save()
@@ -59,6 +62,21 @@ class HistoryManager:
             messages.append({"role": h["role"], "content": h["content"]})
         return messages
 
+    def get_last_script(self):
+        """获取最近一轮执行过的脚本，没有则返回 None"""
+        for h in reversed(self.history):
+            if h.get("script"):
+                return h["script"]
+        return None
+
+    def set_last_script(self, script):
+        """替换最近一轮助手回复记录的脚本 (自动修复成功后，追问应基于修复后的脚本)"""
+        for h in reversed(self.history):
+            if h["role"] == "assistant":
+                h["script"] = script
+                self.save()
+                return
+
     def clear(self):
         """清除历史"""
         self.history = []
@@ -0,0 +1,58 @@
+import time
+import uuid
+import threading
+from unity_bridge import CancelToken
+
+
+class JobRegistry:
+    """
+    正在 Unity 中执行的脚本登记表。
+    每次执行登记一个 job，记录最近一次进度并持有 CancelToken，供 /jobs 接口查询与取消。
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def start(self, prompt):
+        """登记一个新的执行，返回 job 字典 (含 id 与 token)"""
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "prompt": (prompt or "")[:200],
+            "started": time.time(),
+            "progress": None,
+            "token": CancelToken(),
+        }
+        with self._lock:
+            self._jobs[job["id"]] = job
+        return job
+
+    def update(self, job_id, progress):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job["progress"] = progress
+
+    def finish(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def cancel(self, job_id):
+        """请求取消，job 不存在 (已结束) 时返回 False"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job["token"].cancel()
+        return True
+
+    def list(self):
+        now = time.time()
+        with self._lock:
+            return [{
+                "id": job["id"],
+                "prompt": job["prompt"],
+                "elapsed": round(now - job["started"], 1),
+                "progress": job["progress"],
+                "cancelled": job["token"].cancelled,
+            } for job in self._jobs.values()]
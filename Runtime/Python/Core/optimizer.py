@@ -0,0 +1,357 @@
+"""
+生成脚本的 ast 优化。
+
+在预检之后、发送到 Unity 之前改写生成脚本中常见的热点循环写法，源码按节点位置局部替换，注释与格式保持不变：
+* find_cache   循环中 (或循环调用的函数中) 的 GameObject.Find(name) 改为 aiskills.find_object，
+               查询 Unity 会话中的层级索引 (AiSkillsBridge.Hierarchy)，按名称常数时间查找
+* array_fill   System.Array.CreateInstance 后逐个 SetValue / 下标赋值的循环改为一次 System.Array[T](list) 转换
+* loop_logs    循环中逐条调用的 Debug.Log 合并为循环结束后的一条日志 (每条 Debug.Log 都会采集堆栈，开销远大于循环本身)
+每条改写都返回说明，随响应的 optimizations 字段返回。
+"""
+import ast
+
+from validator import add_import
+
+FIND_HELPER = "find_object"
+HELPER_PACKAGE = "aiskills"
+
+# 可直接用作 System.Array[T] 元素类型的命名空间
+TYPE_ROOTS = {"UnityEngine", "UnityEditor", "System"}
+
+_LOOPS = (ast.For, ast.AsyncFor, ast.While)
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+
+def _dotted(node):
+    """Name/Attribute 链转为 "a.b.c"，其他表达式返回 None"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _same(a, b):
+    return a is not None and b is not None and ast.dump(a) == ast.dump(b)
+
+
+def _segment(code, node):
+    return ast.get_source_segment(code, node)
+
+
+def _splice(code, edits):
+    """
+    按 (lineno, col, end_lineno, end_col, text) 替换源码片段，edits 之间不能重叠。
+    行号从 1 开始，列为 utf-8 字节偏移 (与 ast 一致)。
+    """
+    lines = code.splitlines(keepends=True)
+    for lineno, col, end_lineno, end_col, text in sorted(edits, reverse=True):
+        head = lines[lineno - 1].encode("utf-8")[:col].decode("utf-8")
+        tail = lines[end_lineno - 1].encode("utf-8")[end_col:].decode("utf-8")
+        lines[lineno - 1:end_lineno] = [head + text + tail]
+    return "".join(lines)
+
+
+def _imported_from(tree, module):
+    """from module import X 绑定的名称"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == module:
+            names.update(a.asname or a.name for a in node.names)
+    return names
+
+
+def _bound_names(tree):
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((a.asname or a.name).split(".")[0] for a in node.names)
+    return names
+
+
+# --- find_cache ---
+
+def _hot_nodes(tree):
+    """
+    返回位于热点位置的节点集合 (id)：循环体、推导式，以及被热点位置调用的函数体 (按函数名传递)。
+    """
+    functions = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.setdefault(node.name, []).append(node)
+
+    hot = set()
+    pending = []
+
+    def mark(node):
+        for child in ast.walk(node):
+            if id(child) in hot:
+                continue
+            hot.add(id(child))
+            if isinstance(child, ast.Call) and isinstance(child.func, ast.Name) and child.func.id in functions:
+                pending.extend(functions[child.func.id])
+
+    for node in ast.walk(tree):
+        if isinstance(node, _LOOPS):
+            for stmt in node.body + node.orelse:
+                mark(stmt)
+        elif isinstance(node, _COMPREHENSIONS):
+            mark(node)
+    while pending:
+        fn = pending.pop()
+        if id(fn) not in hot:
+            hot.add(id(fn))
+            for stmt in fn.body:
+                mark(stmt)
+    return hot
+
+
+def _find_cache(code, tree, applied):
+    find_names = {"UnityEngine.GameObject.Find"}
+    if "GameObject" in _imported_from(tree, "UnityEngine"):
+        find_names.add("GameObject.Find")
+    if FIND_HELPER in _bound_names(tree) and FIND_HELPER not in _imported_from(tree, HELPER_PACKAGE):
+        return code
+
+    hot = _hot_nodes(tree)
+    calls = [n for n in ast.walk(tree)
+             if isinstance(n, ast.Call) and id(n) in hot and _dotted(n.func) in find_names
+             and len(n.args) == 1 and not n.keywords and n.func.lineno == n.func.end_lineno]
+    if not calls:
+        return code
+
+    edits = [(c.func.lineno, c.func.col_offset, c.func.end_lineno, c.func.end_col_offset, FIND_HELPER)
+             for c in calls]
+    code = _splice(code, edits)
+    if FIND_HELPER not in _imported_from(tree, HELPER_PACKAGE):
+        code = add_import(code, ast.parse(code), f"from {HELPER_PACKAGE} import {FIND_HELPER}")
+    lines = sorted({c.lineno for c in calls})
+    applied.append(f"find_cache: {len(calls)} GameObject.Find call(s) in loops use {FIND_HELPER} "
+                   f"(line {', '.join(map(str, lines))})")
+    return code
+
+
+# --- array_fill ---
+
+def _array_type(node, imported):
+    """CreateInstance 的类型参数 -> System.Array[...] 中可用的类型表达式节点"""
+    if isinstance(node, ast.Call) and _dotted(node.func) == "clr.GetClrType" and len(node.args) == 1:
+        node = node.args[0]
+    name = _dotted(node)
+    if name is None:
+        return None
+    root = name.split(".")[0]
+    return node if (root in TYPE_ROOTS or root in imported) else None
+
+
+def _fill_value(stmt, arr, index):
+    """循环体语句为 arr.SetValue(V, i) 或 arr[i] = V 时返回 V"""
+    if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+        call = stmt.value
+        if (isinstance(call.func, ast.Attribute) and call.func.attr == "SetValue"
+                and isinstance(call.func.value, ast.Name) and call.func.value.id == arr
+                and len(call.args) == 2 and not call.keywords
+                and isinstance(call.args[1], ast.Name) and call.args[1].id == index):
+            return call.args[0]
+    if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1:
+        target = stmt.targets[0]
+        if (isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) and target.value.id == arr
+                and isinstance(target.slice, ast.Name) and target.slice.id == index):
+            return stmt.value
+    return None
+
+
+def _array_fill_rewrite(code, create, loop, imported):
+    """
+    create: arr = System.Array.CreateInstance(T, N)
+    loop:   for i in range(N): arr.SetValue(V, i)  /  for i, x in enumerate(seq): arr[i] = V
+    返回替换后的赋值语句文本，不匹配时返回 None
+    """
+    if not (isinstance(create, ast.Assign) and len(create.targets) == 1 and isinstance(create.targets[0], ast.Name)):
+        return None
+    call = create.value
+    if not (isinstance(call, ast.Call) and _dotted(call.func) == "System.Array.CreateInstance"
+            and len(call.args) == 2 and not call.keywords):
+        return None
+    arr = create.targets[0].id
+    elem_type = _array_type(call.args[0], imported)
+    length = call.args[1]
+    if elem_type is None or not isinstance(loop, ast.For) or loop.orelse or len(loop.body) != 1:
+        return None
+    if not (isinstance(loop.iter, ast.Call) and isinstance(loop.iter.func, ast.Name) and not loop.iter.keywords):
+        return None
+
+    kind = loop.iter.func.id
+    seq = None
+    if kind == "range" and len(loop.iter.args) == 1 and isinstance(loop.target, ast.Name):
+        if not _same(loop.iter.args[0], length):
+            return None
+        index, item = loop.target.id, None
+        if isinstance(length, ast.Call) and _dotted(length.func) == "len" and len(length.args) == 1:
+            seq = length.args[0]
+    elif (kind == "enumerate" and len(loop.iter.args) == 1 and isinstance(loop.target, ast.Tuple)
+          and len(loop.target.elts) == 2 and all(isinstance(e, ast.Name) for e in loop.target.elts)):
+        seq = loop.iter.args[0]
+        if not (isinstance(length, ast.Call) and _dotted(length.func) == "len" and len(length.args) == 1
+                and _same(length.args[0], seq)):
+            return None
+        index, item = loop.target.elts[0].id, loop.target.elts[1].id
+    else:
+        return None
+
+    value = _fill_value(loop.body[0], arr, index)
+    if value is None or any(isinstance(n, ast.Name) and n.id == arr for n in ast.walk(value)):
+        return None
+
+    type_text = _segment(code, elem_type)
+    if item is not None and isinstance(value, ast.Name) and value.id == item:
+        values = f"list({_segment(code, seq)})"
+    elif (seq is not None and item is None and isinstance(value, ast.Subscript) and _same(value.value, seq)
+          and isinstance(value.slice, ast.Name) and value.slice.id == index):
+        values = f"list({_segment(code, seq)})"
+    else:
+        values = f"[{_segment(code, value)} for {_segment(code, loop.target)} in {_segment(code, loop.iter)}]"
+    return f"{arr} = System.Array[{type_text}]({values})"
+
+
+def _array_fill(code, tree, applied):
+    imported = _imported_from(tree, "UnityEngine") | _imported_from(tree, "UnityEditor")
+    edits = []
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            stmts = getattr(node, field, None)
+            if not isinstance(stmts, list):
+                continue
+            for create, loop in zip(stmts, stmts[1:]):
+                text = _array_fill_rewrite(code, create, loop, imported)
+                if text is None:
+                    continue
+                edits.append((create.lineno, create.col_offset, loop.end_lineno, loop.end_col_offset, text))
+                applied.append(f"array_fill: '{create.targets[0].id}' filled element by element "
+                               f"became a bulk System.Array conversion (line {create.lineno})")
+    return _splice(code, edits) if edits else code
+
+
+# --- loop_logs ---
+
+def _is_debug_log(stmt):
+    if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call)):
+        return False
+    call = stmt.value
+    return _dotted(call.func) in ("UnityEngine.Debug.Log", "Debug.Log") and len(call.args) == 1 \
+        and not call.keywords and stmt.lineno == stmt.end_lineno
+
+
+def _loop_logs_in(loop):
+    """循环中 (不含嵌套函数与类) 逐条调用的 Debug.Log 语句"""
+    found = []
+    stack = list(loop.body) + list(loop.orelse)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _FUNCTIONS + (ast.ClassDef,)):
+            continue
+        if _is_debug_log(node):
+            found.append(node)
+            continue
+        stack.extend(ast.iter_child_nodes(node))
+    return found
+
+
+def _multiline_string(node):
+    return any(isinstance(n, (ast.Constant, ast.JoinedStr)) and n.end_lineno > n.lineno for n in ast.walk(node))
+
+
+def _loop_logs(code, tree, applied):
+    """
+    外层循环改写为：
+        _loop_logs_N = []
+        try:
+            <循环，Debug.Log(x) 改为 _loop_logs_N.append(str(x))>
+        finally:
+            if _loop_logs_N: UnityEngine.Debug.Log("\\n".join(_loop_logs_N))
+    """
+    lines = code.splitlines(keepends=True)
+    outer = []
+
+    # 只改写互不嵌套的最外层循环 (循环内定义的函数中的循环不单独改写)
+    def visit(node, in_loop):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _LOOPS) and not in_loop:
+                outer.append(child)
+                visit(child, True)
+            else:
+                visit(child, in_loop)
+
+    visit(tree, False)
+
+    count = 0
+    for loop in sorted(outer, key=lambda n: -n.lineno):
+        logs = _loop_logs_in(loop)
+        if not logs or _multiline_string(loop) or not loop.body:
+            continue
+        start, end = loop.lineno - 1, loop.end_lineno
+        if lines[start][:loop.col_offset].strip() or lines[end - 1].encode("utf-8")[loop.end_col_offset:].strip():
+            continue
+        count += 1
+        buf = f"_loop_logs_{loop.lineno}"
+        indent = " " * loop.col_offset
+        step = " " * max(loop.body[0].col_offset - loop.col_offset, 1)
+        body = lines[start:end]
+        for stmt in sorted(logs, key=lambda n: -n.lineno):
+            i = stmt.lineno - 1 - start
+            line = body[i]
+            arg = stmt.value.args[0]
+            is_text = isinstance(arg, ast.JoinedStr) or (isinstance(arg, ast.Constant) and isinstance(arg.value, str))
+            arg = _segment(code, arg) if is_text else f"str({_segment(code, arg)})"
+            head = line.encode("utf-8")[:stmt.col_offset].decode("utf-8")
+            tail = line.encode("utf-8")[stmt.end_col_offset:].decode("utf-8")
+            body[i] = f"{head}{buf}.append({arg}){tail}"
+        body = [(step + line) if line.strip() else line for line in body]
+        if not body[-1].endswith("\n"):
+            body[-1] += "\n"
+        lines[start:end] = ([f"{indent}{buf} = []\n", f"{indent}try:\n"] + body
+                            + [f"{indent}finally:\n",
+                               f"{indent}{step}if {buf}: UnityEngine.Debug.Log(\"\\n\".join({buf}))\n"])
+        applied.append(f"loop_logs: {len(logs)} Debug.Log call(s) in the loop at line {loop.lineno} "
+                       "are logged once after the loop")
+    return "".join(lines) if count else code
+
+
+PASSES = (("array_fill", _array_fill), ("loop_logs", _loop_logs), ("find_cache", _find_cache))
+
+
+def optimize(code, rules=None):
+    """
+    依次应用各改写规则，每条规则后重新解析。
+    rules: 启用的规则名集合，None 表示全部
+    :return: (code, applied) — 改写后的代码与已应用的改写说明；脚本无法解析或改写结果无效时原样返回
+    """
+    applied = []
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code, applied
+
+    for name, rewrite in PASSES:
+        if rules is not None and name not in rules:
+            continue
+        before = len(applied)
+        new_code = rewrite(code, tree, applied)
+        if new_code is code:
+            continue
+        try:
+            tree = ast.parse(new_code)
+        except SyntaxError:
+            # 改写出错时放弃该规则，保留原代码
+            del applied[before:]
+            continue
+        code = new_code
+    return code, applied
@@ -0,0 +1,188 @@
+import re
+
+# 追问 (Follow-up) 模式下附加给模型的指令：只返回差异，而不是整段脚本
+PATCH_INSTRUCTIONS = """
+### Follow-up Mode
+The script below was executed in the previous turn. Do NOT rewrite it.
+Return ONLY the changes, using ONE of the following formats:
+
+1. A unified diff against the previous script inside a single ```diff block.
+2. One or more edit blocks inside a single ```edit block:
+<<<<<<< SEARCH
+(exact lines copied from the previous script)
+=======
+(replacement lines)
+>>>>>>> REPLACE
+
+Keep SEARCH sections short but unique. Output a full ```python block only if the script must be rewritten completely.
+
+### Previous Script
+```python
+{script}
+```
+"""
+
+_DIFF_BLOCK = re.compile(r"```(?:diff|patch)\s*\n(.*?)```", re.DOTALL)
+_EDIT_BLOCK = re.compile(r"```edit\s*\n(.*?)```", re.DOTALL)
+_EDIT_ITEM = re.compile(
+    r"<<<<<<< SEARCH\n(.*?)\n?=======\n(.*?)\n?>>>>>>> REPLACE", re.DOTALL)
+# 行号可省略 (模型常输出裸 "@@")，此时只按上下文定位
+_HUNK_HEADER = re.compile(r"^@@(?: -(\d+)(?:,\d+)? \+\d+(?:,\d+)? @@)?")
+
+# 补丁无法应用时发回模型的说明
+PATCH_ERROR_PROMPT = """The patch could not be applied to the previous script:
+{error}
+
+Return the changes again in the same format. Copy context and SEARCH lines exactly from the previous script \
+and include enough lines for each one to match exactly one place."""
+
+
+class PatchError(Exception):
+    pass
+
+
+def build_followup_prompt(prompt, previous_script):
+    """
+    在用户输入后附加上一轮脚本与补丁格式说明。
+    """
+    return prompt + PATCH_INSTRUCTIONS.format(script=previous_script)
+
+
+def build_patch_error_prompt(error):
+    return PATCH_ERROR_PROMPT.format(error=error)
+
+
+def _parse_hunks(diff_text):
+    """
+    解析 unified diff，返回 [(old_start, old_lines, new_lines), ...]。
+    忽略 ---/+++ 文件头；行号仅作为定位提示，裸 "@@" 的 old_start 为 None。
+    """
+    hunks = []
+    current = None
+    for line in diff_text.splitlines():
+        header = _HUNK_HEADER.match(line)
+        if header:
+            current = (int(header.group(1)) if header.group(1) else None, [], [])
+            hunks.append(current)
+            continue
+        if current is None or line.startswith(('--- ', '+++ ', '\\')):
+            continue
+
+        tag, text = (line[0], line[1:]) if line else (' ', '')
+        if tag == ' ':
+            current[1].append(text)
+            current[2].append(text)
+        elif tag == '-':
+            current[1].append(text)
+        elif tag == '+':
+            current[2].append(text)
+        else:
+            # 模型常漏掉上下文行的前导空格，按上下文处理
+            current[1].append(line)
+            current[2].append(line)
+    return hunks
+
+
+def _matches(lines, needle):
+    """
+    lines 中与 needle 连续片段相同的所有起始位置。
+    先精确匹配，失败后忽略行尾空白再试一次。
+    """
+    for normalize in (lambda s: s, lambda s: s.rstrip()):
+        target = [normalize(s) for s in needle]
+        candidates = [
+            i for i in range(len(lines) - len(needle) + 1)
+            if [normalize(s) for s in lines[i:i + len(needle)]] == target
+        ]
+        if candidates:
+            return candidates
+    return []
+
+
+def _locate(lines, needle, hint):
+    """
+    在 lines 中查找 needle 连续片段，优先选择离 hint 最近的位置，找不到时返回 -1。
+    """
+    if not needle:
+        return min(max(hint, 0), len(lines))
+    candidates = _matches(lines, needle)
+    return min(candidates, key=lambda i: abs(i - hint)) if candidates else -1
+
+
+def apply_unified_diff(original, diff_text):
+    lines = original.splitlines()
+    hunks = _parse_hunks(diff_text)
+    if not hunks:
+        raise PatchError("No hunks found in diff.")
+
+    offset = 0
+    end = 0  # 上一个 hunk 结束的位置
+    for old_start, old_lines, new_lines in hunks:
+        if old_start is None:
+            # 没有行号：hunk 按顺序排列，取上一个 hunk 之后的第一处匹配
+            after = [i for i in _matches(lines, old_lines) if i >= end] if old_lines else [end]
+            pos = after[0] if after else -1
+        else:
+            pos = _locate(lines, old_lines, old_start - 1 + offset)
+        if pos < 0:
+            preview = old_lines[0] if old_lines else ""
+            raise PatchError(f"Hunk context not found: {preview!r}")
+        lines[pos:pos + len(old_lines)] = new_lines
+        offset += len(new_lines) - len(old_lines)
+        end = pos + len(new_lines)
+    return "\n".join(lines)
+
+
+def apply_edits(original, edits):
+    """
+    依次应用 SEARCH/REPLACE 编辑列表：[(search, replace), ...]
+    SEARCH 为空时插入到开头；找不到或匹配多处时抛出 PatchError，不猜测修改的位置。
+    """
+    lines = original.splitlines()
+    for search, replace in edits:
+        needle = search.splitlines()
+        preview = needle[0] if needle else ""
+        candidates = _matches(lines, needle) if needle else [0]
+        if not candidates:
+            raise PatchError(f"Search block not found: {preview!r}")
+        if len(candidates) > 1:
+            raise PatchError(f"Search block matches {len(candidates)} places (lines "
+                             f"{', '.join(str(i + 1) for i in candidates)}), add more context: {preview!r}")
+        pos = candidates[0]
+        lines[pos:pos + len(needle)] = replace.splitlines()
+    return "\n".join(lines)
+
+
+def extract_patch(raw_text):
+    """
+    从模型回复中提取补丁。
+    :return: ("diff", text) / ("edits", [(search, replace), ...]) / None
+    """
+    if not raw_text:
+        return None
+
+    match = _EDIT_BLOCK.search(raw_text)
+    edits = _EDIT_ITEM.findall(match.group(1) if match else raw_text)
+    if edits:
+        return "edits", edits
+
+    match = _DIFF_BLOCK.search(raw_text)
+    if match:
+        return "diff", match.group(1)
+    return None
+
+
+def apply_patch(original, raw_text):
+    """
+    将模型回复中的补丁应用到上一轮脚本。
+    :return: (patched_script, mode)；回复中没有补丁时返回 (None, None)
+    """
+    patch = extract_patch(raw_text)
+    if patch is None:
+        return None, None
+
+    mode, payload = patch
+    if mode == "edits":
+        return apply_edits(original, payload), mode
+    return apply_unified_diff(original, payload), mode
+
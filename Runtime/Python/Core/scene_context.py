@@ -0,0 +1,49 @@
+"""
+场景快照 (Scene Digest)：Unity 端生成当前场景的紧凑层级摘要 (组件以类型代码表示、按深度截断、
+相似的兄弟物体合并)，服务端按 version 缓存，只有选中的 Skill 需要场景信息时才附加到提示中。
+"""
+import threading
+
+from unity_bridge import query_scene
+
+# 附加到用户消息末尾的说明 (放在对话末尾而不是 System Prompt 中，场景变化不影响提示词前缀缓存)
+SCENE_PROMPT = """
+
+## Current Unity Scene
+Hierarchy snapshot of the open scene (names are exact; indentation = parent/child). Use these names and paths instead of guessing; objects not listed may still exist below the depth limit.
+```text
+{digest}
+```"""
+
+
+class SceneContext:
+    """缓存最近一次的场景快照，Unity 回复 unchanged 时直接复用"""
+
+    def __init__(self, query=query_scene):
+        self._query = query
+        self._lock = threading.Lock()
+        self._version = None
+        self._digest = None
+
+    def get(self):
+        """返回当前场景的摘要；Unity 未连接或超时时返回 None"""
+        with self._lock:
+            since = self._version
+        res = self._query(since=since)
+        if res.get("status") != "ok":
+            print(f"[Scene] Digest unavailable: {res.get('message')}")
+            return None
+        with self._lock:
+            if not res.get("unchanged"):
+                self._version = res.get("version")
+                self._digest = res.get("digest")
+            return self._digest
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._digest = None
+
+
+def build_scene_prompt(digest):
+    return SCENE_PROMPT.format(digest=digest.rstrip()) if digest else ""
@@ -1,14 +1,20 @@
 import os
+import ast
 import glob
 import json
 import re
 import yaml
+import threading
 from config import SHOW_RAW_RESPONSE
 
 class SkillManager:
-    def __init__(self, skills_dir): 
+    def __init__(self, skills_dir, helper_lib=None): 
         self.skills_dir = skills_dir
+        self.helper_lib = helper_lib # 预装函数库 (HelperLibrary)，为 None 时发送完整参考实现
         self.index = {} # 仅存储索引：{name: {path:..., desc:...}}
+        self._ref_cache = {} # path -> (mtime, 参考代码中定义的函数名)
+        self._stub_cache = {} # path -> (mtime, 预装函数已签名化的正文)
+        self._stub_lock = threading.Lock()
 
     def _read_frontmatter_only(self, path):
         """
@@ -27,10 +33,10 @@ class SkillManager:
             match = re.match(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
             if match:
                 meta = yaml.safe_load(match.group(1))
-                return meta.get('description', ''), meta.get('name', os.path.basename(path))
+                return meta.get('description', ''), meta.get('name', os.path.basename(path)), bool(meta.get('scene')), bool(meta.get('assets'))
         except Exception as e:
             print(f"[Warn] Failed to parse frontmatter for {path}: {e}")
-        return "", os.path.basename(path)
+        return "", os.path.basename(path), False, False
 
     def _read_full_body(self, path):
         """
@@ -54,12 +60,62 @@ class SkillManager:
         if not os.path.exists(self.skills_dir): return
         
         for p in glob.glob(os.path.join(self.skills_dir, "*.md")):
-            desc, name = self._read_frontmatter_only(p)
+            desc, name, scene, assets = self._read_frontmatter_only(p)
             self.index[name] = {
                 "path": p,
-                "desc": desc
+                "desc": desc,
+                "scene": scene,  # frontmatter 中 scene: true 表示需要当前场景的快照
+                "assets": assets  # frontmatter 中 assets: true 表示需要附加提示中提到的项目资源路径
             }
 
+    def needs_scene(self, selected_skills):
+        """选中的 Skill 中是否有需要场景快照的"""
+        return any(self.index.get(name, {}).get("scene") for name in selected_skills)
+
+    def needs_assets(self, selected_skills):
+        """选中的 Skill 中是否有需要项目资源路径的"""
+        return any(self.index.get(name, {}).get("assets") for name in selected_skills)
+
+    def reference_functions(self):
+        """
+        所有 Skill 参考代码块中定义的顶层函数名，供脚本预检识别 "库函数陷阱"。
+        按文件修改时间缓存，只重新解析改动过的文件。
+        """
+        names = set()
+        for info in self.index.values():
+            path = info["path"]
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            cached = self._ref_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                found = set()
+                for block in re.findall(r"```python[ \t]*\n(.*?)(?:```|\Z)", self._read_full_body(path), re.DOTALL):
+                    try:
+                        tree = ast.parse(block)
+                    except SyntaxError:
+                        continue
+                    found.update(n.name for n in tree.body if isinstance(n, ast.FunctionDef))
+                cached = self._ref_cache[path] = (mtime, found)
+            names |= cached[1]
+        return names
+
+    def _stubbed_body(self, path, lib):
+        """
+        Skill 正文，预装函数只保留签名。按文件修改时间缓存，避免每个请求都重新解析所有代码块；
+        解析在锁内进行，并发请求不会同时调用 ast.parse。
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return self._read_full_body(path)
+        with self._stub_lock:
+            cached = self._stub_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = self._stub_cache[path] = (mtime, lib.stub_references(self._read_full_body(path)))
+        return cached[1]
+
     def select(self, client, model, prompt):
         """
         让 AI 基于描述(Desc)来选择技能。
@@ -96,13 +152,16 @@ class SkillManager:
             构建 System Prompt：
             1. 强制加载 'unity' (Base Context) 作为核心规则。
             2. 加载 AI 选中的其他 Skills 作为参考。
+            3. 启用预装函数库时，参考实现只保留函数签名。
             """
             prompt_parts = []
+            lib = self.helper_lib
 
             # 1. 核心规则
             if "unity" in self.index:
                 core_path = self.index["unity"]["path"]
                 core_body = self._read_full_body(core_path)
+                if lib: core_body = lib.apply_rules(core_body)
                 prompt_parts.append(core_body)
 
             # 2. 对选中的 Skills 进行字母排序
@@ -111,7 +170,7 @@ class SkillManager:
             for name in sorted_skills:
                 if name in self.index:
                     path = self.index[name]["path"]
-                    body = self._read_full_body(path)
+                    body = self._stubbed_body(path, lib) if lib else self._read_full_body(path)
                     prompt_parts.append(f"\n--- Skill Reference: {name} ---\n{body}")
 
             return "\n\n".join(prompt_parts)
\ No newline at end of file
@@ -1,125 +1,447 @@
 import socket
+import struct
 import time
 import json
-import textwrap
-from config import UNITY_HOST, UNITY_EXEC_PORT
-
-def execute_in_unity(code):
-    print(f"[Debug] Connecting to Unity ({UNITY_HOST}:{UNITY_EXEC_PORT})...")
-    
-    sock = None
-    for attempt in range(3):
+import itertools
+import threading
+from config import (UNITY_HOST, UNITY_EXEC_PORT, UNITY_CONNECT_RETRIES, UNITY_EXEC_TIMEOUT,
+                    UNITY_HEARTBEAT_INTERVAL, UNITY_HEARTBEAT_TIMEOUT,
+                    UNITY_STREAM_MAX_ITEMS, UNITY_STREAM_MAX_BUFFER, UNITY_BATCH_BUDGET_MS,
+                    UNITY_BATCH_ASSET_EDITING, UNITY_CAPTURE_LOGS, SCENE_DIGEST_MAX_DEPTH,
+                    SCENE_DIGEST_MAX_CHARS, SCENE_DIGEST_TIMEOUT)
+from helper_lib import get_helper_lib
+
+# --- 帧协议 ---
+# 每条消息 = 4 字节大端无符号长度 + UTF-8 JSON 对象
+# Python -> Unity: {"id": 1, "type": "exec", "code": "..."} / {"id": 2, "type": "ping"}
+#                  {"id": 3, "type": "batch", "scripts": ["...", ...], "budget_ms": 10, "stop_on_error": false}
+#                  {"id": 4, "type": "cancel", "target": 1} (请求取消排队中或正在分时执行的命令)
+# Unity -> Python: {"id": 1, "type": "result", "payload": {...}} / {"id": 2, "type": "pong"}
+#                  {"id": 1, "type": "chunk", "seq": 0, "data": "<JSON 文本片段>"} (在 result 之前，可多条)
+#                  批次的 chunk 带 "index" 指明所属脚本；批次的 result payload 为 {"status", "message", "results": [...]}
+#                  {"id": 1, "type": "progress", "done": 10, "total": 100, "label": "..."}
+_HEADER = struct.Struct(">I")
+
+
+def send_frame(sock, obj):
+    data = json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, size):
+    buf = bytearray(size)
+    view = memoryview(buf)
+    pos = 0
+    while pos < size:
+        n = sock.recv_into(view[pos:], size - pos)
+        if n == 0:
+            raise ConnectionError("Connection closed by peer")
+        pos += n
+    return buf
+
+
+def recv_frame(sock):
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+class IncrementalJsonDecoder:
+    """
+    增量 JSON 解码：把任意切分的文本片段还原为一个个完整的值。
+    片段拼接后应是以逗号或空白分隔的 JSON 值序列 (不包在 [] 中，每个值就是一个条目，数组条目原样保留)；
+    只保留尚未解析完的尾部，缓冲区超过 max_buffer 时抛出 ValueError。
+    """
+
+    _SEPARATORS = " \t\r\n,"
+
+    def __init__(self, max_buffer=UNITY_STREAM_MAX_BUFFER):
+        self.max_buffer = max_buffer
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+
+    def feed(self, text, final=False):
+        buf = self._buf + text
+        pos, values = 0, []
+        while True:
+            while pos < len(buf) and buf[pos] in self._SEPARATORS:
+                pos += 1
+            if pos >= len(buf):
+                break
+            ch = buf[pos]
+            try:
+                value, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError(f"Incomplete JSON at end of stream: {buf[pos:pos + 80]!r}")
+                break
+            # 数字等标量后面不是分隔符 (或恰好在缓冲区末尾) 时，可能还有后续字符未到达 ("12" + ".5")
+            if ch not in "{[\"" and not final and (end == len(buf) or buf[end] not in self._SEPARATORS):
+                break
+            values.append(value)
+            pos = end
+
+        self._buf = buf[pos:]
+        if len(self._buf) > self.max_buffer:
+            raise ValueError(f"Streamed item exceeds {self.max_buffer} bytes")
+        return values
+
+    def close(self):
+        return self.feed("", final=True)
+
+
+class _Stream:
+    """单个脚本的分块结果：增量解码，最多保留 UNITY_STREAM_MAX_ITEMS 条"""
+
+    def __init__(self):
+        self.decoder = IncrementalJsonDecoder()
+        self.items = []
+        self.count = 0
+        self.error = None
+
+    def feed(self, data, on_chunk=None):
+        if self.error:
+            return
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(300)
-            sock.connect((UNITY_HOST, UNITY_EXEC_PORT))
-            break
-        except ConnectionRefusedError:
-            time.sleep(0.2)
-            sock = None
-        except Exception as e:
-            return {"status": "error", "message": f"Connect Error: {e}"}
-
-    if sock is None: 
-        return {"status": "error", "message": f"Cannot connect to Unity port {UNITY_EXEC_PORT}."}
-
-    try:
-        # --- 核心代码包装器 ---
-        # 这里的 Python 代码是在 Unity 内部运行的
-        wrapped_code = f"""
-import clr
-import System
-from System import AppDomain
-import json
-import traceback
-import sys
-import types 
-
-# 1. 尝试加载 Assembly
-try: clr.AddReference("Observater.AiSkills")
-except: pass
-
-# 2. 反射查找类型
-bridge_type = None
-for asm in AppDomain.CurrentDomain.GetAssemblies():
-    t = asm.GetType("Observater.AiSkills.Runtime.Core.AiSkillsBridge")
-    if t:
-        bridge_type = t
-        try: clr.AddReference(asm.FullName.split(',')[0]); break
-        except: pass
-
-# 3. 导入真实 Bridge
-_RealBridge = None
-try:
-    from Observater.AiSkills.Runtime.Core import AiSkillsBridge as _RealBridge
-except ImportError:
-    try:
-        from Observater.AiSkills import AiSkillsBridge as _RealBridge
-    except:
-        pass # 稍后处理
-
-import UnityEngine
-import UnityEditor
-
-# 4. 定义代理类
-_sent = False
-class _BridgeProxy:
-    @staticmethod
-    def SendSuccess(m):
-        global _sent
-        if not _sent:
-            if _RealBridge: _RealBridge.SendMessage(str(m))
-            else: print(f"[Fallback] Success: {{m}}")
-            _sent = True
-    @staticmethod
-    def SendMessage(m): _BridgeProxy.SendSuccess(m)
-    @staticmethod
-    def SendResult(m): _BridgeProxy.SendSuccess(m)
-    @staticmethod
-    def SendError(m):
-        global _sent
-        if not _sent:
-            if _RealBridge: _RealBridge.SendError(str(m))
-            else: print(f"[Fallback] Error: {{m}}")
-            _sent = True
-    @staticmethod
-    def get_Config(): return _RealBridge.Config if _RealBridge else None
-
-# ==========================================
-# [关键修复] 模块欺骗 (Module Mocking)
-# ==========================================
-
-# 1. 修复 'No module named AiSkillsBridge'
-if "AiSkillsBridge" not in sys.modules:
-    _mock_mod = types.ModuleType("AiSkillsBridge")
-    _mock_mod.SendSuccess = _BridgeProxy.SendSuccess
-    _mock_mod.SendMessage = _BridgeProxy.SendMessage
-    _mock_mod.SendResult = _BridgeProxy.SendResult
-    _mock_mod.SendError = _BridgeProxy.SendError
-    sys.modules["AiSkillsBridge"] = _mock_mod
-
-# 2. 修复 'No module named unity_editor' (AI 幻觉兼容)
-if "unity_editor" not in sys.modules:
-    sys.modules["unity_editor"] = UnityEditor
-if "unity_engine" not in sys.modules:
-    sys.modules["unity_engine"] = UnityEngine
-
-# 3. 全局变量注入
-AiSkillsBridge = _BridgeProxy
-
-print("[Internal] Running user code...")
-try:
-{textwrap.indent(code, '    ')}
-except Exception as e:
-    err = traceback.format_exc()
-    print(f"[Internal] Execution Error: {{err}}")
-    AiSkillsBridge.SendError(f"Error: {{e}}\\n{{err}}")
-finally:
-    if not _sent: AiSkillsBridge.SendSuccess("Done.")
+            self._accept(self.decoder.feed(data or ""), on_chunk)
+        except ValueError as e:
+            self.error = str(e)
+
+    def _accept(self, values, on_chunk):
+        if not values:
+            return
+        self.count += len(values)
+        room = UNITY_STREAM_MAX_ITEMS - len(self.items)
+        if room > 0:
+            self.items.extend(values[:room])
+        if on_chunk:
+            try:
+                on_chunk(values)
+            except Exception as e:
+                print(f"[Bridge] on_chunk callback failed: {e}")
+
+    def finish(self, payload, on_chunk=None):
+        if not self.error:
+            try:
+                self._accept(self.decoder.close(), on_chunk)
+            except ValueError as e:
+                self.error = str(e)
+        payload = dict(payload)
+        payload["data"] = self.items
+        payload["items"] = self.count
+        payload["truncated"] = self.count > len(self.items)
+        if self.error:
+            payload["stream_error"] = self.error
+        return payload
+
+
+class CancelToken:
+    """
+    取消令牌：传给 execute_in_unity / execute_many，cancel() 时向 Unity 发送 cancel 帧。
+    生成器脚本在下一步之前结束，普通脚本可通过 AiSkillsBridge.IsCancelled() 主动检查。
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._target = None     # (connection, sock, 请求 id)
+
+    def _bind(self, conn, sock, req_id):
+        with self._lock:
+            self._target = (conn, sock, req_id)
+            cancelled = self.cancelled
+        if cancelled:
+            self._send()
+
+    def cancel(self):
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+        self._send()
+
+    def _send(self):
+        target = self._target
+        if target is None:
+            return
+        conn, sock, req_id = target
+        try:
+            conn._send(sock, {"id": next(conn._ids), "type": "cancel", "target": req_id})
+        except OSError as e:
+            print(f"[Bridge] Cancel failed: {e}")
+
+
+class _Pending:
+    def __init__(self, on_chunk=None, on_progress=None):
+        self.event = threading.Event()
+        self.payload = None
+        self.on_chunk = on_chunk
+        self.on_progress = on_progress
+        self.streams = {}   # 脚本序号 (单条执行为 None) -> _Stream
+        self.progress = None
+        self.last_activity = time.monotonic()
+
+    def report(self, msg):
+        """处理一条 progress 帧"""
+        self.progress = {"done": msg.get("done", 0), "total": msg.get("total", 0), "label": msg.get("label", "")}
+        if self.on_progress:
+            try:
+                self.on_progress(self.progress)
+            except Exception as e:
+                print(f"[Bridge] on_progress callback failed: {e}")
+
+    def feed(self, data, index=None):
+        """处理一条 chunk 帧，解码出的条目实时交给 on_chunk"""
+        stream = self.streams.get(index)
+        if stream is None:
+            stream = self.streams[index] = _Stream()
+        stream.feed(data, self.on_chunk)
+
+    def resolve(self, payload):
+        results = payload.get("results")
+        if isinstance(results, list):
+            payload = dict(payload, results=[
+                self.streams[i].finish(r, self.on_chunk) if i in self.streams else r
+                for i, r in enumerate(results)])
+        elif None in self.streams:
+            payload = self.streams[None].finish(payload, self.on_chunk)
+        self.streams = {}
+        self.payload = payload
+        self.event.set()
+
+
+class UnityConnection:
+    """
+    与 Unity (AiSkillsBridge) 的常驻连接。
+    - 请求带自增 id，由后台读线程按 id 分发回复，支持多个请求同时在途；
+    - 心跳线程定期 ping，超时未收到 pong 则断开，下次请求时自动重连。
+    """
+
+    def __init__(self, host=UNITY_HOST, port=UNITY_EXEC_PORT):
+        self.host = host
+        self.port = port
+        self._sock = None
+        self._conn_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._last_pong = 0.0
+
+    @property
+    def connected(self):
+        return self._sock is not None
+
+    def _connect(self):
+        delay = 0.05
+        last_error = None
+        for attempt in range(UNITY_CONNECT_RETRIES):
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=5)
+                sock.settimeout(None)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                # 流水线请求依赖 TCP_NODELAY，否则 Nagle 与延迟 ACK 会让在途请求多等约 40 ms
+                if not sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY):
+                    sock.close()
+                    raise ConnectionError("Cannot enable TCP_NODELAY on the Unity connection")
+                return sock
+            except ConnectionRefusedError as e:
+                last_error = e
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
+        raise ConnectionError(f"Cannot connect to Unity port {self.port}: {last_error}")
+
+    def ensure_connected(self):
+        with self._conn_lock:
+            if self._sock is not None:
+                return
+            print(f"[Debug] Connecting to Unity ({self.host}:{self.port})...")
+            sock = self._connect()
+            self._sock = sock
+            self._last_pong = time.monotonic()
+            threading.Thread(target=self._read_loop, args=(sock,), daemon=True).start()
+            threading.Thread(target=self._heartbeat_loop, args=(sock,), daemon=True).start()
+
+    def close(self):
+        with self._conn_lock:
+            sock, self._sock = self._sock, None
+        if sock is not None:
+            try: sock.close()
+            except OSError: pass
+
+    def _disconnect(self, sock, reason):
+        with self._conn_lock:
+            if self._sock is not sock:
+                return
+            self._sock = None
+        try: sock.close()
+        except OSError: pass
+        print(f"[Bridge] Disconnected: {reason}")
+
+        # 在途请求全部以错误结束
+        for req_id in list(self._pending):
+            pending = self._pending.pop(req_id, None)
+            if pending:
+                pending.resolve({"status": "error", "message": f"Comm Error: {reason}"})
+
+    def _read_loop(self, sock):
+        try:
+            while True:
+                msg = recv_frame(sock)
+                kind = msg.get("type")
+                if kind == "pong":
+                    self._last_pong = time.monotonic()
+                    continue
+                if kind in ("chunk", "progress"):
+                    pending = self._pending.get(msg.get("id"))
+                    if pending is not None:
+                        pending.last_activity = time.monotonic()
+                        if kind == "chunk": pending.feed(msg.get("data"), msg.get("index"))
+                        else: pending.report(msg)
+                    continue
+                pending = self._pending.pop(msg.get("id"), None)
+                if pending is None:
+                    print(f"[Bridge] Dropped reply for unknown id: {msg.get('id')}")
+                    continue
+                pending.resolve(msg.get("payload") or {"status": "error", "message": "Empty response"})
+        except (OSError, ValueError, ConnectionError) as e:
+            self._disconnect(sock, e)
+
+    def _heartbeat_loop(self, sock):
+        while self._sock is sock:
+            time.sleep(UNITY_HEARTBEAT_INTERVAL)
+            if self._sock is not sock:
+                return
+            if time.monotonic() - self._last_pong > UNITY_HEARTBEAT_TIMEOUT:
+                self._disconnect(sock, "Heartbeat timeout")
+                return
+            try:
+                self._send(sock, {"id": next(self._ids), "type": "ping"})
+            except OSError as e:
+                self._disconnect(sock, e)
+                return
+
+    def _send(self, sock, msg):
+        with self._send_lock:
+            send_frame(sock, msg)
+
+    def request(self, msg, timeout=UNITY_EXEC_TIMEOUT, on_chunk=None, on_progress=None, cancel_token=None):
+        """
+        发送一条消息并等待同 id 的回复，返回 payload 字典。
+        on_chunk: 流式结果回调，在读线程中以解码出的条目列表调用
+        on_progress: 进度回调，参数为 {"done", "total", "label"}
+        cancel_token: CancelToken，用于从其他线程取消
+        超时从最后一次收到 chunk/progress 起算，持续汇报进度的长任务不会被判定为超时。
+        """
+        try:
+            self.ensure_connected()
+        except ConnectionError as e:
+            return {"status": "error", "message": str(e)}
+
+        sock = self._sock
+        if sock is None:
+            return {"status": "error", "message": "Comm Error: connection lost"}
+        req_id = next(self._ids)
+        pending = _Pending(on_chunk, on_progress)
+        self._pending[req_id] = pending
+        try:
+            self._send(sock, dict(msg, id=req_id))
+        except OSError as e:
+            self._pending.pop(req_id, None)
+            self._disconnect(sock, e)
+            return {"status": "error", "message": f"Comm Error: {e}"}
+
+        if cancel_token is not None:
+            cancel_token._bind(self, sock, req_id)
+
+        while not pending.event.wait(max(0.0, pending.last_activity + timeout - time.monotonic())):
+            if time.monotonic() - pending.last_activity >= timeout:
+                self._pending.pop(req_id, None)
+                return {"status": "error", "message": f"Timeout: no reply from Unity in {timeout}s",
+                        "progress": pending.progress}
+        return pending.payload
+
+
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def get_connection():
+    global _connection
+    with _connection_lock:
+        if _connection is None:
+            _connection = UnityConnection()
+        return _connection
+
+
+def build_command(code, batch_assets=UNITY_BATCH_ASSET_EDITING, capture_logs=UNITY_CAPTURE_LOGS,
+                  revert_on_error=False):
+    """
+    构建发送到 Unity 的执行指令：
+    Bridge 初始化已常驻在 Unity 内的 aiskills.runtime 模块中 (每次域加载只做一次)，
+    这里只发送版本检查与用户代码。
+    batch_assets: 在 StartAssetEditing/StopAssetEditing 中执行，结束后统一 Refresh
+    capture_logs: 脚本的 print 与 Debug.Log 去重截断后放入结果的 logs 字段，不逐条写入 Console
+    revert_on_error: 出错时先撤销脚本已做的修改 (整个 Undo 组) 再回复
+    """
+    lib = get_helper_lib()
+    if lib is None:
+        return None
+    return f"""{lib.install_snippet()}
+import aiskills.runtime as _rt
+_rt.execute({code!r}, batch_assets={bool(batch_assets)}, capture_logs={bool(capture_logs)},
+            revert_on_error={bool(revert_on_error)})
 """
-        sock.sendall(wrapped_code.encode('utf-8'))
-        resp = sock.recv(65536).decode('utf-8')
-        sock.close()
-        return json.loads(resp) if resp else {"status": "error", "message": "Empty response"}
-    except Exception as e:
-        return {"status": "error", "message": f"Comm Error: {e}"}
\ No newline at end of file
+
+
+def execute_in_unity(code, timeout=UNITY_EXEC_TIMEOUT, on_chunk=None, batch_assets=UNITY_BATCH_ASSET_EDITING,
+                     on_progress=None, cancel_token=None, budget_ms=UNITY_BATCH_BUDGET_MS,
+                     capture_logs=UNITY_CAPTURE_LOGS, revert_on_error=False):
+    """
+    在 Unity 中执行脚本。脚本以生成器结尾 (如 main() 中使用 yield) 时作为分时任务，
+    每帧最多占用 budget_ms 毫秒，可通过 cancel_token 取消。
+    revert_on_error: 出错时撤销脚本已做的修改，自动修复重试时场景中不会残留失败脚本的部分修改
+    """
+    command = build_command(code, batch_assets, capture_logs, revert_on_error)
+    if command is None:
+        return {"status": "error", "message": "Helper library (UnityLib/aiskills) not found."}
+    return get_connection().request({"type": "exec", "code": command, "budget_ms": budget_ms},
+                                    timeout=timeout, on_chunk=on_chunk, on_progress=on_progress,
+                                    cancel_token=cancel_token)
+
+
+def execute_many(scripts, budget_ms=UNITY_BATCH_BUDGET_MS, timeout=UNITY_EXEC_TIMEOUT,
+                 stop_on_error=False, on_chunk=None, batch_assets=UNITY_BATCH_ASSET_EDITING, cancel_token=None,
+                 capture_logs=UNITY_CAPTURE_LOGS):
+    """
+    批量执行多段脚本：Unity 在每帧 budget_ms 内尽可能多地执行，全部完成后一次性回复。
+    返回与 scripts 一一对应的结果列表；stop_on_error 时出错后的脚本结果为 skipped。
+    """
+    if not scripts:
+        return []
+    commands = [build_command(code, batch_assets, capture_logs) for code in scripts]
+    if commands[0] is None:
+        return [{"status": "error", "message": "Helper library (UnityLib/aiskills) not found."} for _ in scripts]
+
+    payload = get_connection().request({
+        "type": "batch",
+        "scripts": commands,
+        "budget_ms": budget_ms,
+        "stop_on_error": stop_on_error,
+    }, timeout=timeout, on_chunk=on_chunk, cancel_token=cancel_token)
+
+    results = payload.get("results")
+    if not isinstance(results, list):
+        # 整个批次失败 (连接错误、超时等)，每条脚本都返回同一个错误
+        return [payload for _ in scripts]
+    return results + [{"status": "skipped", "message": "Not executed."}] * (len(scripts) - len(results))
+
+
+def query_scene(since=None, max_depth=SCENE_DIGEST_MAX_DEPTH, max_chars=SCENE_DIGEST_MAX_CHARS,
+                timeout=SCENE_DIGEST_TIMEOUT):
+    """
+    拉取 Unity 当前场景的层级摘要 (AiSkillsBridge.SceneDigest)，在主线程生成但不经过 Python 执行器。
+    since: 上次回复的 version，场景未变化时回复 {"status": "ok", "version", "unchanged": true}
+    """
+    msg = {"type": "scene", "max_depth": max_depth, "max_chars": max_chars}
+    if since:
+        msg["since"] = since
+    return get_connection().request(msg, timeout=timeout)
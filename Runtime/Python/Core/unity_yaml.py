@@ -0,0 +1,390 @@
+"""
+Unity 文本序列化资源 (.unity / .prefab / .asset / .mat) 的流式摘要，用于附件。
+
+Unity YAML 是以 "--- !u!<classID> &<fileID>" 分隔的多文档文件，场景可达上百 MB (大部分是网格等数据)。
+这里用 mmap 定位文档头，只解析 GameObject / Transform / PrefabInstance 与组件文档的开头几行，
+其余文档 (网格、光照数据等) 直接跳过，内存占用只与物体数量有关，与文件大小无关。
+含 GameObject 的文件 (场景、Prefab) 输出与 AiSkillsBridge.SceneDigest 相同格式的层级摘要；
+其余文件 (材质、ScriptableObject 等) 输出每个对象的类型、名称与顶层字段。
+"""
+import os
+import re
+import mmap
+import collections
+
+from config import ATTACHMENT_YAML_MAX_CHARS, ATTACHMENT_YAML_MAX_DEPTH
+
+UNITY_YAML_EXTENSIONS = {".unity", ".prefab", ".asset", ".mat"}
+
+_HEADER = re.compile(rb"--- !u!(\d+) &(-?\d+)( stripped)?[^\n]*\n([A-Za-z_]\w*):")
+# 组件文档只需要开头的 m_GameObject / m_Script
+_COMPONENT_HEAD_BYTES = 2048
+# 非层级文件中每个对象最多列出的字段数与单个值的最大长度
+_MAX_FIELDS = 30
+_MAX_VALUE_CHARS = 80
+# 非层级文件中每个对象只读取开头的部分 (网格等数据不需要)
+_OBJECT_BODY_BYTES = 64 * 1024
+# 内置资源 (Default-Material 等) 使用的固定 guid
+_BUILTIN_GUIDS = {"0000000000000000e000000000000000", "0000000000000000f000000000000000"}
+
+_GO_NAME = re.compile(rb"^  m_Name: ?(.*)$", re.M)
+_GO_ACTIVE = re.compile(rb"^  m_IsActive: (\d)", re.M)
+_GO_COMPONENT = re.compile(rb"^  - component: \{fileID: (-?\d+)\}", re.M)
+_FATHER = re.compile(rb"^  m_Father: \{fileID: (-?\d+)\}", re.M)
+_CHILD = re.compile(rb"^  - \{fileID: (-?\d+)\}", re.M)
+_ROOT_ORDER = re.compile(rb"^  m_RootOrder: (-?\d+)", re.M)
+_OWNER = re.compile(rb"^  m_GameObject: \{fileID: (-?\d+)\}", re.M)
+_SCRIPT = re.compile(rb"^  m_Script: \{fileID: -?\d+(?:, guid: ([0-9a-f]{32}))?", re.M)
+_PREFAB_INSTANCE = re.compile(rb"^  m_PrefabInstance: \{fileID: (-?\d+)\}", re.M)
+_TRANSFORM_PARENT = re.compile(rb"^    m_TransformParent: \{fileID: (-?\d+)\}", re.M)
+_SOURCE_PREFAB = re.compile(rb"^  m_SourcePrefab: \{fileID: -?\d+, guid: ([0-9a-f]{32})", re.M)
+_NAME_OVERRIDE = re.compile(rb"^      propertyPath: m_Name\n      value: ?(.*)$", re.M)
+_ACTIVE_OVERRIDE = re.compile(rb"^      propertyPath: m_IsActive\n      value: ?(\d)", re.M)
+_REFERENCE = re.compile(r"\{fileID: (-?\d+)(?:, guid: ([0-9a-f]{32}), type: \d+)?\}")
+_NUMBER_SUFFIX = re.compile(r"^(.*?)[ _\-]?\(?(\d+)\)?$")
+
+_TRANSFORM_CLASSES = {4, 224}
+_GAMEOBJECT_CLASS = 1
+_PREFAB_INSTANCE_CLASS = 1001
+_MONOBEHAVIOUR_CLASS = 114
+
+# 与 AiSkillsBridge.SceneDigest 相同的组件代码
+CODES = {
+    "MeshFilter": "MF", "MeshRenderer": "MR", "SkinnedMeshRenderer": "SMR",
+    "BoxCollider": "BC", "SphereCollider": "SC", "CapsuleCollider": "CC",
+    "MeshCollider": "MC", "TerrainCollider": "TC", "Terrain": "Ter",
+    "Rigidbody": "RB", "CharacterController": "CCT", "Camera": "Cam",
+    "Light": "L", "AudioSource": "AS", "AudioListener": "AL", "Animator": "An",
+    "ParticleSystem": "PS", "SpriteRenderer": "SR", "LineRenderer": "LR",
+    "Rigidbody2D": "RB2", "BoxCollider2D": "BC2", "CircleCollider2D": "CC2",
+    "Canvas": "Cv", "CanvasScaler": "CvS", "GraphicRaycaster": "GR",
+    "Image": "Img", "RawImage": "RImg", "Text": "Txt", "TextMeshProUGUI": "TMP",
+    "Button": "Btn", "Toggle": "Tgl", "Slider": "Sld", "ScrollRect": "Scr",
+    "EventSystem": "ES", "StandaloneInputModule": "SIM", "NavMeshAgent": "NMA",
+    "ReflectionProbe": "RP", "LightProbeGroup": "LPG",
+}
+_SKIPPED_COMPONENTS = {"Transform", "RectTransform", "CanvasRenderer"}
+_SKIPPED_FIELDS = {"m_ObjectHideFlags", "m_CorrespondingSourceObject", "m_PrefabInstance", "m_PrefabAsset",
+                   "m_GameObject", "m_Enabled", "m_EditorHideFlags", "m_EditorClassIdentifier", "serializedVersion",
+                   "m_Name"}
+
+
+def _text(value):
+    value = value.decode("utf-8", "replace").strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        value = value[1:-1]
+    return value
+
+
+def _first(pattern, data, default=None):
+    match = pattern.search(data)
+    return match.group(1) if match else default
+
+
+class _Scene:
+    """从场景 / Prefab 中收集的物体信息 (只保留名称、组件类型与父子关系)"""
+
+    def __init__(self):
+        self.objects = {}        # GameObject fileID -> [名称, 是否激活, [组件 fileID]]
+        self.transforms = {}     # Transform fileID -> [GameObject fileID, 父 Transform, [子 Transform], RootOrder]
+        self.components = {}     # 组件 fileID -> (类型名, 脚本 guid)
+        self.instances = {}      # PrefabInstance fileID -> [父 Transform, 名称, 源 Prefab guid, 是否激活]
+        self.stripped = {}       # Prefab 实例根节点的 stripped Transform fileID -> PrefabInstance fileID
+
+
+def _documents(mm):
+    """
+    依次返回每个文档的 (文档头匹配, 正文起点, 正文终点)。
+    用 mmap.find 定位 "\n--- !u!"，比多行模式的正则逐位置匹配快一个数量级 (网格数据的单行可达数 MB)。
+    """
+    pos = mm.find(b"\n--- !u!")
+    while pos >= 0:
+        following = mm.find(b"\n--- !u!", pos + 1)
+        end = following + 1 if following >= 0 else len(mm)
+        header = _HEADER.match(mm, pos + 1)
+        if header:
+            yield header, header.end(), end
+        pos = following
+
+
+def _collect(mm):
+    scene = _Scene()
+    for current, start, end in _documents(mm):
+        class_id, file_id = int(current.group(1)), int(current.group(2))
+
+        if current.group(3):
+            if class_id in _TRANSFORM_CLASSES:
+                instance = _first(_PREFAB_INSTANCE, mm[start:min(end, start + _COMPONENT_HEAD_BYTES)])
+                if instance is not None:
+                    scene.stripped[file_id] = int(instance)
+        elif class_id == _GAMEOBJECT_CLASS:
+            body = mm[start:end]
+            scene.objects[file_id] = [_text(_first(_GO_NAME, body, b"")), _first(_GO_ACTIVE, body, b"1") == b"1",
+                                      [int(c) for c in _GO_COMPONENT.findall(body)]]
+        elif class_id in _TRANSFORM_CLASSES:
+            body = mm[start:end]
+            scene.transforms[file_id] = [int(_first(_OWNER, body, b"0")), int(_first(_FATHER, body, b"0")),
+                                         [int(c) for c in _CHILD.findall(body)],
+                                         int(_first(_ROOT_ORDER, body, b"0"))]
+        elif class_id == _PREFAB_INSTANCE_CLASS:
+            body = mm[start:end]
+            scene.instances[file_id] = [int(_first(_TRANSFORM_PARENT, body, b"0")),
+                                        _text(_first(_NAME_OVERRIDE, body, b"")),
+                                        _first(_SOURCE_PREFAB, body, b"").decode("ascii"),
+                                        _first(_ACTIVE_OVERRIDE, body, b"1") == b"1"]
+        else:
+            head = mm[start:min(end, start + _COMPONENT_HEAD_BYTES)]
+            if int(_first(_OWNER, head, b"0")):
+                script = _first(_SCRIPT, head) if class_id == _MONOBEHAVIOUR_CLASS else None
+                scene.components[file_id] = (current.group(4).decode("ascii"),
+                                             script.decode("ascii") if script else None)
+    return scene
+
+
+class _Writer:
+    """按 AiSkillsBridge.SceneDigest 的格式输出层级；节点为 ("t", Transform fileID) 或 ("p", PrefabInstance fileID)"""
+
+    def __init__(self, scene, children, resolve, max_depth, max_chars):
+        self.scene = scene
+        self.resolve = resolve
+        self.max_depth = max_depth
+        self.max_chars = max_chars
+        self.reserved = 0       # 标题、Depth 行与 "... N more" 行预留的字符数
+        self.lines = []
+        self.chars = 0
+        self.legend = {}
+        self.legend_chars = 0
+        self.skipped = 0
+        self.full = False
+        self._sizes = {}
+        self._children = children
+
+    def children(self, node):
+        return self._children.get(node, ())
+
+    def size(self, node):
+        """node 及其所有后代的数量"""
+        if node not in self._sizes:
+            total, stack = 0, [node]
+            while stack:
+                n = stack.pop()
+                total += 1
+                stack.extend(self.children(n))
+            self._sizes[node] = total
+        return self._sizes[node]
+
+    def describe(self, node):
+        """(名称, 组件代码, 是否激活, 用到的 {代码: 组件类型})"""
+        kind, file_id = node
+        if kind == "p":
+            _, name, source, active = self.scene.instances[file_id]
+            path = self.resolve(source) if source else None
+            if not name:
+                name = os.path.splitext(os.path.basename(path))[0] if path else "Prefab"
+            return name, f"Prefab {path}" if path else "Prefab", active, {}
+        name, active, component_ids = self.scene.objects.get(self.scene.transforms[file_id][0], ("?", True, []))
+        parts = []
+        codes = {}
+        for cid in component_ids:
+            if cid in self.scene.transforms or cid in self.scene.stripped:
+                continue
+            type_name, script = self.scene.components.get(cid, ("Missing", None))
+            if script:
+                path = self.resolve(script)
+                type_name = os.path.splitext(os.path.basename(path))[0] if path else "Script"
+            if type_name in _SKIPPED_COMPONENTS:
+                continue
+            code = CODES.get(type_name)
+            if code:
+                codes[code] = type_name
+            parts.append(code or type_name)
+        return name, ",".join(parts), active, codes
+
+    def fits(self, chars, added):
+        """加上 chars 个字符与新的图例项后，整个摘要 (含标题与图例行) 是否仍不超过 max_chars"""
+        legend = self.legend_chars + sum(len(k) + len(v) + 2 for k, v in added.items())
+        if legend:
+            legend += len("Codes: ")
+        return self.chars + chars + self.reserved + legend <= self.max_chars
+
+    def write_level(self, nodes, depth):
+        groups = collections.OrderedDict()
+        for node in nodes:
+            name, codes, active, legend = self.describe(node)
+            match = _NUMBER_SUFFIX.match(name)
+            stem = match.group(1) if match else name
+            groups.setdefault((stem, codes, len(self.children(node))), []).append((node, name, codes, active, legend))
+
+        for group in groups.values():
+            node, name, codes, active, legend = group[0]
+            if self.full:
+                self.skipped += sum(self.size(g[0]) for g in group)
+                continue
+            line = "  " * depth
+            if len(group) > 1:
+                last = group[-1][1]
+                line += (name if name == last else f"{name}..{last}") + f" x{len(group)}"
+            else:
+                line += name
+            if codes:
+                line += f" [{codes}]"
+            if not active:
+                line += " (off)"
+            children = self.children(node)
+            descend = children and depth + 1 < self.max_depth
+            if children and not descend:
+                line += f" (+{self.size(node) - 1})"
+            added = {k: v for k, v in legend.items() if k not in self.legend}
+            if not self.fits(len(line) + 1, added):
+                self.full = True
+                self.skipped += sum(self.size(g[0]) for g in group)
+                continue
+            self.lines.append(line)
+            self.chars += len(line) + 1
+            self.legend.update(added)
+            self.legend_chars += sum(len(k) + len(v) + 2 for k, v in added.items())
+            if descend:
+                self.write_level(children, depth + 1)
+
+
+def _children_of(scene):
+    """
+    节点 -> 按兄弟顺序排列的子节点 (根节点的父节点为 None)。
+    普通物体按 m_Father、Prefab 实例按 m_TransformParent 挂接；实例根节点的 stripped Transform 视为该实例，
+    实例中新增的子物体挂在它下面。顺序取父 Transform 的 m_Children，没有时 (根节点) 按 m_RootOrder。
+    """
+    def node_of(transform_id):
+        if transform_id == 0:
+            return None
+        if transform_id in scene.stripped:
+            return "p", scene.stripped[transform_id]
+        return "t", transform_id
+
+    entries = collections.defaultdict(list)
+    for tid, (_, father, _, order) in scene.transforms.items():
+        entries[node_of(father)].append((order, tid, ("t", tid)))
+    stripped_of = {iid: tid for tid, iid in scene.stripped.items()}
+    for iid, (parent, _, _, _) in scene.instances.items():
+        entries[node_of(parent)].append((0, stripped_of.get(iid), ("p", iid)))
+
+    children = {}
+    for parent, items in entries.items():
+        siblings = scene.transforms.get(parent[1], (0, 0, (), 0))[2] if parent and parent[0] == "t" else ()
+        position = {tid: i for i, tid in enumerate(siblings)}
+        items.sort(key=lambda e: (position.get(e[1], len(position)), e[0]))
+        children[parent] = [node for _, _, node in items]
+    return children
+
+
+def _depth_line(max_depth):
+    return (f"Depth <= {max_depth}; \"(+N)\" = N hidden descendants; \"xN\" = N similar siblings; "
+            f"\"(off)\" = inactive")
+
+
+def _skipped_line(skipped):
+    return f"... {skipped} more object(s) not shown"
+
+
+def _summarize_hierarchy(scene, label, resolve, max_depth, max_chars):
+    """标题、图例、Depth 行与 "... N more" 行都计入 max_chars；超出时降低深度，深度为 1 仍超出则截断"""
+    children = _children_of(scene)
+    title = None
+    text = ""
+    for depth in range(max(1, max_depth), 0, -1):
+        writer = _Writer(scene, children, resolve, depth, max_chars)
+        if title is None:
+            total = sum(writer.size(r) for r in writer.children(None))
+            title = (f"{label}: {total} objects, {len(scene.components)} components"
+                     + (f", {len(scene.instances)} prefab instances" if scene.instances else ""))
+        writer.reserved = len(title) + len(_depth_line(depth)) + len(_skipped_line(10 ** 10)) + 3
+        writer.write_level(writer.children(None), 0)
+
+        header = [title]
+        if writer.legend:
+            header.append("Codes: " + " ".join(f"{k}={v}" for k, v in sorted(writer.legend.items())))
+        header.append(_depth_line(depth))
+        if writer.skipped:
+            writer.lines.append(_skipped_line(writer.skipped))
+        text = "\n".join(header + writer.lines)
+        if not writer.full and len(text) <= max_chars:
+            return text
+    return text[:max_chars]
+
+
+def _summarize_objects(mm, label, resolve, max_chars):
+    """材质、ScriptableObject 等：每个对象列出类型、名称与顶层字段 (引用解析为资源路径)"""
+    def ref(match):
+        file_id, guid = match.group(1), match.group(2)
+        if guid in _BUILTIN_GUIDS:
+            return f"builtin:{file_id}"
+        if guid:
+            return resolve(guid) or f"guid:{guid[:8]}"
+        return "None" if file_id == "0" else f"&{file_id}"
+
+    def field(key, value):
+        value = _REFERENCE.sub(ref, value)
+        block.append(f"  {key}: {value if len(value) <= _MAX_VALUE_CHARS else value[:_MAX_VALUE_CHARS] + '...'}")
+
+    lines, chars, skipped = [], 0, 0
+    documents = list(_documents(mm))
+    for i, (match, start, end) in enumerate(documents):
+        body = mm[start:min(end, start + _OBJECT_BODY_BYTES)].decode("utf-8", "replace").split("\n")
+        type_name = match.group(4).decode("ascii")
+        name = next((_text(l[9:].encode("utf-8")) for l in body if l.startswith("  m_Name:")), "")
+        block = [f"{type_name} \"{name}\"" if name else type_name]
+        section = prop = None
+        for line in body:
+            if len(block) > _MAX_FIELDS:
+                block.append("  ...")
+                break
+            content = line.lstrip(" ")
+            if not content:
+                continue
+            indent = len(line) - len(content)
+            item = content.startswith("- ")
+            key, _, value = (content[2:] if item else content).partition(":")
+            value = value.strip()
+            if indent == 2 and not item:
+                section = None
+                if key in _SKIPPED_FIELDS:
+                    continue
+                if value:
+                    field(key, value)
+                else:
+                    section = key
+            elif indent == 4 and not item and not value:
+                section = key
+            elif indent == 4 and item and section:
+                # 材质属性：m_Floats / m_Colors 为 "- _Name: value"，m_TexEnvs 的贴图在下一层的 m_Texture 中
+                if value:
+                    field(f"{section}.{key}", value)
+                else:
+                    prop = key
+            elif indent == 8 and section == "m_TexEnvs" and key == "m_Texture" and "guid:" in value:
+                field(f"m_TexEnvs.{prop}", value)
+        text = "\n".join(block)
+        if chars + len(text) + 1 > max_chars:
+            skipped = len(documents) - i
+            break
+        lines.append(text)
+        chars += len(text) + 1
+    if skipped:
+        lines.append(f"... {skipped} more object(s) not shown")
+    return "\n".join([f"{label}: {len(documents)} objects"] + lines)
+
+
+def summarize(path, label=None, resolve=None, max_depth=ATTACHMENT_YAML_MAX_DEPTH, max_chars=ATTACHMENT_YAML_MAX_CHARS):
+    """
+    生成 Unity 文本 YAML 资源的摘要；文件不是文本序列化时返回 None。
+    resolve: guid -> 资源路径 (通常为 AssetIndex.path_of)，用于显示脚本名、源 Prefab 与引用的资源
+    """
+    resolve = resolve or (lambda guid: None)
+    label = label or os.path.basename(path)
+    with open(path, "rb") as f:
+        if f.read(5) != b"%YAML":
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            scene = _collect(mm)
+            if scene.objects or scene.instances:
+                return _summarize_hierarchy(scene, label, resolve, max_depth, max_chars)
+            return _summarize_objects(mm, label, resolve, max_chars)
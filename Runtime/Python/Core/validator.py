@@ -0,0 +1,291 @@
+"""
+生成脚本的静态预检。
+
+在发送到 Unity 之前用 ast 检查脚本，捕获注定失败或违反 unity.md 核心规则的写法：
+可以机械修复的问题直接改写源码 (fixes)，其余问题 (problems) 交给调用方发回模型修复一次，
+避免为必然失败的代码付出一次 Unity 往返。
+"""
+import ast
+import builtins
+
+# 执行器命名空间中预置的名称 (见 UnityLib/aiskills/runtime.py 的 base_ns)
+RUNTIME_NAMES = {"__name__", "__file__", "clr", "System", "json", "sys", "traceback", "types",
+                 "UnityEngine", "UnityEditor", "AiSkillsBridge"}
+
+# AI 常见的幻觉模块名 -> 真实命名空间
+MODULE_ALIASES = {"unity_engine": "UnityEngine", "unity_editor": "UnityEditor"}
+
+# 改写通配导入时只处理这些命名空间
+STAR_MODULES = {"UnityEngine", "UnityEditor"}
+
+# 入口函数的常见命名，脚本没有调用任何入口时按顺序补上调用
+ENTRY_NAMES = ("main", "run", "execute")
+
+# 发回模型修复时附加的说明
+REPAIR_PROMPT = """The script above fails static validation before it can run in Unity:
+{problems}
+
+Fix these problems and return the complete corrected script in a single ```python block."""
+
+# 执行失败后发回模型的说明 (自动修复时执行以 revert_on_error 进行，出错前的修改已被撤销)
+ERROR_REPAIR_PROMPT = """The script failed when executed in Unity:
+```
+{error}
+```
+Everything the script changed before the error has been undone, so the scene is as it was before the script ran.
+
+Failing script:
+```python
+{script}
+```
+
+Fix the error and return the complete corrected script in a single ```python block."""
+
+# 错误信息 (traceback) 只保留末尾这么多字符
+ERROR_MAX_CHARS = 4000
+
+# match 语句中的捕获模式 (Python 3.10+)
+_MATCH_CAPTURES = tuple(getattr(ast, n) for n in ("MatchAs", "MatchStar") if hasattr(ast, n))
+_MATCH_MAPPING = tuple(getattr(ast, n) for n in ("MatchMapping",) if hasattr(ast, n))
+
+
+def _names(tree):
+    """
+    返回 (bound, free_calls, free_loads)：
+    bound 为脚本中任何位置绑定的名称；free_* 为未绑定的读取 (按名称去重并保持出现顺序)。
+    不区分作用域，宁可漏报也不误报。
+    """
+    bound = set()
+    loads = []
+    calls = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                loads.append(node.id)
+            else:
+                bound.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                bound.add((alias.asname or alias.name).split(".")[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            bound.update(node.names)
+        elif isinstance(node, _MATCH_CAPTURES) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, _MATCH_MAPPING) and node.rest:
+            bound.add(node.rest)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            calls.add(node.func.id)
+
+    known = bound | RUNTIME_NAMES | set(dir(builtins))
+    free = list(dict.fromkeys(n for n in loads if n not in known))
+    return bound, [n for n in free if n in calls], free
+
+
+def _whole_lines(lines, node):
+    """语句是否独占其所在的行 (同一行没有以分号连接的其他语句)"""
+    first = lines[node.lineno - 1]
+    last = lines[node.end_lineno - 1]
+    return first[:node.col_offset].strip() == "" and last[node.end_col_offset:].strip() in ("", "\\")
+
+
+def _replace(code, node, new_lines):
+    lines = code.splitlines()
+    lines[node.lineno - 1:node.end_lineno] = new_lines
+    return "\n".join(lines) + "\n"
+
+
+def _fix_main_guard(code, tree, fixes):
+    """顶层的 if __name__ == "__main__": 改为直接执行其内容"""
+    for node in tree.body:
+        test = node.test if isinstance(node, ast.If) else None
+        if not (isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and test.left.id == "__name__"
+                and len(test.comparators) == 1 and isinstance(test.comparators[0], ast.Constant)
+                and test.comparators[0].value == "__main__"):
+            continue
+        if node.orelse:
+            return code
+        lines = code.splitlines()
+        indent = node.body[0].col_offset
+        body = [line[indent:] if line[:indent].strip() == "" else line.lstrip()
+                for line in lines[node.body[0].lineno - 1:node.body[-1].end_lineno]]
+        fixes.append("Removed if __name__ == \"__main__\" guard")
+        return _replace(code, node, body)
+    return code
+
+
+def _alias(name, asname):
+    """import 子句中的模块名替换为真实命名空间，并保持脚本中绑定的名称不变"""
+    head, _, rest = name.partition(".")
+    if head not in MODULE_ALIASES:
+        return name + (f" as {asname}" if asname else "")
+    real = MODULE_ALIASES[head] + ("." + rest if rest else "")
+    return f"{real} as {asname or head}" if (asname or not rest) else f"{real}, {MODULE_ALIASES[head]} as {head}"
+
+
+def _fix_module_aliases(code, tree, fixes):
+    """import unity_engine -> import UnityEngine as unity_engine，from unity_engine import X 同理"""
+    lines = code.splitlines()
+    replaced = []
+    for node in sorted(ast.walk(tree), key=lambda n: -getattr(n, "lineno", 0)):
+        if isinstance(node, ast.Import):
+            heads = [a.name.split(".")[0] for a in node.names if a.name.split(".")[0] in MODULE_ALIASES]
+            if not heads or not _whole_lines(lines, node):
+                continue
+            text = "import " + ", ".join(_alias(a.name, a.asname) for a in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            head, _, rest = node.module.partition(".")
+            if head not in MODULE_ALIASES or not _whole_lines(lines, node):
+                continue
+            heads = [head]
+            names = ", ".join(a.name + (f" as {a.asname}" if a.asname else "") for a in node.names)
+            text = f"from {MODULE_ALIASES[head] + ('.' + rest if rest else '')} import {names}"
+        else:
+            continue
+        lines[node.lineno - 1:node.end_lineno] = [" " * node.col_offset + text]
+        replaced += heads
+    if not replaced:
+        return code
+    fixes += [f"Replaced module '{h}' with '{MODULE_ALIASES[h]}'" for h in dict.fromkeys(reversed(replaced))]
+    return "\n".join(lines) + "\n"
+
+
+def _fix_star_imports(code, tree, skip, fixes, problems):
+    """
+    from UnityEngine import * 改为只导入脚本实际用到的名称。
+    多个命名空间同时通配导入时无法判断名称来源，交给模型修复。
+    """
+    stars = [n for n in ast.walk(tree) if isinstance(n, ast.ImportFrom) and n.level == 0
+             and any(a.name == "*" for a in n.names)]
+    if not stars:
+        return code
+    modules = {n.module for n in stars}
+    if len(modules) > 1 or not modules <= STAR_MODULES:
+        problems.append(f"Wildcard imports are not allowed (from {', '.join(sorted(modules))} import *): "
+                        "use `import UnityEngine` and the full namespace, e.g. `UnityEngine.GameObject`.")
+        return code
+
+    lines = code.splitlines()
+    if not all(_whole_lines(lines, n) for n in stars):
+        problems.append(f"Wildcard imports are not allowed (from {stars[0].module} import *).")
+        return code
+    # 预装库与参考函数由 _fix_missing_imports 处理，不从命名空间导入
+    free = [n for n in _names(tree)[2] if n not in skip]
+    module = stars[0].module
+    for i, node in enumerate(sorted(stars, key=lambda n: -n.lineno)):
+        texts = [f"import {module}"]
+        if free and i == len(stars) - 1:
+            texts.append(f"from {module} import {', '.join(free)}")
+        lines[node.lineno - 1:node.end_lineno] = [" " * node.col_offset + t for t in texts]
+    fixes.append(f"Replaced 'from {module} import *' with explicit imports"
+                 + (f" ({', '.join(free)})" if free else ""))
+    return "\n".join(lines) + "\n"
+
+
+def _fix_entry_call(code, tree, fixes):
+    """
+    定义了入口函数但脚本中没有任何地方调用或引用它时，在末尾补上调用。
+    try 中调用、赋值 (obj = main())、作为回调传递等情况都算已调用，避免脚本执行两次。
+    """
+    if any(isinstance(n, ast.Expr) and isinstance(n.value, ast.Call) for n in tree.body):
+        return code
+    referenced = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
+    defined = {n.name: n for n in tree.body if isinstance(n, ast.FunctionDef)}
+    for name in ENTRY_NAMES:
+        fn = defined.get(name)
+        if fn is None:
+            continue
+        if name in referenced:
+            return code
+        args = fn.args
+        if len(args.posonlyargs) + len(args.args) > len(args.defaults) or \
+                any(d is None for d in args.kw_defaults):
+            return code
+        fixes.append(f"Appended missing entry call {name}()")
+        return code.rstrip("\n") + f"\n\n{name}()\n"
+    return code
+
+
+def _fix_missing_imports(code, tree, exports, package, references, fixes, problems):
+    """
+    调用了未定义的函数：预装库中有的补上 import，Skill 参考函数 (库函数陷阱) 与其他未定义名称交给模型修复。
+    """
+    _, calls, free = _names(tree)
+    auto = [n for n in calls if n in exports]
+    if auto:
+        code = add_import(code, tree, f"from {package} import {', '.join(auto)}")
+        fixes.append(f"Added missing import: from {package} import {', '.join(auto)}")
+
+    trap = [n for n in calls if n not in exports and n in references]
+    if trap:
+        problems.append(f"Calls reference function(s) that are not defined in the script: {', '.join(trap)}. "
+                        "Reference functions do not exist in the environment; copy their full definitions "
+                        "into the script or write the logic inline.")
+    other = [n for n in free if n not in exports and n not in references]
+    if other:
+        problems.append(f"Undefined name(s): {', '.join(other)}")
+    return code
+
+
+def validate(code, exports=(), package="aiskills", references=()):
+    """
+    静态检查并修复脚本。
+    exports: 预装库导出的函数名 (未启用预装库时为空)，缺失的导入会自动补上
+    references: Skill 参考代码中定义的函数名，调用而未定义时视为 "库函数陷阱"
+    :return: (code, fixes, problems) — 修复后的代码、已应用的修复说明、需要模型修复的问题
+    """
+    fixes = []
+    problems = []
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        problems.append(f"SyntaxError: {e.msg} (line {e.lineno})")
+        return code, fixes, problems
+
+    exports = set(exports)
+    references = set(references)
+    for fix in (_fix_main_guard, _fix_module_aliases, _fix_entry_call):
+        fixed = fix(code, tree, fixes)
+        if fixed is not code:
+            code, tree = fixed, ast.parse(fixed)
+
+    fixed = _fix_star_imports(code, tree, exports | references, fixes, problems)
+    if fixed is not code:
+        code, tree = fixed, ast.parse(fixed)
+    if problems:
+        # 通配导入未修复时无法判断名称是否已定义
+        return code, fixes, problems
+
+    code = _fix_missing_imports(code, tree, exports, package, references, fixes, problems)
+    return code, fixes, problems
+
+
+def add_import(code, tree, statement):
+    """在第一条顶层语句之前插入导入语句 (跳过模块 docstring 与 __future__ 导入)"""
+    lines = code.splitlines()
+    insert_at = 0
+    for node in tree.body:
+        is_doc = isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) \
+            and isinstance(node.value.value, str)
+        if is_doc or (isinstance(node, ast.ImportFrom) and node.module == "__future__"):
+            insert_at = node.end_lineno
+            continue
+        break
+    lines.insert(insert_at, statement)
+    return "\n".join(lines) + "\n"
+
+
+def build_repair_prompt(problems):
+    return REPAIR_PROMPT.format(problems="\n".join(f"- {p}" for p in problems))
+
+
+def build_error_repair_prompt(error, script):
+    error = (error or "").strip()
+    if len(error) > ERROR_MAX_CHARS:
+        error = "..." + error[-ERROR_MAX_CHARS:]
+    return ERROR_REPAIR_PROMPT.format(error=error, script=script.rstrip())
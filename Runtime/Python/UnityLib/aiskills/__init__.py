@@ -0,0 +1,42 @@
+"""
+AI Skills 预装函数库。
+
+在 Unity 的 Python.NET 解释器中加载一次，生成的脚本通过
+`from aiskills import create_object, set_transform` 直接调用，无需复制实现。
+修改任何公开函数时需同步提升 __version__，服务端据此判断是否重新加载。
+脚本执行运行时见 aiskills.runtime。
+"""
+
+__version__ = "1.9.1"
+
+from .gameobject import create_object, set_transform, delete_object, find_object, find_objects, find_with_component
+from .component import add_or_get_component, configure_rigidbody
+from .asset import find_assets, move_asset, delete_assets, batch_asset_editing, refresh_assets
+from .material import create_material, assign_material
+from .prefab import save_as_prefab, instantiate_prefab
+from .light import create_light, set_light_shadows
+from .scene import save_current_scene, new_scene, open_scene
+from .ui import create_ui_text
+from .editor import control_play_mode, execute_menu_item, set_selection, request_compilation
+from .project import ensure_project_structure, cleanup_empty_folders
+from .validation import check_missing_scripts, iter_missing_scripts
+from .animator import setup_animator_controller, add_parameter
+from .progress import tqdm, trange
+from .bulk import set_transforms, spawn_prefab
+
+__all__ = [
+    "create_object", "set_transform", "delete_object", "find_object", "find_objects", "find_with_component",
+    "add_or_get_component", "configure_rigidbody",
+    "find_assets", "move_asset", "delete_assets", "batch_asset_editing", "refresh_assets",
+    "create_material", "assign_material",
+    "save_as_prefab", "instantiate_prefab",
+    "create_light", "set_light_shadows",
+    "save_current_scene", "new_scene", "open_scene",
+    "create_ui_text",
+    "control_play_mode", "execute_menu_item", "set_selection", "request_compilation",
+    "ensure_project_structure", "cleanup_empty_folders",
+    "check_missing_scripts", "iter_missing_scripts",
+    "setup_animator_controller", "add_parameter",
+    "tqdm", "trange",
+    "set_transforms", "spawn_prefab",
+]
@@ -0,0 +1,50 @@
+import System
+import UnityEngine
+import UnityEditor
+import UnityEditor.Animations
+
+from .gameobject import find_object
+
+
+def setup_animator_controller(target_name, controller_path):
+    """
+    为物体设置 Animator Controller，不存在时自动创建
+    """
+    obj = find_object(target_name)
+    if not obj: return None
+
+    anim = obj.GetComponent[UnityEngine.Animator]()
+    if not anim: anim = obj.AddComponent[UnityEngine.Animator]()
+
+    ctrl = UnityEditor.AssetDatabase.LoadAssetAtPath(controller_path, UnityEditor.Animations.AnimatorController)
+    if not ctrl:
+        folder = System.IO.Path.GetDirectoryName(controller_path)
+        if not System.IO.Directory.Exists(folder):
+            System.IO.Directory.CreateDirectory(folder)
+        ctrl = UnityEditor.Animations.AnimatorController.CreateAnimatorControllerAtPath(controller_path)
+
+    anim.runtimeAnimatorController = ctrl
+    return ctrl
+
+
+def add_parameter(controller, param_name, param_type_str):
+    """
+    添加动画参数
+    param_type_str: 'Float', 'Int', 'Bool', 'Trigger'
+    """
+    if not controller: return
+
+    type_map = {
+        "Float": UnityEngine.AnimatorControllerParameterType.Float,
+        "Int": UnityEngine.AnimatorControllerParameterType.Int,
+        "Bool": UnityEngine.AnimatorControllerParameterType.Bool,
+        "Trigger": UnityEngine.AnimatorControllerParameterType.Trigger
+    }
+    p_type = type_map.get(param_type_str)
+
+    for p in controller.parameters:
+        if p.name == param_name:
+            return
+
+    if p_type is not None:
+        controller.AddParameter(param_name, p_type)
@@ -0,0 +1,60 @@
+import contextlib
+
+import System
+import UnityEngine
+import UnityEditor
+
+_batch_depth = 0
+
+
+def find_assets(filter_str):
+    """
+    查找资源，返回路径列表
+    filter_str: 't:Material', 't:Prefab', 't:Texture2D' 等
+    """
+    guids = UnityEditor.AssetDatabase.FindAssets(filter_str)
+    return [UnityEditor.AssetDatabase.GUIDToAssetPath(g) for g in guids]
+
+
+def move_asset(old_path, new_path):
+    """移动或重命名资源，成功返回 True"""
+    res = UnityEditor.AssetDatabase.MoveAsset(old_path, new_path)
+    if res:
+        UnityEngine.Debug.LogError(res) # 返回非空字符串表示错误
+        return False
+    return True
+
+
+@contextlib.contextmanager
+def batch_asset_editing():
+    """
+    批量资源操作：期间暂停导入 (StartAssetEditing)，结束时统一 Refresh 一次。
+    可嵌套；注意批次内新建的资源在结束前无法通过 LoadAssetAtPath 读取。
+    """
+    global _batch_depth
+    _batch_depth += 1
+    if _batch_depth == 1:
+        UnityEditor.AssetDatabase.StartAssetEditing()
+    try:
+        yield
+    finally:
+        _batch_depth -= 1
+        if _batch_depth == 0:
+            UnityEditor.AssetDatabase.StopAssetEditing()
+            UnityEditor.AssetDatabase.Refresh()
+
+
+def refresh_assets():
+    """刷新资源数据库；在 batch_asset_editing 内调用时推迟到批次结束统一刷新"""
+    if _batch_depth == 0:
+        UnityEditor.AssetDatabase.Refresh()
+
+
+def delete_assets(paths):
+    """批量删除资源 (一次导入)，返回删除失败的路径列表"""
+    paths = list(paths)
+    if not paths:
+        return []
+    failed = System.Collections.Generic.List[System.String]()
+    UnityEditor.AssetDatabase.DeleteAssets(System.Array[System.String](paths), failed)
+    return list(failed)
@@ -0,0 +1,68 @@
+"""
+批量变换与实例化：数据打包成一个 float[] 后一次调用 C# 的 AiSkillsBridge.Bulk，
+代替逐个物体设置 position / rotation / localScale，避免每个属性一次 Python.NET 跨边界调用。
+"""
+from array import array
+
+import System
+
+from .runtime import bridge_api
+
+
+def pack_floats(values):
+    """把 float 序列转成 System.Single[]；优先整块内存拷贝，失败时逐元素转换"""
+    data = values if isinstance(values, array) and values.typecode == "f" else array("f", values)
+    result = System.Array.CreateInstance(System.Single, len(data))
+    if not data:
+        return result
+    try:
+        address, _ = data.buffer_info()
+        System.Runtime.InteropServices.Marshal.Copy(System.IntPtr(System.Int64(address)), result, 0, len(data))
+    except Exception:
+        result = System.Array[System.Single](list(data))
+    return result
+
+
+def _targets(targets):
+    """名称列表 -> string[]，实例 ID 或 GameObject/Transform 列表 -> int[]"""
+    targets = list(targets)
+    if all(isinstance(t, str) for t in targets):
+        return System.Array[System.String](targets)
+    ids = [t if isinstance(t, int) else t.GetInstanceID() for t in targets]
+    return System.Array[System.Int32](ids)
+
+
+def set_transforms(targets, positions=None, rotations=None, scales=None):
+    """
+    一次设置大量物体的变换 (支持一次 Undo)。
+    targets: 物体名称 (含 '/' 时按路径查找)、实例 ID 或 GameObject 的列表
+    positions/rotations/scales: 与 targets 等长的 (x, y, z) 列表，rotations 为欧拉角，不需要的传 None
+    返回找到并设置的物体数量
+    """
+    fields = [(c, v) for c, v in (("p", positions), ("r", rotations), ("s", scales)) if v is not None]
+    if not fields:
+        return 0
+    targets = _targets(targets)
+    for c, values in fields:
+        if len(values) != len(targets):
+            raise ValueError(f"Expected {len(targets)} values for '{c}', got {len(values)}.")
+
+    packed = array("f")
+    for row in zip(*(v for _, v in fields)):
+        for vec in row:
+            packed.extend(vec)
+    layout = "".join(c for c, _ in fields)
+    return bridge_api("Bulk").SetTransforms(targets, pack_floats(packed), layout)
+
+
+def spawn_prefab(path, positions, parent=None, name_prefix=None):
+    """
+    在每个位置实例化一次 Prefab (保持 Prefab 连接，支持一次 Undo)。
+    path: Prefab 资源路径，如 'Assets/Prefabs/Tree.prefab'
+    positions: (x, y, z) 列表；name_prefix 不为 None 时依次命名为 name_prefix + 序号
+    返回实例 ID 列表，可直接传给 set_transforms
+    """
+    packed = array("f")
+    for vec in positions:
+        packed.extend(vec)
+    return list(bridge_api("Bulk").SpawnPrefab(path, pack_floats(packed), parent, name_prefix))
@@ -0,0 +1,33 @@
+import UnityEngine
+
+from .gameobject import find_object
+
+
+def add_or_get_component(target_name, component_type_name):
+    """
+    添加或获取组件
+    component_type_name: 'Rigidbody', 'BoxCollider', 'AudioSource' 等 UnityEngine 下的组件类型名
+    """
+    obj = find_object(target_name)
+    if not obj: return None
+
+    comp_type = getattr(UnityEngine, component_type_name, None)
+    if comp_type is None:
+        UnityEngine.Debug.LogError(f"Unknown component type: {component_type_name}")
+        return None
+
+    comp = obj.GetComponent(comp_type)
+    if not comp: comp = obj.AddComponent(comp_type)
+    return comp
+
+
+def configure_rigidbody(target_name, mass=1.0, use_gravity=True, is_kinematic=False):
+    """配置刚体属性"""
+    obj = find_object(target_name)
+    if not obj: return
+
+    rb = obj.GetComponent[UnityEngine.Rigidbody]()
+    if rb:
+        rb.mass = mass
+        rb.useGravity = use_gravity
+        rb.isKinematic = is_kinematic
@@ -0,0 +1,47 @@
+import UnityEngine
+import UnityEditor
+import System
+
+from .gameobject import find_object
+
+
+def control_play_mode(action="toggle"):
+    """
+    控制播放模式
+    action: 'play', 'stop', 'toggle'
+    """
+    if action == "play":
+        UnityEditor.EditorApplication.isPlaying = True
+    elif action == "stop":
+        UnityEditor.EditorApplication.isPlaying = False
+    elif action == "toggle":
+        UnityEditor.EditorApplication.isPlaying = not UnityEditor.EditorApplication.isPlaying
+
+
+def execute_menu_item(menu_path):
+    """
+    执行编辑器菜单项
+    例如: 'Assets/Refresh', 'File/Save Project', 'GameObject/Create Empty'
+    """
+    return UnityEditor.EditorApplication.ExecuteMenuItem(menu_path)
+
+
+def set_selection(target_names):
+    """
+    设置编辑器选中项
+    target_names: 字符串列表，物体名称
+    """
+    objects = []
+    for name in target_names:
+        obj = find_object(name)
+        if obj: objects.append(obj)
+
+    if objects:
+        UnityEditor.Selection.objects = System.Array[UnityEngine.Object](objects)
+    else:
+        UnityEditor.Selection.objects = None
+
+
+def request_compilation():
+    """强制重新编译脚本"""
+    UnityEditor.EditorUtility.RequestScriptReload()
@@ -0,0 +1,90 @@
+import clr
+import UnityEngine
+
+from .runtime import bridge_api
+
+
+def _hierarchy():
+    try:
+        return bridge_api("Hierarchy")
+    except RuntimeError:
+        return None
+
+
+def find_object(name):
+    """
+    GameObject.Find 的索引版本：查询 Unity 会话中的层级索引 (AiSkillsBridge.Hierarchy)，按名称或路径常数时间查找。
+    与 GameObject.Find 相同只返回激活的物体；索引中没有 (如本次脚本刚创建的物体) 时回退到 GameObject.Find。
+    """
+    index = _hierarchy() if isinstance(name, str) else None
+    if index is None:
+        return UnityEngine.GameObject.Find(name)
+    return index.Find(name)
+
+
+def find_objects(name, include_inactive=False):
+    """
+    返回所有名为 name 的物体列表
+    索引随层级变化在下一帧更新，本次脚本中刚创建或改名的物体可能不在结果中
+    """
+    index = _hierarchy()
+    if index is None:
+        objects = UnityEngine.Resources.FindObjectsOfTypeAll[UnityEngine.GameObject]() if include_inactive \
+            else UnityEngine.Object.FindObjectsOfType[UnityEngine.GameObject]()
+        return [o for o in objects if o.name == name and o.scene.IsValid()]
+    return list(index.FindAll(name, include_inactive))
+
+
+def find_with_component(component_type, include_inactive=False):
+    """
+    返回挂有指定组件 (含子类) 的物体列表
+    component_type: 类型名 'Rigidbody' / 'UnityEngine.Rigidbody' 或类型本身 UnityEngine.Rigidbody
+    """
+    index = _hierarchy()
+    if index is None:
+        component_type = getattr(UnityEngine, component_type) if isinstance(component_type, str) else component_type
+        return [c.gameObject for c in UnityEngine.Object.FindObjectsOfType(clr.GetClrType(component_type), include_inactive)]
+    if not isinstance(component_type, str):
+        component_type = clr.GetClrType(component_type)
+    return list(index.FindWithComponent(component_type, include_inactive))
+
+
+def create_object(name, primitive_type=None, parent_name=None):
+    """
+    创建物体
+    primitive_type: 'Cube', 'Sphere', 'Capsule', 'Cylinder', 'Plane', 'Quad' 或 None (空物体)
+    """
+    if primitive_type:
+        p_type = getattr(UnityEngine.PrimitiveType, primitive_type, UnityEngine.PrimitiveType.Cube)
+        obj = UnityEngine.GameObject.CreatePrimitive(p_type)
+    else:
+        obj = UnityEngine.GameObject()
+
+    obj.name = name
+
+    if parent_name:
+        parent = find_object(parent_name)
+        if parent:
+            obj.transform.SetParent(parent.transform)
+
+    return obj
+
+
+def set_transform(target_name, pos=None, rot=None, scale=None):
+    """
+    设置变换
+    pos/rot/scale: (x, y, z) tuple
+    """
+    obj = find_object(target_name)
+    if not obj: return
+
+    if pos: obj.transform.position = UnityEngine.Vector3(*pos)
+    if rot: obj.transform.rotation = UnityEngine.Quaternion.Euler(*rot)
+    if scale: obj.transform.localScale = UnityEngine.Vector3(*scale)
+
+
+def delete_object(name):
+    """删除物体"""
+    obj = find_object(name)
+    if obj:
+        UnityEngine.Object.DestroyImmediate(obj)
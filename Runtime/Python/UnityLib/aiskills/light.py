@@ -0,0 +1,54 @@
+import UnityEngine
+
+from .gameobject import find_object
+
+
+def create_light(name, kind="Point", color="#FFFFFF", intensity=1.0, range_val=10.0):
+    """
+    创建灯光
+    kind: Directional, Point, Spot, Area
+    """
+    obj = UnityEngine.GameObject(name)
+    light_comp = obj.AddComponent[UnityEngine.Light]()
+
+    if kind == "Directional":
+        light_comp.type = UnityEngine.LightType.Directional
+        obj.transform.rotation = UnityEngine.Quaternion.Euler(50, -30, 0)
+    elif kind == "Spot":
+        light_comp.type = UnityEngine.LightType.Spot
+        light_comp.range = range_val
+        light_comp.spotAngle = 30.0
+    elif kind == "Area":
+        light_comp.type = UnityEngine.LightType.Area
+        light_comp.shape = UnityEngine.LightShape.Rectangle
+    else:
+        light_comp.type = UnityEngine.LightType.Point
+        light_comp.range = range_val
+
+    col = UnityEngine.ColorUtility.TryParseHtmlString(color, UnityEngine.Color.white)[1]
+    light_comp.color = col
+    light_comp.intensity = intensity
+
+    if kind != "Area":
+        light_comp.shadows = UnityEngine.LightShadows.Soft
+
+    return obj
+
+
+def set_light_shadows(target_name, shadow_type="Soft"):
+    """
+    设置阴影类型
+    shadow_type: None, Hard, Soft
+    """
+    obj = find_object(target_name)
+    if not obj: return
+
+    light = obj.GetComponent[UnityEngine.Light]()
+    if not light: return
+
+    if shadow_type == "Hard":
+        light.shadows = UnityEngine.LightShadows.Hard
+    elif shadow_type == "None":
+        light.shadows = getattr(UnityEngine.LightShadows, "None")
+    else:
+        light.shadows = UnityEngine.LightShadows.Soft
@@ -0,0 +1,48 @@
+import UnityEngine
+import UnityEditor
+
+from .gameobject import find_object
+
+
+def create_material(name, color_hex="#FFFFFF", shader_name=None, folder="Assets/Materials"):
+    """
+    创建材质，返回资源路径。
+    自动处理 URP (Universal Render Pipeline) 和 Built-in 的属性差异。
+    """
+    if not UnityEditor.AssetDatabase.IsValidFolder(folder):
+        parent, _, leaf = folder.rpartition("/")
+        UnityEditor.AssetDatabase.CreateFolder(parent or "Assets", leaf)
+
+    if not shader_name:
+        shader = UnityEngine.Shader.Find("Universal Render Pipeline/Lit")
+        if not shader:
+            shader = UnityEngine.Shader.Find("Standard")
+    else:
+        shader = UnityEngine.Shader.Find(shader_name)
+
+    if not shader:
+        UnityEngine.Debug.LogError(f"Shader not found: {shader_name}")
+        return None
+
+    mat = UnityEngine.Material(shader)
+    col = UnityEngine.ColorUtility.TryParseHtmlString(color_hex, UnityEngine.Color.white)[1]
+
+    if mat.HasProperty("_BaseColor"):
+        mat.SetColor("_BaseColor", col) # URP
+    elif mat.HasProperty("_Color"):
+        mat.SetColor("_Color", col)     # Standard
+
+    path = f"{folder}/{name}.mat"
+    UnityEditor.AssetDatabase.CreateAsset(mat, path)
+    return path
+
+
+def assign_material(target_name, material_path):
+    """将材质应用到物体"""
+    obj = find_object(target_name)
+    mat = UnityEditor.AssetDatabase.LoadAssetAtPath(material_path, UnityEngine.Material)
+
+    if obj and mat:
+        renderer = obj.GetComponent[UnityEngine.Renderer]()
+        if renderer:
+            renderer.sharedMaterial = mat
@@ -0,0 +1,27 @@
+import UnityEngine
+import UnityEditor
+
+from .gameobject import find_object
+
+
+def save_as_prefab(target_name, folder="Assets/Prefabs"):
+    """将场景物体保存为 Prefab，返回资源路径"""
+    obj = find_object(target_name)
+    if not obj: return None
+
+    if not UnityEditor.AssetDatabase.IsValidFolder(folder):
+        parent, _, leaf = folder.rpartition("/")
+        UnityEditor.AssetDatabase.CreateFolder(parent or "Assets", leaf)
+
+    local_path = UnityEditor.AssetDatabase.GenerateUniqueAssetPath(f"{folder}/{target_name}.prefab")
+    UnityEditor.PrefabUtility.SaveAsPrefabAssetAndConnect(obj, local_path, UnityEditor.InteractionMode.AutomatedAction)
+    return local_path
+
+
+def instantiate_prefab(prefab_path, pos=(0, 0, 0)):
+    """实例化 Prefab"""
+    prefab = UnityEditor.AssetDatabase.LoadAssetAtPath(prefab_path, UnityEngine.GameObject)
+    if prefab:
+        instance = UnityEditor.PrefabUtility.InstantiatePrefab(prefab)
+        instance.transform.position = UnityEngine.Vector3(*pos)
+        return instance
@@ -0,0 +1,64 @@
+"""
+tqdm 兼容的进度条：进度通过 AiSkillsBridge.Progress 汇报给服务端与 Copilot 窗口。
+tqdm 只随服务端的内置 Python 提供，Unity 的 Python 环境中没有，这里实现常用的子集。
+"""
+
+
+class tqdm:
+    """
+    用法与 tqdm 相同：
+        for obj in tqdm(objects, desc="Renaming"): ...
+        with tqdm(total=len(paths)) as bar: ... bar.update(1)
+    """
+
+    def __init__(self, iterable=None, desc=None, total=None, disable=False, **kwargs):
+        if total is None and iterable is not None:
+            try:
+                total = len(iterable)
+            except TypeError:
+                total = None
+        self.iterable = iterable
+        self.desc = desc or ""
+        self.total = total
+        self.n = 0
+        self.disable = disable
+
+    def __iter__(self):
+        for item in self.iterable:
+            yield item
+            self.update(1)
+        self.close()
+
+    def __len__(self):
+        return self.total or 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def update(self, n=1):
+        self.n += n
+        self.refresh()
+
+    def set_description(self, desc=None, refresh=True):
+        self.desc = desc or ""
+        if refresh: self.refresh()
+
+    def set_postfix(self, *args, **kwargs):
+        pass
+
+    def refresh(self):
+        if self.disable: return
+        from .runtime import report_progress
+        report_progress(self.n, self.total or 0, self.desc)
+
+    def close(self):
+        self.refresh()
+
+
+def trange(*args, **kwargs):
+    """tqdm(range(*args), **kwargs)"""
+    return tqdm(range(*args), **kwargs)
@@ -0,0 +1,53 @@
+import os
+import UnityEngine
+import UnityEditor
+
+from .asset import delete_assets, refresh_assets
+
+
+def ensure_project_structure(folders):
+    """
+    确保项目文件夹结构存在
+    folders: list of paths relative to Assets (e.g. ['Scripts/Core', 'Prefabs'])
+    """
+    assets_path = UnityEngine.Application.dataPath
+
+    for folder in folders:
+        full_path = os.path.join(assets_path, folder)
+        if os.path.exists(full_path): continue
+        try:
+            os.makedirs(full_path, exist_ok=True)
+        except OSError:
+            UnityEngine.Debug.LogError(f"Failed to create {full_path}")
+
+    refresh_assets()
+
+
+def cleanup_empty_folders(root_folder="Assets"):
+    """
+    递归清理空文件夹 (一次批量删除)，返回是否删除了文件夹
+    """
+    assets_path = UnityEngine.Application.dataPath
+    target_path = os.path.join(assets_path, root_folder.replace("Assets/", "")) if root_folder != "Assets" else assets_path
+
+    # 自底向上标记：只包含 .meta 与空子文件夹的文件夹也视为空
+    empty = set()
+    for root, dirs, files in os.walk(target_path, topdown=False):
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            if not os.path.isdir(dir_path): continue
+            entries = [f for f in os.listdir(dir_path) if not f.endswith(".meta") and f != ".DS_Store"]
+            if all(os.path.join(dir_path, f) in empty for f in entries):
+                empty.add(dir_path)
+
+    # 只删除最外层的空文件夹，子文件夹随之删除
+    paths = ["Assets" + p.replace(assets_path, "").replace("\\", "/")
+             for p in empty if os.path.dirname(p) not in empty]
+    failed = delete_assets(paths)
+    for path in failed:
+        UnityEngine.Debug.LogError(f"Failed to delete {path}")
+
+    if len(failed) < len(paths):
+        refresh_assets()
+        return True
+    return False
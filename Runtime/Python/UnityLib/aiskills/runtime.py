@@ -0,0 +1,483 @@
+"""
+Unity 内的脚本执行运行时。
+
+Bridge 的初始化 (clr.AddReference、查找 AiSkillsBridge 类型、模块欺骗) 只在每次
+域加载后执行一次；之后每次执行只需调用 execute(code)，在一个廉价复制出的全新命名空间中运行。
+域重载 (脚本编译) 后 AppDomain Id 变化，旧的 CLR 类型引用失效，会自动重新初始化。
+
+脚本最后一个表达式的值若是生成器 (如 `main()` 中使用了 yield)，则作为分时任务 (Job)：
+C# 端在每帧的时间预算内调用 step_job 推进，直到结束或被取消，期间编辑器保持响应。
+
+capture_logs 时脚本的 print 与 Debug.Log 不写入 Console，而是进入去重的环形缓冲，
+随执行结果一起返回 (payload 的 logs 字段)，Console 中只留一行摘要。
+"""
+import sys
+import ast
+import json
+import time
+import types
+import inspect
+import builtins
+import contextlib
+import traceback
+import collections
+
+import clr
+import System
+
+BRIDGE_TYPE = "Observater.AiSkills.Runtime.Core.AiSkillsBridge"
+BRIDGE_ASSEMBLY = "Observater.AiSkills"
+UNDO_GROUP_NAME = "AI Skills Script"
+# SendChunk 单帧文本上限，大列表会被拆成多帧发送
+CHUNK_BYTES = 64 * 1024
+# 进度汇报的最小间隔 (秒)，完成时 (done >= total) 总是发送
+PROGRESS_INTERVAL = 0.1
+# 捕获日志时保留的不同日志行数，超出后丢弃最早的行
+LOG_CAPACITY = 200
+# 捕获日志时单行的最大长度
+LOG_LINE_MAX = 500
+
+
+class _State:
+    domain_id = None
+    bridge = None       # C# AiSkillsBridge 类型，找不到时为 None
+    base_ns = None      # 每次执行复制的基础命名空间
+    current = None      # 当前正在执行的 _Execution
+    jobs = {}           # job id -> _Job
+
+
+_state = _State()
+
+
+def _resolve_bridge():
+    try: clr.AddReference(BRIDGE_ASSEMBLY)
+    except Exception: pass
+
+    try:
+        from Observater.AiSkills.Runtime.Core import AiSkillsBridge
+        return AiSkillsBridge
+    except ImportError:
+        pass
+
+    # 程序集名称与 asmdef 不一致时，才回退到反射遍历
+    for asm in System.AppDomain.CurrentDomain.GetAssemblies():
+        if asm.GetType(BRIDGE_TYPE) is None:
+            continue
+        try:
+            clr.AddReference(asm.GetName().Name)
+            from Observater.AiSkills.Runtime.Core import AiSkillsBridge
+            return AiSkillsBridge
+        except Exception:
+            break
+    return None
+
+
+class _Execution:
+    """
+    单次执行的 Bridge 代理，保证每次执行只回复一次。
+    生成的脚本通过全局变量 AiSkillsBridge 访问它。
+    """
+
+    def __init__(self, bridge):
+        self._bridge = bridge
+        self.sent = False
+        self.chunks = 0
+        self._last_progress = 0.0
+
+    def SendSuccess(self, m):
+        if self.sent: return
+        if self._bridge: self._bridge.SendMessage(str(m))
+        else: print(f"[Fallback] Success: {m}")
+        self.sent = True
+
+    def SendMessage(self, m): self.SendSuccess(m)
+
+    def SendResult(self, m): self.SendSuccess(m)
+
+    def SendError(self, m):
+        if self.sent: return
+        if self._bridge: self._bridge.SendError(str(m))
+        else: print(f"[Fallback] Error: {m}")
+        self.sent = True
+
+    def SendChunk(self, data):
+        """
+        流式发送一批结果，可多次调用，最后以 EndResult 结束。
+        data: 条目列表 (每个条目需可 JSON 序列化)，或已编码好的 JSON 文本片段。
+        每个条目编码为独立的 JSON 值并以逗号分隔，不加外层 []，接收端按值还原，
+        与一次性 SendResult 的条目一致 (SendChunk([[1, 2], [3, 4]]) 得到两个数组条目)。
+        文本片段需是同样格式的条目序列 (如 ',{"a": 1},{"a": 2}')，可在任意位置切分。
+        """
+        if self.sent: return
+        if isinstance(data, str):
+            self._write_chunk(data)
+            return
+        if isinstance(data, dict) or not hasattr(data, "__iter__"):
+            data = [data]
+
+        parts, size = [], 0
+        for item in data:
+            text = json.dumps(item, ensure_ascii=False, default=str)
+            parts.append(text)
+            size += len(text) + 1
+            if size >= CHUNK_BYTES:
+                self._write_chunk("," + ",".join(parts))
+                parts, size = [], 0
+        if parts:
+            self._write_chunk("," + ",".join(parts))
+
+    def _write_chunk(self, text):
+        if self._bridge: self._bridge.SendChunk(text)
+        else: print(f"[Fallback] Chunk: {text[:200]}")
+        self.chunks += 1
+
+    def EndResult(self, m=None):
+        if self.sent: return
+        m = str(m) if m is not None else f"Streamed {self.chunks} chunk(s)."
+        if self._bridge: self._bridge.EndResult(m)
+        else: print(f"[Fallback] End: {m}")
+        self.sent = True
+
+    def IsCancelled(self):
+        """客户端是否已请求取消；长循环中可主动检查并提前结束"""
+        return bool(self._bridge and self._bridge.IsCancelled())
+
+    def Progress(self, done, total=0, label=""):
+        if self.sent: return
+        now = time.monotonic()
+        if now - self._last_progress < PROGRESS_INTERVAL and not (total and done >= total): return
+        self._last_progress = now
+        if self._bridge: self._bridge.Progress(int(done), int(total or 0), str(label or ""))
+        else: print(f"[Fallback] Progress: {done}/{total} {label}")
+
+    @property
+    def Config(self):
+        return self._bridge.Config if self._bridge else None
+
+    def get_Config(self): return self.Config
+
+    @property
+    def Bulk(self):
+        """批量变换与实例化，脚本中建议使用 aiskills.set_transforms / spawn_prefab"""
+        return self._bridge.Bulk if self._bridge else None
+
+    @property
+    def Hierarchy(self):
+        """编辑器会话内的场景层级索引，脚本中建议使用 aiskills.find_object / find_objects / find_with_component"""
+        return self._bridge.Hierarchy if self._bridge else None
+
+
+class _LogBuffer:
+    """日志环形缓冲：内容相同的行合并计数，不同的行超过容量时丢弃最早的"""
+
+    def __init__(self, capacity=LOG_CAPACITY):
+        self.capacity = capacity
+        self.lines = collections.OrderedDict()
+        self.total = 0
+        self.dropped = 0
+        self._partial = ""
+
+    def add(self, text):
+        text = str(text).rstrip()
+        if not text: return
+        if len(text) > LOG_LINE_MAX: text = text[:LOG_LINE_MAX] + "..."
+        self.total += 1
+        if text in self.lines:
+            self.lines[text] += 1
+            return
+        self.lines[text] = 1
+        if len(self.lines) > self.capacity:
+            _, count = self.lines.popitem(last=False)
+            self.dropped += count
+
+    # 以下用于替换 sys.stdout，捕获 print
+    def write(self, s):
+        *complete, self._partial = (self._partial + s).split("\n")
+        for line in complete: self.add(line)
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def end_line(self):
+        if self._partial: self.add(self._partial)
+        self._partial = ""
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "dropped": self.dropped,
+            "lines": [text if n == 1 else f"{text} (x{n})" for text, n in self.lines.items()],
+        }
+
+
+class _CapturedBridge:
+    """
+    捕获日志时的 Bridge 代理：最终回复 (SendMessage/SendError/EndResult) 推迟到脚本结束，
+    附上日志后再发出；分块、进度等其余调用直接转发。
+    """
+
+    def __init__(self, bridge):
+        self._bridge = bridge
+        self.logs = _LogBuffer()
+        self.deferred = None
+
+    def __getattr__(self, name):
+        return getattr(self._bridge, name)
+
+    def SendMessage(self, m): self.deferred = ("SendMessage", m)
+
+    def SendError(self, m): self.deferred = ("SendError", m)
+
+    def EndResult(self, m): self.deferred = ("EndResult", m)
+
+    def flush(self):
+        logs = self.logs.to_dict()
+        if logs["total"]:
+            import UnityEngine
+            UnityEngine.Debug.Log(f"[AiSkills] Captured {logs['total']} log line(s) from script "
+                                  f"({len(logs['lines'])} unique kept, see execution result)")
+            self._bridge.AttachLogs(json.dumps(logs, ensure_ascii=False))
+        if self.deferred:
+            name, m = self.deferred
+            getattr(self._bridge, name)(m)
+
+
+@contextlib.contextmanager
+def _capturing(ex):
+    """执行期间把 print 与 Debug.Log 重定向到缓冲；只包住脚本本身，不含运行时自己的日志"""
+    bridge = ex._bridge
+    if not isinstance(bridge, _CapturedBridge):
+        yield
+        return
+    stdout, sys.stdout = sys.stdout, bridge.logs
+    bridge.BeginLogCapture(System.Action[System.String](bridge.logs.add))
+    try:
+        yield
+    finally:
+        bridge.EndLogCapture()
+        sys.stdout = stdout
+        bridge.logs.end_line()
+
+
+def _flush_logs(ex):
+    if isinstance(ex._bridge, _CapturedBridge):
+        ex._bridge.flush()
+
+
+def _forward(name):
+    def call(*args):
+        if _state.current is None:
+            raise RuntimeError("AiSkillsBridge is only available while a script is executing.")
+        return getattr(_state.current, name)(*args)
+    call.__name__ = name
+    return call
+
+
+def bootstrap():
+    """初始化 Bridge 与模块欺骗，每次域加载执行一次"""
+    import UnityEngine
+    import UnityEditor
+
+    _state.bridge = _resolve_bridge()
+
+    # 修复 'No module named AiSkillsBridge'：转发到当前执行的代理
+    mock_mod = types.ModuleType("AiSkillsBridge")
+    for name in ("SendSuccess", "SendMessage", "SendResult", "SendError", "SendChunk", "EndResult",
+                 "IsCancelled", "Progress"):
+        setattr(mock_mod, name, _forward(name))
+    sys.modules["AiSkillsBridge"] = mock_mod
+
+    # 兼容 AI 幻觉出的模块名
+    sys.modules["unity_editor"] = UnityEditor
+    sys.modules["unity_engine"] = UnityEngine
+
+    _state.base_ns = {
+        "__name__": "__main__",
+        "__builtins__": builtins,
+        "clr": clr,
+        "System": System,
+        "json": json,
+        "sys": sys,
+        "traceback": traceback,
+        "types": types,
+        "UnityEngine": UnityEngine,
+        "UnityEditor": UnityEditor,
+    }
+    _state.domain_id = System.AppDomain.CurrentDomain.Id
+
+
+def ensure_bootstrap():
+    if _state.base_ns is None or _state.domain_id != System.AppDomain.CurrentDomain.Id:
+        bootstrap()
+
+
+@contextlib.contextmanager
+def _undo_group():
+    """脚本的所有 Undo 操作合并为一组，一次 Ctrl+Z 即可撤销整个脚本"""
+    import UnityEditor
+
+    UnityEditor.Undo.IncrementCurrentGroup()
+    group = UnityEditor.Undo.GetCurrentGroup()
+    UnityEditor.Undo.SetCurrentGroupName(UNDO_GROUP_NAME)
+    try:
+        yield group
+    finally:
+        UnityEditor.Undo.CollapseUndoOperations(group)
+
+
+def _revert_undo_group(group):
+    """撤销脚本出错前已做的修改 (整个 Undo 组)，避免部分修改留在场景中"""
+    import UnityEditor
+
+    UnityEditor.Undo.CollapseUndoOperations(group)
+    UnityEditor.Undo.RevertAllDownToGroup(group)
+    print("[Internal] Reverted changes made before the error.")
+
+
+def _asset_scope(batch_assets):
+    """batch_assets 时暂停资源导入，结束后统一 Refresh 一次"""
+    from .asset import batch_asset_editing
+    return batch_asset_editing() if batch_assets else contextlib.nullcontext()
+
+
+def _run(code, ns):
+    """执行脚本并返回最后一个表达式语句的值 (用于识别生成器脚本)"""
+    tree = ast.parse(code, "<ai_script>")
+    last = tree.body.pop() if tree.body and isinstance(tree.body[-1], ast.Expr) else None
+    exec(compile(tree, "<ai_script>", "exec"), ns)
+    if last is None:
+        return None
+    return eval(compile(ast.Expression(last.value), "<ai_script>", "eval"), ns)
+
+
+class _Job:
+    def __init__(self, gen, ex, batch_assets, undo_group, revert_on_error):
+        self.gen = gen
+        self.ex = ex
+        self.batch_assets = batch_assets
+        self.undo_group = undo_group
+        self.revert_on_error = revert_on_error
+        self.steps = 0
+
+
+def report_progress(done, total=0, label=""):
+    """向当前执行汇报进度 (已限流)，不在执行中时忽略"""
+    if _state.current is not None:
+        _state.current.Progress(done, total, label)
+
+
+def bridge_api(name):
+    """返回 C# AiSkillsBridge 的嵌套静态类 (Bulk、Hierarchy)，找不到 Bridge 时抛出 RuntimeError"""
+    ensure_bootstrap()
+    if _state.bridge is None:
+        raise RuntimeError(f"AiSkillsBridge not found, AiSkillsBridge.{name} is unavailable.")
+    return getattr(_state.bridge, name)
+
+
+def _report(ex, value):
+    """生成器 yield 的 (done, total[, label]) 或 0~1 的小数视为进度"""
+    if isinstance(value, tuple) and 2 <= len(value) <= 3:
+        ex.Progress(*value)
+    elif isinstance(value, float) and 0.0 <= value <= 1.0:
+        ex.Progress(int(value * 1000), 1000)
+
+
+def _finish(ex, message=None):
+    if ex.sent: return
+    if ex.chunks: ex.EndResult(message)
+    else: ex.SendSuccess("Done." if message is None else message)
+
+
+def _start_job(gen, ex, batch_assets, undo_group, revert_on_error):
+    if ex._bridge is None:
+        # 没有 Bridge (本地调试) 时直接同步跑完
+        for value in gen: _report(ex, value)
+        return None
+    job_id = int(ex._bridge.BeginJob())
+    _state.jobs[job_id] = _Job(gen, ex, batch_assets, undo_group, revert_on_error)
+    print(f"[Internal] Script started as job #{job_id}")
+    return job_id
+
+
+def step_job(job_id, budget_ms):
+    """由 C# 每帧调用：在 budget_ms 内推进任务，结束、出错或被取消时回复并移除"""
+    job = _state.jobs.get(job_id)
+    if job is None:
+        return
+    ex = job.ex
+    _state.current = ex
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    done = True
+    last = None
+    try:
+        with _asset_scope(job.batch_assets), _capturing(ex):
+            while True:
+                if ex.IsCancelled():
+                    job.gen.close()
+                    ex.SendError(f"Cancelled after {job.steps} steps.")
+                    break
+                try:
+                    last = next(job.gen)
+                except StopIteration as stop:
+                    _finish(ex, stop.value)
+                    break
+                job.steps += 1
+                if time.perf_counter() >= deadline:
+                    done = False
+                    break
+        if last is not None:
+            _report(ex, last)
+    except Exception as e:
+        err = traceback.format_exc()
+        print(f"[Internal] Job Error: {err}")
+        if job.revert_on_error:
+            _revert_undo_group(job.undo_group)
+        ex.SendError(f"Error: {e}\n{err}")
+        done = True
+    finally:
+        _state.current = None
+        if done:
+            _flush_logs(ex)
+            _state.jobs.pop(job_id, None)
+            import UnityEditor
+            UnityEditor.Undo.CollapseUndoOperations(job.undo_group)
+
+
+def execute(code, batch_assets=False, capture_logs=False, revert_on_error=False):
+    """
+    在全新的命名空间中执行生成的脚本，并保证向 Bridge 回复一次。
+    batch_assets: 在 AssetDatabase.StartAssetEditing/StopAssetEditing 中执行
+    capture_logs: 脚本的 print 与 Debug.Log 随结果返回，不写入 Console (需要 Bridge)
+    revert_on_error: 出错时先撤销脚本已做的修改再回复 (自动修复时使用，重试从干净的场景开始)
+    """
+    ensure_bootstrap()
+
+    bridge = _state.bridge
+    if capture_logs and bridge is not None:
+        bridge = _CapturedBridge(bridge)
+    ex = _Execution(bridge)
+    ns = dict(_state.base_ns)
+    ns["AiSkillsBridge"] = ex
+    _state.current = ex
+
+    print("[Internal] Running user code...")
+    job_id = None
+    group = None
+    try:
+        with _undo_group() as group:
+            with _asset_scope(batch_assets), _capturing(ex):
+                value = _run(code, ns)
+            if inspect.isgenerator(value):
+                job_id = _start_job(value, ex, batch_assets, group, revert_on_error)
+    except Exception as e:
+        err = traceback.format_exc()
+        print(f"[Internal] Execution Error: {err}")
+        if revert_on_error and group is not None:
+            _revert_undo_group(group)
+        ex.SendError(f"Error: {e}\n{err}")
+    finally:
+        if job_id is None:
+            _finish(ex)
+            _flush_logs(ex)
+        _state.current = None
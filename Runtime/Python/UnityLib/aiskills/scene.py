@@ -0,0 +1,24 @@
+import System
+import UnityEngine
+import UnityEditor
+import UnityEngine.SceneManagement
+import UnityEditor.SceneManagement
+
+
+def save_current_scene(path=None):
+    """保存当前场景"""
+    scene = UnityEngine.SceneManagement.SceneManager.GetActiveScene()
+    if path:
+        return UnityEditor.SceneManagement.EditorSceneManager.SaveScene(scene, path)
+    return UnityEditor.SceneManagement.EditorSceneManager.SaveScene(scene)
+
+
+def new_scene():
+    """新建场景"""
+    return UnityEditor.SceneManagement.EditorSceneManager.NewScene(UnityEditor.SceneManagement.NewSceneSetup.DefaultGameObjects)
+
+
+def open_scene(path):
+    """打开场景"""
+    if System.IO.File.Exists(path):
+        return UnityEditor.SceneManagement.EditorSceneManager.OpenScene(path)
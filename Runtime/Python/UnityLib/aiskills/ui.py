@@ -0,0 +1,27 @@
+import UnityEngine
+import UnityEngine.UI
+
+
+def create_ui_text(text_content="Hello"):
+    """创建基础 UI 结构 (Canvas -> Text)，返回 Text 物体"""
+    canvas = UnityEngine.Object.FindObjectOfType[UnityEngine.Canvas]()
+    if not canvas:
+        canvas_obj = UnityEngine.GameObject("Canvas")
+        canvas = canvas_obj.AddComponent[UnityEngine.Canvas]()
+        canvas.renderMode = UnityEngine.RenderMode.ScreenSpaceOverlay
+        canvas_obj.AddComponent[UnityEngine.UI.CanvasScaler]()
+        canvas_obj.AddComponent[UnityEngine.UI.GraphicRaycaster]()
+
+    txt_obj = UnityEngine.GameObject("DynamicText")
+    txt_obj.transform.SetParent(canvas.transform, False)
+
+    txt = txt_obj.AddComponent[UnityEngine.UI.Text]()
+    txt.text = text_content
+    txt.font = UnityEngine.Resources.GetBuiltinResource[UnityEngine.Font]("Arial.ttf")
+    txt.color = UnityEngine.Color.black
+    txt.alignment = UnityEngine.TextAnchor.MiddleCenter
+
+    rect = txt_obj.GetComponent[UnityEngine.RectTransform]()
+    rect.sizeDelta = UnityEngine.Vector2(200, 50)
+    rect.anchoredPosition = UnityEngine.Vector2.zero
+    return txt_obj
@@ -0,0 +1,38 @@
+import UnityEngine
+import UnityEditor
+
+
+def _count_missing(obj):
+    if obj.hideFlags == UnityEngine.HideFlags.NotEditable or obj.hideFlags == UnityEngine.HideFlags.HideAndDontSave:
+        return 0
+    if UnityEditor.EditorUtility.IsPersistent(obj.transform.root.gameObject):
+        return 0
+
+    count = 0
+    components = obj.GetComponents[UnityEngine.Component]()
+    for i in range(len(components)):
+        if components[i] == None: # Python.NET 中 null 检查
+            UnityEngine.Debug.LogWarning(f"Missing Script on: {obj.name}", obj)
+            count += 1
+    return count
+
+
+def check_missing_scripts():
+    """检查场景中丢失脚本的物体，返回数量"""
+    all_objs = UnityEngine.Resources.FindObjectsOfTypeAll[UnityEngine.GameObject]()
+    return sum(_count_missing(obj) for obj in all_objs)
+
+
+def iter_missing_scripts(batch=200):
+    """
+    check_missing_scripts 的分时版本 (生成器)：每检查 batch 个物体 yield 一次进度，
+    编辑器在检查期间保持响应并可被取消。用法: count = yield from iter_missing_scripts()
+    """
+    all_objs = UnityEngine.Resources.FindObjectsOfTypeAll[UnityEngine.GameObject]()
+    total = len(all_objs)
+    count = 0
+    for i, obj in enumerate(all_objs, 1):
+        count += _count_missing(obj)
+        if i % batch == 0:
+            yield (i, total, "Checking missing scripts")
+    return count
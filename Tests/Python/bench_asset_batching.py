@@ -0,0 +1,98 @@
+"""
+AssetDatabase 批量化 (StartAssetEditing/StopAssetEditing + DeleteAssets) 前后的耗时对比。
+
+需要已打开的 Unity 编辑器 (AiSkillsBridge 监听中)。在 Assets/_AiSkillsBench 下创建 N 个材质，
+分别以逐个操作与批量操作的方式执行 创建 / 移动 / 删除，计时在 Unity 内完成。
+
+用法:
+  python bench_asset_batching.py [--count 1000] [--out result.json]
+"""
+import json
+import argparse
+
+from bench_common import write_results
+from unity_bridge import execute_in_unity
+
+BENCH_ROOT = "Assets/_AiSkillsBench"
+
+SCRIPT = r'''
+import json
+import time
+import contextlib
+import UnityEngine
+import UnityEditor
+from aiskills import batch_asset_editing, delete_assets
+
+ROOT = "{root}"
+COUNT = {count}
+BATCHED = {batched}
+
+def scope():
+    return batch_asset_editing() if BATCHED else contextlib.nullcontext()
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    UnityEditor.AssetDatabase.Refresh()
+    return round((time.perf_counter() - t0) * 1000, 1)
+
+def create():
+    shader = UnityEngine.Shader.Find("Standard") or UnityEngine.Shader.Find("Universal Render Pipeline/Lit")
+    with scope():
+        for i in range(COUNT):
+            UnityEditor.AssetDatabase.CreateAsset(UnityEngine.Material(shader), f"{{ROOT}}/src/m{{i}}.mat")
+
+def move():
+    with scope():
+        for i in range(COUNT):
+            UnityEditor.AssetDatabase.MoveAsset(f"{{ROOT}}/src/m{{i}}.mat", f"{{ROOT}}/dst/m{{i}}.mat")
+
+def delete():
+    paths = [f"{{ROOT}}/dst/m{{i}}.mat" for i in range(COUNT)]
+    if BATCHED:
+        delete_assets(paths)
+    else:
+        for p in paths:
+            UnityEditor.AssetDatabase.DeleteAsset(p)
+
+def main():
+    UnityEditor.AssetDatabase.DeleteAsset(ROOT)
+    UnityEditor.AssetDatabase.CreateFolder("Assets", "_AiSkillsBench")
+    UnityEditor.AssetDatabase.CreateFolder(ROOT, "src")
+    UnityEditor.AssetDatabase.CreateFolder(ROOT, "dst")
+    result = {{"create_ms": timed(create), "move_ms": timed(move), "delete_ms": timed(delete)}}
+    UnityEditor.AssetDatabase.DeleteAsset(ROOT)
+    AiSkillsBridge.SendResult(json.dumps(result))
+
+main()
+'''
+
+
+def run(count, batched):
+    code = SCRIPT.format(root=BENCH_ROOT, count=count, batched=batched)
+    res = execute_in_unity(code)
+    if res.get("status") != "ok":
+        raise SystemExit(f"[Bench] Unity error: {res.get('message')}")
+    return json.loads(res["message"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    results = {"count": args.count, "per_asset": run(args.count, False), "batched": run(args.count, True)}
+
+    print(f"{'op':<10}{'per-asset ms':>14}{'batched ms':>12}{'speedup':>9}")
+    for op in ("create_ms", "move_ms", "delete_ms"):
+        before, after = results["per_asset"][op], results["batched"][op]
+        speedup = f"{before / after:.1f}x" if after else "-"
+        print(f"{op[:-3]:<10}{before:>14}{after:>12}{speedup:>9}")
+
+    if args.out:
+        write_results(args.out, "asset_batching", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+离线资源引用图 (asset_graph.AssetGraph) 的扫描与查询耗时。
+
+在临时目录中生成合成 Unity 项目：N 张贴图、N/2 个材质 (引用贴图)、N/4 个 Prefab (引用材质) 与一个场景，
+部分贴图与材质故意不被引用。分别统计：进程池冷扫描、单线程冷扫描、无变化的增量扫描、
+从 Library 缓存重新加载后的扫描、"谁引用了 X" 与 "未被引用的资源" 查询。不需要 Unity。
+
+用法:
+  python bench_asset_graph.py [--count 20000] [--padding-kb 16] [--out result.json]
+"""
+import os
+import time
+import uuid
+import shutil
+import argparse
+import tempfile
+
+from bench_common import write_results
+import asset_graph
+from asset_index import AssetIndex
+from asset_graph import AssetGraph
+
+YAML_HEADER = "%YAML 1.1\n%TAG !u! tag:unity3d.com,2011:\n"
+
+
+def write_asset(root, rel, body=""):
+    guid = uuid.uuid4().hex
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(body)
+    with open(path + ".meta", "w") as f:
+        f.write(f"fileFormatVersion: 2\nguid: {guid}\n")
+    return guid
+
+
+def make_project(root, count, padding):
+    """返回 (未被引用的资源数, 一张被引用的贴图的 guid)；Prefab 与场景没有被引用"""
+    os.makedirs(os.path.join(root, "Library"))
+    textures = [write_asset(root, f"Assets/Textures/T{i // 500}/Tex_{i}.png") for i in range(count)]
+    used_textures = textures[:count * 3 // 4]
+    materials = []
+    for i in range(count // 2):
+        guids = [used_textures[(i * 3 + k) % len(used_textures)] for k in range(3)]
+        refs = "".join(f"    - _MainTex:\n        m_Texture: {{fileID: 2800000, guid: {g}, type: 3}}\n" for g in guids)
+        body = f"{YAML_HEADER}--- !u!21 &2100000\nMaterial:\n  m_Name: Mat_{i}\n{refs}  m_Padding: {padding}\n"
+        materials.append(write_asset(root, f"Assets/Materials/M{i // 500}/Mat_{i}.mat", body))
+    used_materials = materials[:len(materials) * 3 // 4]
+    for i in range(count // 4):
+        guids = [used_materials[(i * 4 + k) % len(used_materials)] for k in range(4)]
+        refs = "".join(f"  m_Materials:\n  - {{fileID: 2100000, guid: {g}, type: 2}}\n" for g in guids)
+        body = f"{YAML_HEADER}--- !u!23 &{i}\nMeshRenderer:\n{refs}  m_Padding: {padding}\n"
+        write_asset(root, f"Assets/Prefabs/P{i // 500}/Prefab_{i}.prefab", body)
+    write_asset(root, "Assets/Scenes/Main.unity", f"{YAML_HEADER}--- !u!1 &1\nGameObject:\n  m_Name: Root\n")
+    return count - len(used_textures) + len(materials) - len(used_materials) + count // 4 + 1, used_textures[0]
+
+
+def timed_ms(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return round((time.perf_counter() - t0) * 1000, 1), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000, help="贴图数量 (材质与 Prefab 按比例生成)")
+    parser.add_argument("--padding-kb", type=int, default=16, help="每个 YAML 资源附加的填充大小")
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="aiskills_graph_")
+    try:
+        expected_unused, texture = make_project(root, args.count, "x" * (args.padding_kb * 1024))
+        index = AssetIndex(root)
+        index.refresh(full=True)
+        result = {"assets": len(index), "expected_unused": expected_unused}
+
+        result["cold_pool_ms"], _ = timed_ms(lambda: AssetGraph(index).refresh(min_interval=0))
+        shutil.rmtree(os.path.join(root, "Library", "AiSkills"))
+        pool_min = asset_graph.ASSET_GRAPH_POOL_MIN_FILES
+        asset_graph.ASSET_GRAPH_POOL_MIN_FILES = 1 << 30
+        graph = AssetGraph(index)
+        result["cold_inline_ms"], _ = timed_ms(lambda: graph.refresh(min_interval=0))
+        asset_graph.ASSET_GRAPH_POOL_MIN_FILES = pool_min
+        result["files"] = graph.stats["files"]
+        result["noop_rescan_ms"], _ = timed_ms(lambda: graph.refresh(min_interval=0))
+        result["cache_reload_ms"], _ = timed_ms(lambda: AssetGraph(index).refresh(min_interval=0))
+
+        t0 = time.perf_counter()
+        refs = graph.references_to(texture)
+        result["references_us"] = round((time.perf_counter() - t0) * 1e6, 1)
+        result["unused_ms"], unused = timed_ms(lambda: graph.unused("Assets"))
+        result["unused"] = len(unused)
+        result["referrers_of_sample"] = len(refs)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"[Bench] {result['assets']} assets, {result['files']} YAML files parsed, "
+          f"{result['unused']} unused (expected {result['expected_unused']})")
+    for key in ("cold_pool_ms", "cold_inline_ms", "noop_rescan_ms", "cache_reload_ms", "references_us", "unused_ms"):
+        print(f"{key:<20}{result[key]:>10}")
+
+    if args.out:
+        write_results(args.out, "asset_graph", {"count": args.count, "padding_kb": args.padding_kb, **result})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+服务端项目资源索引 (asset_index.AssetIndex) 的扫描与搜索耗时。
+
+在临时目录中生成一个包含 N 个资源 (及 .meta) 的合成 Unity 项目，分别统计：
+首次全量扫描、无变化时的增量扫描、修改 K 个资源 (新增 / 删除 / 改名) 后的增量扫描、
+GUID 查询与模糊搜索的单次耗时。不需要 Unity。
+
+用法:
+  python bench_asset_index.py [--count 20000] [--changes 50] [--queries 500] [--out result.json]
+"""
+import os
+import time
+import uuid
+import random
+import shutil
+import argparse
+import tempfile
+
+from bench_common import write_results
+from asset_index import AssetIndex
+
+EXTENSIONS = (".mat", ".prefab", ".png", ".fbx", ".asset", ".controller", ".cs")
+WORDS = ("Red", "Blue", "Player", "Enemy", "Tree", "Rock", "Wall", "Door", "Light", "Water", "Grass", "Sky")
+
+
+def write_asset(root, rel):
+    path = os.path.join(root, rel)
+    with open(path, "w") as f:
+        f.write("")
+    with open(path + ".meta", "w") as f:
+        f.write(f"fileFormatVersion: 2\nguid: {uuid.uuid4().hex}\nDefaultImporter:\n  userData: \n")
+
+
+def make_project(root, count):
+    """每个目录放 50 个资源，目录分两层"""
+    assets = []
+    for i in range(count):
+        folder = f"Assets/Group{i // 2500}/Folder{i // 50}"
+        if i % 50 == 0:
+            os.makedirs(os.path.join(root, folder), exist_ok=True)
+        name = f"{random.choice(WORDS)}{random.choice(WORDS)}_{i}{random.choice(EXTENSIONS)}"
+        write_asset(root, f"{folder}/{name}")
+        assets.append(f"{folder}/{name}")
+    return assets
+
+
+def timed_ms(fn):
+    t0 = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - t0) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--changes", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="aiskills_assets_")
+    try:
+        assets = make_project(root, args.count)
+        index = AssetIndex(root)
+        result = {"full_scan_ms": timed_ms(lambda: index.refresh(full=True)), "assets": len(index)}
+        result["noop_rescan_ms"] = timed_ms(lambda: index.refresh(min_interval=0))
+
+        # 目录 mtime 精度较粗的文件系统上，保证修改后的 mtime 与扫描时不同
+        time.sleep(0.05)
+        for i, rel in enumerate(random.sample(assets, args.changes)):
+            if i % 3 == 0:
+                os.remove(os.path.join(root, rel))
+                os.remove(os.path.join(root, rel + ".meta"))
+            elif i % 3 == 1:
+                os.rename(os.path.join(root, rel), os.path.join(root, rel + "_renamed"))
+                os.rename(os.path.join(root, rel + ".meta"), os.path.join(root, rel + "_renamed.meta"))
+            else:
+                write_asset(root, os.path.dirname(rel) + f"/Added_{i}.mat")
+        parsed = index.stats["metas_parsed"]
+        result["changed_rescan_ms"] = timed_ms(lambda: index.refresh(min_interval=0))
+        result["changed_metas_parsed"] = index.stats["metas_parsed"] - parsed
+        result["assets_after_changes"] = len(index)
+
+        guids = random.sample(list(index.by_guid), min(args.queries, len(index)))
+        result["guid_lookup_us"] = round(timed_ms(lambda: [index.path_of(g) for g in guids]) * 1000 / len(guids), 2)
+        queries = [f"{random.choice(WORDS)}{random.choice(WORDS)}".lower() for _ in range(args.queries)]
+        result["search_us"] = round(timed_ms(lambda: [index.search(q) for q in queries]) * 1000 / len(queries), 1)
+        prompt = f"Assign {os.path.basename(assets[0]).rsplit('.', 1)[0]} to every object under Environment"
+        result["match_prompt_us"] = round(timed_ms(lambda: index.match_prompt(prompt)) * 1000, 1)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"[Bench] {result['assets']} assets, {args.changes} changes")
+    for key in ("full_scan_ms", "noop_rescan_ms", "changed_rescan_ms", "changed_metas_parsed",
+                "guid_lookup_us", "search_us", "match_prompt_us"):
+        print(f"{key:<24}{result[key]:>10}")
+
+    if args.out:
+        write_results(args.out, "asset_index", {"count": args.count, "changes": args.changes, **result})
+
+
+if __name__ == "__main__":
+    main()
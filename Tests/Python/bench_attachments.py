@@ -0,0 +1,109 @@
+"""
+附件读取 (attachments.process_attachments) 的耗时、内存与发送的 token 数。
+
+在临时目录中生成合成项目：若干 C# 脚本与一个大日志文件，分别统计附加脚本目录、只附加大日志
+(截断为开头与结尾) 与带行号选择器时的耗时与发送的 token 数，并与整个文件读入的 token 数对比。
+每种情况分别统计清空附件缓存后 (cold) 与缓存命中 (warm) 的耗时。
+内存峰值用 tracemalloc 单独统计 (mmap 页面不计入)。不需要 Unity。
+
+用法:
+  python bench_attachments.py [--scripts 20] [--script-kb 8] [--log-mb 50] [--repeat 20] [--out result.json]
+"""
+import io
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+
+from bench_common import write_results
+from utils import estimate_tokens
+from attachments import process_attachments, attachment_cache
+
+
+def log_line(n):
+    return f"[{n}] Refreshing native plugins compatible for Editor in 0.1 ms\n"
+
+
+def make_project(root, scripts, script_kb, log_mb):
+    folder = os.path.join(root, "Assets", "Scripts")
+    os.makedirs(folder)
+    paths = []
+    for i in range(scripts):
+        rel = f"Assets/Scripts/Behaviour{i}.cs"
+        body = [f"public class Behaviour{i} : MonoBehaviour\n{{\n"]
+        n = 0
+        while sum(map(len, body)) < script_kb * 1024:
+            body.append(f"    public void Method{n}() {{ transform.position += Vector3.up * {n}f; }}\n")
+            n += 1
+        body.append("}\n")
+        with open(os.path.join(root, rel), "w") as f:
+            f.write("".join(body))
+        paths.append(rel)
+    log = os.path.join(root, "Logs", "Editor.log")
+    os.makedirs(os.path.dirname(log))
+    with open(log, "w") as f:
+        line = 0
+        while f.tell() < log_mb * 1024 * 1024:
+            f.write("".join(map(log_line, range(line, line + 1000))))
+            line += 1000
+    return paths, "Logs/Editor.log"
+
+
+def timed_ms(fn, repeat, cold):
+    """截断与超出总上限的提示每次都会打印，计时时丢弃"""
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            if cold:
+                attachment_cache.clear()
+            result = fn()
+    return round((time.perf_counter() - t0) * 1000 / repeat, 2), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scripts", type=int, default=20)
+    parser.add_argument("--script-kb", type=int, default=8)
+    parser.add_argument("--log-mb", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="aiskills_attach_")
+    try:
+        scripts, log = make_project(root, args.scripts, args.script_kb, args.log_mb)
+        log_size = os.path.getsize(os.path.join(root, log))
+        cases = {"scripts": ["Assets/Scripts"], "log": [log], "log_lines": [f"{log}:100000-100200"]}
+        result = {"log_mb": round(log_size / 1048576, 1),
+                  "raw_tokens": {"scripts": sum(os.path.getsize(os.path.join(root, p)) for p in scripts) // 4,
+                                 "log": log_size // 4, "log_lines": sum(map(len, map(log_line, range(99999, 100200)))) // 4}}
+        for name, paths in cases.items():
+            result[f"{name}_cold_ms"], ctx = timed_ms(lambda: process_attachments(paths, root), args.repeat, True)
+            result[f"{name}_warm_ms"], _ = timed_ms(lambda: process_attachments(paths, root), args.repeat, False)
+            result[f"{name}_tokens"] = estimate_tokens(ctx)
+        attachment_cache.clear()
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_attachments([log], root)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["log_peak_python_mb"] = round(peak / 1048576, 2)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"[Bench] {args.scripts} scripts x {args.script_kb} KB, {result['log_mb']} MB log")
+    print(f"{'case':<12}{'cold ms':>10}{'warm ms':>10}{'tokens':>10}{'raw tokens':>14}")
+    for name in cases:
+        print(f"{name:<12}{result[name + '_cold_ms']:>10}{result[name + '_warm_ms']:>10}"
+              f"{result[name + '_tokens']:>10}{result['raw_tokens'][name]:>14}")
+    print(f"log peak python memory: {result['log_peak_python_mb']} MB")
+
+    if args.out:
+        write_results(args.out, "attachments", {"scripts": args.scripts, "script_kb": args.script_kb, **result})
+
+
+if __name__ == "__main__":
+    main()
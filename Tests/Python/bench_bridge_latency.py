@@ -0,0 +1,142 @@
+"""
+Python <-> Unity Bridge 往返延迟基准 (使用本地替身，无需打开 Unity)。
+
+对比两种传输方式：
+  legacy  每次调用新建 TCP 连接，单次 recv(65536) 读取回复 (旧实现)
+  framed  常驻连接 + 长度前缀帧 + 请求 id (UnityConnection，对端为 unity_emulator 替身)
+  exec    framed 连接上经 aiskills.runtime 实际执行一段脚本 (替身的桩模块)
+
+用法:
+  python bench_bridge_latency.py [--calls 500] [--sizes 64,65536,1048576] [--inflight 8] [--out result.json]
+"""
+import json
+import time
+import socket
+import argparse
+import threading
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_common import percentile, write_results
+from unity_bridge import UnityConnection, build_command
+from unity_emulator import UnityEmulator
+
+
+def _payload(size):
+    return {"status": "ok", "message": "x" * size}
+
+
+class _LegacyHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.recv(1024 * 1024)
+        self.request.sendall(json.dumps(_payload(self.server.result_size)).encode('utf-8'))
+
+
+class StandInListener(socketserver.ThreadingTCPServer):
+    """旧协议的替身监听器：对每条指令立即回复固定大小的结果"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler, result_size):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.result_size = result_size
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+def legacy_call(port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.connect(("127.0.0.1", port))
+    sock.sendall(b"print('bench')")
+    resp = sock.recv(65536).decode('utf-8')
+    sock.close()
+    try:
+        json.loads(resp)
+        return True
+    except ValueError:
+        return False # 回复被截断
+
+
+def _summary(samples, failures, elapsed):
+    ms = [s * 1000 for s in samples]
+    return {
+        "calls": len(samples),
+        "failures": failures,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0,
+    }
+
+
+def bench_legacy(size, calls):
+    server = StandInListener(_LegacyHandler, size)
+    samples, failures = [], 0
+    start = time.perf_counter()
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        if not legacy_call(server.port):
+            failures += 1
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    return _summary(samples, failures, elapsed)
+
+
+def _bench_emulator(emulator, calls, inflight, code, check):
+    with emulator:
+        conn = UnityConnection(port=emulator.port)
+        conn.request({"type": "exec", "code": code})
+
+        def one(_):
+            t0 = time.perf_counter()
+            res = conn.request({"type": "exec", "code": code})
+            return time.perf_counter() - t0, check(res)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=inflight) as pool:
+            results = list(pool.map(one, range(calls)))
+        elapsed = time.perf_counter() - start
+        conn.close()
+    return _summary([r[0] for r in results], sum(1 for r in results if not r[1]), elapsed)
+
+
+def bench_framed(size, calls, inflight):
+    return _bench_emulator(UnityEmulator(result_size=size, frame_ms=0), calls, inflight, "print('bench')",
+                           lambda res: res.get("status") == "ok" and len(res.get("message", "")) == size)
+
+
+def bench_exec(size, calls):
+    code = build_command(f"AiSkillsBridge.SendMessage('x' * {size})")
+    return _bench_emulator(UnityEmulator(frame_ms=0), calls, 1, code,
+                           lambda res: res.get("status") == "ok" and len(res.get("message", "")) == size)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--sizes", default="64,65536,1048576", help="回复 message 字节数，逗号分隔")
+    parser.add_argument("--inflight", type=int, default=8, help="framed 模式下同时在途的请求数")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    results = {}
+    for size in [int(s) for s in args.sizes.split(",")]:
+        results[f"legacy_{size}"] = bench_legacy(size, args.calls)
+        results[f"framed_{size}_serial"] = bench_framed(size, args.calls, 1)
+        results[f"framed_{size}_inflight{args.inflight}"] = bench_framed(size, args.calls, args.inflight)
+        results[f"exec_{size}"] = bench_exec(size, args.calls)
+
+    print(f"{'case':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>10}{'fail':>6}")
+    for name, r in results.items():
+        print(f"{name:<32}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['throughput_rps']:>10}{r['failures']:>6}")
+
+    if args.out:
+        write_results(args.out, "bridge_latency", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+批量变换 API (aiskills.spawn_prefab / set_transforms) 与逐个物体循环的耗时对比。
+
+需要已打开的 Unity 编辑器 (AiSkillsBridge 监听中)。在 Assets/_AiSkillsBench 下保存一个立方体 Prefab，
+分别以逐个物体循环与 Bulk API 的方式 实例化 N 个 / 设置 N 个物体的位置、旋转、缩放，计时在 Unity 内完成。
+逐个循环即生成脚本的常见写法 (每个属性一次 Python.NET 调用)，Bulk 额外记录了 Undo。
+
+用法:
+  python bench_bulk_transforms.py [--count 10000] [--out result.json]
+"""
+import json
+import argparse
+
+from bench_common import write_results
+from unity_bridge import execute_in_unity
+
+BENCH_ROOT = "Assets/_AiSkillsBench"
+
+SCRIPT = r'''
+import json
+import time
+import UnityEngine
+import UnityEditor
+from aiskills import spawn_prefab, set_transforms
+
+ROOT = "{root}"
+PREFAB = ROOT + "/BulkCube.prefab"
+COUNT = {count}
+BULK = {bulk}
+
+def layout(i):
+    return (i % 100 * 1.5, 0.0, i // 100 * 1.5), (0.0, i % 360, 0.0), (1.0, 1.0 + (i % 5) * 0.1, 1.0)
+
+def spawn(prefab, positions):
+    if BULK:
+        return spawn_prefab(PREFAB, positions)
+    objects = []
+    for x, y, z in positions:
+        obj = UnityEditor.PrefabUtility.InstantiatePrefab(prefab)
+        obj.transform.position = UnityEngine.Vector3(x, y, z)
+        objects.append(obj)
+    return objects
+
+def transform(objects):
+    rows = [layout(i) for i in range(len(objects))]
+    if BULK:
+        set_transforms(objects, [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows])
+        return
+    for obj, (pos, rot, scale) in zip(objects, rows):
+        t = obj.transform
+        t.position = UnityEngine.Vector3(*pos)
+        t.rotation = UnityEngine.Quaternion.Euler(*rot)
+        t.localScale = UnityEngine.Vector3(*scale)
+
+def main():
+    UnityEditor.AssetDatabase.DeleteAsset(ROOT)
+    UnityEditor.AssetDatabase.CreateFolder("Assets", "_AiSkillsBench")
+    cube = UnityEngine.GameObject.CreatePrimitive(UnityEngine.PrimitiveType.Cube)
+    prefab = UnityEditor.PrefabUtility.SaveAsPrefabAsset(cube, PREFAB)
+    UnityEngine.Object.DestroyImmediate(cube)
+
+    positions = [layout(i)[0] for i in range(COUNT)]
+    t0 = time.perf_counter()
+    spawned = spawn(prefab, positions)
+    t1 = time.perf_counter()
+    if BULK:
+        # 实例 ID 与 GameObject 都可以传给 set_transforms，这里与逐个循环一样传 GameObject
+        spawned = [UnityEditor.EditorUtility.InstanceIDToObject(i) for i in spawned]
+    t2 = time.perf_counter()
+    transform(spawned)
+    t3 = time.perf_counter()
+
+    for obj in spawned:
+        UnityEngine.Object.DestroyImmediate(obj)
+    UnityEditor.AssetDatabase.DeleteAsset(ROOT)
+    AiSkillsBridge.SendResult(json.dumps({{"spawn_ms": round((t1 - t0) * 1000, 1),
+                                           "transform_ms": round((t3 - t2) * 1000, 1)}}))
+
+main()
+'''
+
+
+def run(count, bulk):
+    code = SCRIPT.format(root=BENCH_ROOT, count=count, bulk=bulk)
+    res = execute_in_unity(code)
+    if res.get("status") != "ok":
+        raise SystemExit(f"[Bench] Unity error: {res.get('message')}")
+    return json.loads(res["message"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    results = {"count": args.count, "per_object": run(args.count, False), "bulk": run(args.count, True)}
+
+    print(f"{'op':<12}{'per-object ms':>15}{'bulk ms':>10}{'speedup':>9}")
+    for op in ("spawn_ms", "transform_ms"):
+        before, after = results["per_object"][op], results["bulk"][op]
+        speedup = f"{before / after:.1f}x" if after else "-"
+        print(f"{op[:-3]:<12}{before:>15}{after:>10}{speedup:>9}")
+
+    if args.out:
+        write_results(args.out, "bulk_transforms", results)
+
+
+if __name__ == "__main__":
+    main()
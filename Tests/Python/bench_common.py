@@ -0,0 +1,43 @@
+"""
+基准测试脚本的公共工具：路径设置、TESTING_PROMPTS 解析与结果输出。
+"""
+import os
+import re
+import sys
+import json
+import time
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_ROOT = os.path.abspath(os.path.join(TESTS_DIR, "..", ".."))
+CORE_DIR = os.path.join(PACKAGE_ROOT, "Runtime", "Python", "Core")
+TESTING_PROMPTS = os.path.join(PACKAGE_ROOT, "Tests", "TESTING_PROMPTS.md")
+
+if CORE_DIR not in sys.path:
+    sys.path.insert(0, CORE_DIR)
+
+_PROMPT_SECTION = re.compile(
+    r"^## \d+\.\s*/(?P<skill>[\w-]+).*?^### 测试 Prompt\s*\n```[^\n]*\n(?P<prompt>.*?)\n```",
+    re.DOTALL | re.MULTILINE)
+
+
+def load_testing_prompts(path=TESTING_PROMPTS):
+    """解析 TESTING_PROMPTS.md，返回 [(skill_name, prompt), ...]"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return [(m.group("skill"), m.group("prompt").strip()) for m in _PROMPT_SECTION.finditer(content)]
+
+
+def percentile(values, pct):
+    if not values: return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def write_results(path, name, results):
+    """将结果写入 JSON 文件，附带时间戳，便于在版本间 diff"""
+    payload = {"benchmark": name, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False, sort_keys=True)
+    print(f"[Bench] Results written to {path}")
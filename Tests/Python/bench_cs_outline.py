@@ -0,0 +1,90 @@
+"""
+C# 脚本结构摘要 (cs_outline.outline) 的耗时与节省的 token 数。
+
+默认统计本包自带的 C# 脚本 (Editor/ 与 Runtime/ 下不小于 ATTACHMENT_CS_OUTLINE_MIN_BYTES 的文件)，
+以及一个合成的大型 MonoBehaviour (含字段、属性、嵌套类型与带循环、lambda、字符串的方法体)。
+也可以用 --path 指定其他脚本或目录。不需要 Unity。
+
+用法:
+  python bench_cs_outline.py [--path Assets/Scripts] [--methods 400] [--repeat 20] [--out result.json]
+"""
+import os
+import time
+import argparse
+
+from bench_common import PACKAGE_ROOT, write_results
+from config import ATTACHMENT_CS_OUTLINE_MIN_BYTES
+from utils import estimate_tokens
+from cs_outline import outline
+
+METHOD = """
+        /// <summary>Method {i} {{ doc }}</summary>
+        public IEnumerator Step{i}(int count, string label = "step{{{i}}}")
+        {{
+            var items = new List<int> {{ {i}, {i} + 1 }};
+            for (int k = 0; k < count; k++)
+            {{
+                if (items.Any(x => {{ return x % 2 == 0; }}))
+                    Debug.Log($"{{label}} {{k}} }}");
+                yield return new WaitForSeconds(0.1f);
+            }}
+        }}
+"""
+
+
+def synthetic_script(methods):
+    body = "".join(METHOD.format(i=i) for i in range(methods))
+    return ("using System.Collections;\nusing System.Collections.Generic;\nusing System.Linq;\nusing UnityEngine;\n\n"
+            "public class Synthetic : MonoBehaviour\n{\n"
+            "    [SerializeField] private float speed = 5f;\n    private int _counter;\n"
+            "    public int Count { get; private set; }\n"
+            "    public enum Mode { A, B, C }\n"
+            "    [System.Serializable] public class Settings { public int level; }\n"
+            f"{body}}}\n")
+
+
+def collect(paths):
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            files += [os.path.join(dirpath, f) for f in filenames if f.endswith(".cs")]
+    return [f for f in sorted(files) if os.path.getsize(f) >= ATTACHMENT_CS_OUTLINE_MIN_BYTES]
+
+
+def measure(source, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        summary = outline(source)
+    elapsed = (time.perf_counter() - t0) / repeat
+    return {"kb": round(len(source.encode("utf-8")) / 1024, 1), "outline_ms": round(elapsed * 1000, 2),
+            "tokens": estimate_tokens(source), "outline_tokens": estimate_tokens(summary) if summary else None}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", action="append", default=None, help="脚本文件或目录 (可重复)")
+    parser.add_argument("--methods", type=int, default=400, help="合成脚本的方法数")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    paths = args.path or [os.path.join(PACKAGE_ROOT, "Editor"), os.path.join(PACKAGE_ROOT, "Runtime")]
+    results = {}
+    for path in collect(paths):
+        with open(path, "r", encoding="utf-8-sig") as f:
+            results[os.path.relpath(path, PACKAGE_ROOT).replace("\\", "/")] = measure(f.read(), args.repeat)
+    results[f"synthetic ({args.methods} methods)"] = measure(synthetic_script(args.methods), args.repeat)
+
+    print(f"{'file':<44}{'KB':>8}{'ms':>8}{'tokens':>9}{'outline':>9}")
+    for name, r in results.items():
+        print(f"{name:<44}{r['kb']:>8}{r['outline_ms']:>8}{r['tokens']:>9}{str(r['outline_tokens']):>9}")
+
+    if args.out:
+        write_results(args.out, "cs_outline", {"methods": args.methods, "files": results})
+
+
+if __name__ == "__main__":
+    main()
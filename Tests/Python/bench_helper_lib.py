@@ -0,0 +1,128 @@
+"""
+预装函数库 (aiskills) 前后的 token 对比。
+
+离线模式 (默认)：对每个 Skill 估算
+  - system prompt token 数 (完整参考实现 vs 仅签名)
+  - 单轮输出 token 数 (复制全部参考函数 vs import + 调用)
+在线模式 (--live)：对 TESTING_PROMPTS 中的每个 prompt 分别用两种 system prompt
+调用模型，记录真实的 completion_tokens 与生成耗时。
+
+用法:
+  python bench_helper_lib.py [--out result.json]
+  python bench_helper_lib.py --live --api-key sk-xxx [--base-url ...] [--model ...]
+"""
+import re
+import ast
+import time
+import argparse
+
+from bench_common import load_testing_prompts, write_results
+from config import SKILLS_DIR, DEFAULT_API_BASE, DEFAULT_MODEL
+from skills import SkillManager
+from helper_lib import HelperLibrary
+from utils import estimate_tokens
+
+_PY_BLOCK = re.compile(r"```python[ \t]*\n(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def _reference_functions(body, exports):
+    """提取 Skill 参考代码中属于预装库的函数源码：{name: source}"""
+    funcs = {}
+    for code in _PY_BLOCK.findall(body):
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            continue
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and node.name in exports:
+                funcs[node.name] = ast.get_source_segment(code, node)
+    return funcs
+
+
+def run_offline(sm_full, sm_lib, lib):
+    results = {}
+    for name in sorted(sm_full.index):
+        if name == "unity":
+            continue
+        body = sm_full._read_full_body(sm_full.index[name]["path"])
+        funcs = _reference_functions(body, lib.exports)
+        calls = "\n".join(f"{f}(...)" for f in funcs)
+        header = "import UnityEngine\nimport UnityEditor\n\n"
+
+        before_out = header + "\n\n".join(funcs.values()) + "\n\n" + calls
+        after_out = header + (f"from {lib.package} import {', '.join(funcs)}\n\n" if funcs else "") + calls
+
+        results[name] = {
+            "helpers": sorted(funcs),
+            "system_tokens_before": estimate_tokens(sm_full.build_system_prompt([name])),
+            "system_tokens_after": estimate_tokens(sm_lib.build_system_prompt([name])),
+            "output_tokens_before": estimate_tokens(before_out),
+            "output_tokens_after": estimate_tokens(after_out),
+        }
+    return results
+
+
+def run_live(sm_full, sm_lib, args):
+    from openai import OpenAI
+    client = OpenAI(api_key=args.api_key, base_url=args.base_url)
+
+    results = {}
+    for skill, prompt in load_testing_prompts():
+        if skill not in sm_full.index:
+            continue
+        row = {}
+        for label, sm in (("before", sm_full), ("after", sm_lib)):
+            messages = [
+                {"role": "system", "content": sm.build_system_prompt([skill])},
+                {"role": "user", "content": prompt},
+            ]
+            t0 = time.perf_counter()
+            res = client.chat.completions.create(model=args.model, messages=messages, temperature=0.1)
+            row[f"generation_ms_{label}"] = round((time.perf_counter() - t0) * 1000, 1)
+            if res.usage:
+                row[f"prompt_tokens_{label}"] = res.usage.prompt_tokens
+                row[f"output_tokens_{label}"] = res.usage.completion_tokens
+        results[skill] = row
+        print(f"[Bench] {skill}: {row}")
+    return results
+
+
+def print_table(results):
+    print(f"{'skill':<20}{'out before':>12}{'out after':>12}{'saved':>8}")
+    total_before = total_after = 0
+    for name, row in results.items():
+        before, after = row.get("output_tokens_before", 0), row.get("output_tokens_after", 0)
+        total_before += before
+        total_after += after
+        saved = f"{(1 - after / before) * 100:.0f}%" if before else "-"
+        print(f"{name:<20}{before:>12}{after:>12}{saved:>8}")
+    if total_before:
+        print(f"{'TOTAL':<20}{total_before:>12}{total_after:>12}{(1 - total_after / total_before) * 100:>7.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="调用真实模型统计 completion_tokens")
+    parser.add_argument("--api-key", default="")
+    parser.add_argument("--base-url", default=DEFAULT_API_BASE)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    lib = HelperLibrary()
+    if not lib.available:
+        raise SystemExit("[Bench] Helper library not found.")
+
+    sm_full = SkillManager(SKILLS_DIR)
+    sm_lib = SkillManager(SKILLS_DIR, helper_lib=lib)
+    sm_full.scan()
+    sm_lib.scan()
+
+    results = run_live(sm_full, sm_lib, args) if args.live else run_offline(sm_full, sm_lib, lib)
+    print_table(results)
+    if args.out:
+        write_results(args.out, "helper_lib_live" if args.live else "helper_lib_offline", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+层级索引 (AiSkillsBridge.Hierarchy / aiskills.find_object) 与 GameObject.Find 的查找耗时对比。
+
+需要已打开的 Unity 编辑器 (AiSkillsBridge 监听中)。在当前场景的 _AiSkillsBench 物体下创建 N 个物体
+(分 10 层，路径各不相同)，随机抽取名称分别用 GameObject.Find 与索引查找，计时在 Unity 内完成；
+另外统计索引的首次建立耗时。结束后删除创建的物体。
+
+用法:
+  python bench_hierarchy_index.py [--count 50000] [--lookups 1000] [--out result.json]
+"""
+import json
+import argparse
+
+from bench_common import write_results
+from unity_bridge import execute_in_unity
+
+SCRIPT = r'''
+import json
+import time
+import random
+import UnityEngine
+from aiskills import find_object
+
+COUNT = {count}
+LOOKUPS = {lookups}
+
+def timed(fn, names):
+    t0 = time.perf_counter()
+    for name in names:
+        fn(name)
+    return round((time.perf_counter() - t0) * 1e6 / len(names), 2)
+
+def main():
+    root = UnityEngine.GameObject("_AiSkillsBench")
+    groups = [UnityEngine.GameObject(f"Group_{{g}}") for g in range(10)]
+    for g in groups:
+        g.transform.SetParent(root.transform)
+    for i in range(COUNT):
+        UnityEngine.GameObject(f"Bench_{{i}}").transform.SetParent(groups[i % 10].transform)
+
+    index = AiSkillsBridge.Hierarchy
+    index.Invalidate()
+    t0 = time.perf_counter()
+    size = index.Count
+    build_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+    names = [f"Bench_{{random.randrange(COUNT)}}" for _ in range(LOOKUPS)]
+    result = {{"objects": size, "build_ms": build_ms,
+               "find_us": timed(UnityEngine.GameObject.Find, names),
+               "index_us": timed(find_object, names),
+               "index_path_us": timed(find_object, [f"_AiSkillsBench/Group_{{int(n[6:]) % 10}}/{{n}}" for n in names])}}
+    UnityEngine.Object.DestroyImmediate(root)
+    AiSkillsBridge.SendResult(json.dumps(result))
+
+main()
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=50000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    res = execute_in_unity(SCRIPT.format(count=args.count, lookups=args.lookups))
+    if res.get("status") != "ok":
+        raise SystemExit(f"[Bench] Unity error: {res.get('message')}")
+    result = json.loads(res["message"])
+
+    speedup = f"{result['find_us'] / result['index_us']:.1f}x" if result["index_us"] else "-"
+    print(f"[Bench] {result['objects']} objects indexed in {result['build_ms']} ms")
+    print(f"{'lookup':<18}{'us/call':>10}")
+    print(f"{'GameObject.Find':<18}{result['find_us']:>10}")
+    print(f"{'index (name)':<18}{result['index_us']:>10}  {speedup}")
+    print(f"{'index (path)':<18}{result['index_path_us']:>10}")
+
+    if args.out:
+        write_results(args.out, "hierarchy_index", {"count": args.count, "lookups": args.lookups, **result})
+
+
+if __name__ == "__main__":
+    main()
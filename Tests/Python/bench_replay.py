@@ -0,0 +1,111 @@
+"""
+TESTING_PROMPTS 的录制与回放基准。
+
+record  用真实模型 (--api-key/--base-url/--model) 跑一遍 TESTING_PROMPTS，服务端以 --record
+        把每轮的模型调用与 Unity 回复写入 cassette；Unity 默认连接已打开的编辑器，--emulator 时使用替身。
+replay  服务端以 --replay 从 cassette 回放 (不访问模型与 Unity)，按 Skill 统计 token 数与服务端自身开销。
+        --latency zero 时只剩服务端开销，适合版本间对比；original 复现录制时的整体耗时。
+
+用法:
+  python bench_replay.py record --cassette prompts.jsonl.gz --api-key sk-xxx [--base-url ...] [--model ...] [--emulator]
+  python bench_replay.py replay --cassette prompts.jsonl.gz [--latency zero] [--repeat 5] [--out result.json]
+"""
+import os
+import argparse
+import tempfile
+import contextlib
+
+from bench_common import load_testing_prompts, percentile, write_results
+from bench_server import ServerProcess, UPSTREAM_STAGES
+from config import DEFAULT_API_BASE, DEFAULT_MODEL
+from unity_emulator import UnityEmulator
+
+
+def _payload(prompt, args):
+    return {"prompt": prompt, "api_key": args.api_key, "base_url": args.base_url, "model": args.model,
+            "attachments": [], "project_root": None, "followup": False}
+
+
+@contextlib.contextmanager
+def _server(unity_port, extra_args):
+    fd, history = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    os.unlink(history)
+    server = ServerProcess(unity_port, history, extra_args)
+    try:
+        yield server
+    finally:
+        server.stop()
+        if os.path.exists(history):
+            os.unlink(history)
+
+
+def record(args):
+    prompts = load_testing_prompts()
+    emulator = UnityEmulator() if args.emulator else contextlib.nullcontext()
+    with emulator as emu:
+        with _server(emu.port if args.emulator else None, ["--record", args.cassette]) as server:
+            for skill, prompt in prompts:
+                res = server.post("/chat", _payload(prompt, args))
+                execution = res.get("execution") or {}
+                print(f"[Bench] {skill:<24} {res.get('status')} / unity {execution.get('status')} "
+                      f"({(res.get('usage') or {}).get('total_tokens', '-')} tokens)")
+    print(f"[Bench] Recorded {len(prompts)} turn(s) to {args.cassette}")
+
+
+def replay(args):
+    rows = {}
+    with _server(None, ["--replay", args.cassette, "--replay-latency", args.latency]) as server:
+        for skill, prompt in load_testing_prompts():
+            samples = []
+            for _ in range(args.repeat):
+                res = server.post("/chat", _payload(prompt, args))
+                if res.get("status") != "ok":
+                    print(f"[Bench] {skill}: {res.get('reply')}")
+                    break
+                samples.append(res)
+            if not samples:
+                continue
+            usage = samples[0].get("usage") or {}
+            overhead = [r["timings"]["total_ms"] - sum(r["timings"].get(s, 0) for s in UPSTREAM_STAGES)
+                        for r in samples]
+            rows[skill] = {
+                "prompt_tokens": usage.get("prompt_tokens"),
+                "completion_tokens": usage.get("completion_tokens"),
+                "selected_skills": samples[0].get("selected_skills"),
+                "total_ms_p50": round(percentile([r["timings"]["total_ms"] for r in samples], 50), 2),
+                "overhead_ms_p50": round(percentile(overhead, 50), 2),
+                "overhead_ms_p95": round(percentile(overhead, 95), 2),
+            }
+
+    print(f"{'skill':<24}{'prompt tok':>12}{'compl tok':>11}{'total ms':>10}{'overhead ms':>13}")
+    for skill, r in rows.items():
+        print(f"{skill:<24}{str(r['prompt_tokens']):>12}{str(r['completion_tokens']):>11}"
+              f"{r['total_ms_p50']:>10}{r['overhead_ms_p50']:>13}")
+
+    if args.out:
+        write_results(args.out, "replay", {"cassette": os.path.basename(args.cassette), "latency": args.latency,
+                                           "repeat": args.repeat, "skills": rows})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--cassette", required=True, help="cassette 文件路径 (.gz 结尾时压缩)")
+    parser.add_argument("--api-key", default="sk-replay")
+    parser.add_argument("--base-url", default=DEFAULT_API_BASE)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--emulator", action="store_true", help="录制时使用 Unity 替身而不是已打开的编辑器")
+    parser.add_argument("--latency", choices=["original", "zero"], default="zero", help="回放时的上游耗时")
+    parser.add_argument("--repeat", type=int, default=5, help="回放时每个 prompt 的请求次数")
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        record(args)
+    else:
+        replay(args)
+
+
+if __name__ == "__main__":
+    main()
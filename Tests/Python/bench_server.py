@@ -0,0 +1,331 @@
+"""
+ai_server 端到端负载基准 (无需模型 API 与 Unity)。
+
+启动三部分：
+  - 本地模拟的 OpenAI 兼容接口 (MockLLM)：可配置延迟与 usage，请求 stream=true 时以 SSE 分片输出，
+    根据请求内容分别回复技能选择、脚本生成与总结；
+  - Unity Bridge 替身 (unity_emulator)；
+  - ai_server 子进程，通过 AISKILLS_UNITY_PORT 连接替身，base_url 指向 MockLLM。
+以给定并发驱动 /chat，统计各阶段 (响应中的 timings) 的 p50/p95/p99、吞吐量与服务端进程 RSS。
+
+用法:
+  python bench_server.py [--requests 200] [--concurrency 8] [--llm-latency-ms 50]
+                         [--no-usage] [--script-lines 20] [--out result.json]
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from bench_common import CORE_DIR, percentile, write_results
+from unity_emulator import UnityEmulator
+
+# 上游 (模型与 Unity) 耗时，其余为服务端自身开销
+UPSTREAM_STAGES = ("select_ms", "scene_ms", "completion_ms", "repair_ms", "auto_repair_llm_ms", "summary_ms",
+                   "unity_ms")
+STAGES = ("select_ms", "scene_ms", "assets_ms", "completion_ms", "validate_ms", "optimize_ms", "repair_ms",
+          "summary_ms", "unity_ms", "auto_repair_ms", "generate_ms", "total_ms")
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        mock = self.server.mock
+        content = mock.reply_for(body.get("messages", []))
+        usage = mock.usage_for(body.get("messages", []), content)
+        time.sleep(mock.latency_ms / 1000.0)
+        if body.get("stream"):
+            self._stream(body, content, usage)
+        else:
+            self._send_json({
+                "id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": usage,
+            })
+        mock.calls += 1
+
+    def _send_json(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, body, content, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        step = 16
+        for i in range(0, len(content), step):
+            chunk = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "model": body.get("model", "mock"),
+                     "choices": [{"index": 0, "delta": {"content": content[i:i + step]}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            time.sleep(self.server.mock.token_delay_ms / 1000.0)
+        last = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+        self.wfile.write(f"data: {json.dumps(last)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        self.close_connection = True
+
+
+class MockLLM:
+    """
+    OpenAI 兼容的 /chat/completions 模拟接口。
+    latency_ms: 每次调用的首字节延迟；token_delay_ms: 流式输出时每个分片的间隔
+    skills: 技能选择请求返回的技能名；script_lines: 生成脚本的行数
+    """
+
+    def __init__(self, latency_ms=50, token_delay_ms=1, usage=True, skills=("unity-gameobject",), script_lines=20):
+        self.latency_ms = latency_ms
+        self.token_delay_ms = token_delay_ms
+        self.usage = usage
+        self.skills = list(skills)
+        self.script = self._make_script(script_lines)
+        self.calls = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _MockHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+
+    @staticmethod
+    def _make_script(lines):
+        body = "\n".join(f"    go{i} = UnityEngine.GameObject('Bench_{i}')" for i in range(lines))
+        return (f"```python\nimport UnityEngine\n\ndef main():\n{body}\n"
+                f"    AiSkillsBridge.SendMessage('Created {lines} objects')\n\nmain()\n```")
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def reply_for(self, messages):
+        system = (messages[0].get("content") or "") if messages else ""
+        if system.startswith("You are a skill selector"):
+            return json.dumps(self.skills)
+        if len(messages) == 1 and "一句话精准总结" in system:
+            return "Created benchmark objects."
+        return self.script
+
+    def usage_for(self, messages, content):
+        if not self.usage:
+            return None
+        prompt = sum(len(m.get("content") or "") for m in messages) // 4
+        completion = len(content) // 4
+        return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def read_rss_mb(pid):
+    """进程常驻内存 (MB)：优先 psutil，其次 /proc，都不可用时返回 None"""
+    try:
+        import psutil
+        return round(psutil.Process(pid).memory_info().rss / 1048576, 1)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+class ServerProcess:
+    """
+    ai_server 子进程。
+    unity_port: 指向替身的端口，None 时使用 config 中的默认端口 (真实 Unity)
+    extra_args: 附加的命令行参数 (如 --record / --replay)
+    """
+
+    def __init__(self, unity_port, history_path, extra_args=()):
+        self.port = _free_port()
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+        if unity_port is not None:
+            env["AISKILLS_UNITY_PORT"] = str(unity_port)
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.join(CORE_DIR, "ai_server.py"), "--port", str(self.port), "--history", history_path,
+             *extra_args],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._wait_ready()
+
+    def _wait_ready(self, timeout=30):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                raise SystemExit(f"[Bench] ai_server exited with code {self.proc.returncode}")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{self.port}/jobs", timeout=1).read()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise SystemExit("[Bench] ai_server did not start in time")
+
+    def post(self, path, payload, timeout=300):
+        req = urllib.request.Request(f"http://127.0.0.1:{self.port}{path}", data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            rss = read_rss_mb(self.pid)
+            if rss is not None:
+                self.samples.append(rss)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _stats(values):
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+    }
+
+
+def run(args):
+    mock = MockLLM(args.llm_latency_ms, args.token_delay_ms, not args.no_usage, script_lines=args.script_lines).start()
+    history = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+    history.close()
+    os.unlink(history.name)
+
+    with UnityEmulator(latency_ms=args.unity_latency_ms) as emu:
+        server = ServerProcess(emu.port, history.name)
+        try:
+            payload = {"prompt": "Create benchmark objects", "api_key": "sk-bench", "base_url": mock.base_url,
+                       "model": "mock", "attachments": [], "project_root": None, "followup": False}
+            server.post("/chat", payload)  # 预热：导入、连接 Unity、加载 aiskills
+            rss_before = read_rss_mb(server.proc.pid)
+
+            sampler = RssSampler(server.proc.pid)
+            sampler.start()
+
+            def one(_):
+                t0 = time.perf_counter()
+                try:
+                    res = server.post("/chat", payload)
+                except OSError as e:
+                    return None, str(e)
+                client_ms = (time.perf_counter() - t0) * 1000
+                ok = res.get("status") == "ok" and (res.get("execution") or {}).get("status") == "ok"
+                return dict(res.get("timings", {}), client_ms=client_ms), None if ok else json.dumps(res)[:200]
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                outcomes = list(pool.map(one, range(args.requests)))
+            elapsed = time.perf_counter() - start
+            sampler.stop()
+        finally:
+            server.stop()
+            if os.path.exists(history.name):
+                os.unlink(history.name)
+    mock.stop()
+
+    timings = [t for t, _ in outcomes if t is not None]
+    errors = [e for _, e in outcomes if e]
+    stages = {}
+    for stage in STAGES + ("client_ms",):
+        values = [t[stage] for t in timings if stage in t]
+        if values:
+            stages[stage] = _stats(values)
+    # 服务端自身开销：客户端耗时中扣除模型与 Unity 的部分
+    overhead = [t["client_ms"] - sum(t.get(s, 0) for s in UPSTREAM_STAGES)
+                for t in timings]
+    stages["server_overhead_ms"] = _stats(overhead)
+
+    return {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "requests": args.requests,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "throughput_rps": round(len(timings) / elapsed, 2) if elapsed else 0,
+        "stages_ms": stages,
+        "rss_mb": {
+            "before": rss_before,
+            "peak": max(sampler.samples) if sampler.samples else None,
+            "after": sampler.samples[-1] if sampler.samples else None,
+        },
+        "llm_calls": mock.calls,
+        "unity": emu.stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency-ms", type=float, default=50, help="模拟模型每次调用的延迟")
+    parser.add_argument("--token-delay-ms", type=float, default=1, help="流式输出时每个分片的间隔")
+    parser.add_argument("--unity-latency-ms", type=float, default=0, help="替身每条指令的额外延迟")
+    parser.add_argument("--script-lines", type=int, default=20, help="模拟生成脚本的行数")
+    parser.add_argument("--no-usage", action="store_true", help="回复中不包含 usage")
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    print(f"[Bench] {results['requests']} requests @ concurrency {args.concurrency}: "
+          f"{results['throughput_rps']} rps, {results['errors']} errors")
+    if results["first_error"]:
+        print(f"[Bench] First error: {results['first_error']}")
+    print(f"{'stage':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, s in results["stages_ms"].items():
+        print(f"{stage:<22}{s['p50']:>10}{s['p95']:>10}{s['p99']:>10}")
+    print(f"[Bench] Server RSS (MB): {results['rss_mb']}")
+
+    if args.out:
+        write_results(args.out, "server", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Unity YAML 附件摘要 (unity_yaml.summarize) 的耗时与内存。
+
+生成一个合成场景：N 个物体 (分组、带 MeshFilter/MeshRenderer/BoxCollider 与脚本)、若干 Prefab 实例，
+以及填充到指定大小的网格数据文档，统计摘要耗时、Python 内存峰值 (tracemalloc，单独统计；mmap 页面不计入)
+与摘要相对原文的 token 数。不需要 Unity。
+
+用法:
+  python bench_unity_yaml.py [--objects 20000] [--size-mb 100] [--out result.json]
+"""
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from bench_common import write_results
+from utils import estimate_tokens
+from unity_yaml import summarize
+
+HEADER = "%YAML 1.1\n%TAG !u! tag:unity3d.com,2011:\n"
+SCRIPT_GUID = "a1b2c3d4e5f60718293a4b5c6d7e8f90"
+BUILTIN_MESH = "{fileID: 10202, guid: 0000000000000000e000000000000000, type: 0}"
+PREFAB_GUID = "0f9e8d7c6b5a49382716051a2b3c4d5e"
+
+GAMEOBJECT = """--- !u!1 &{go}
+GameObject:
+  m_ObjectHideFlags: 0
+  m_CorrespondingSourceObject: {{fileID: 0}}
+  m_PrefabInstance: {{fileID: 0}}
+  m_PrefabAsset: {{fileID: 0}}
+  serializedVersion: 6
+  m_Component:
+{components}  m_Layer: 0
+  m_Name: {name}
+  m_TagString: Untagged
+  m_IsActive: {active}
+--- !u!4 &{tr}
+Transform:
+  m_ObjectHideFlags: 0
+  m_CorrespondingSourceObject: {{fileID: 0}}
+  m_PrefabInstance: {{fileID: 0}}
+  m_PrefabAsset: {{fileID: 0}}
+  m_GameObject: {{fileID: {go}}}
+  m_LocalRotation: {{x: 0, y: 0, z: 0, w: 1}}
+  m_LocalPosition: {{x: 1, y: 0, z: 2}}
+  m_LocalScale: {{x: 1, y: 1, z: 1}}
+  m_Children:
+{children}  m_Father: {{fileID: {father}}}
+  m_RootOrder: {order}
+"""
+COMPONENT = """--- !u!{cls} &{id}
+{type}:
+  m_ObjectHideFlags: 0
+  m_CorrespondingSourceObject: {{fileID: 0}}
+  m_PrefabInstance: {{fileID: 0}}
+  m_PrefabAsset: {{fileID: 0}}
+  m_GameObject: {{fileID: {go}}}
+  m_Enabled: 1
+{extra}"""
+PREFAB_INSTANCE = """--- !u!1001 &{id}
+PrefabInstance:
+  m_ObjectHideFlags: 0
+  serializedVersion: 2
+  m_Modification:
+    m_TransformParent: {{fileID: {parent}}}
+    m_Modifications:
+    - target: {{fileID: 100, guid: {guid}, type: 3}}
+      propertyPath: m_Name
+      value: Enemy_{n}
+      objectReference: {{fileID: 0}}
+  m_SourcePrefab: {{fileID: 100100000, guid: {guid}, type: 3}}
+--- !u!4 &{stripped} stripped
+Transform:
+  m_CorrespondingSourceObject: {{fileID: 400, guid: {guid}, type: 3}}
+  m_PrefabInstance: {{fileID: {id}}}
+  m_PrefabAsset: {{fileID: 0}}
+"""
+
+
+def write_scene(path, objects, size_mb, groups=20, prefabs=200):
+    """物体平均分到 groups 个分组下；分组 Transform 的 m_Children 包含 Prefab 实例的 stripped Transform"""
+    next_id = iter(range(1000, 1 << 62))
+    per_group = objects // groups
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for g in range(groups):
+            go, tr = next(next_id), next(next_id)
+            kids = []
+            body = []
+            for i in range(per_group):
+                cgo, ctr, mf, mr, col, mb = (next(next_id) for _ in range(6))
+                kids.append(ctr)
+                components = "".join(f"  - component: {{fileID: {c}}}\n" for c in (ctr, mf, mr, col, mb))
+                body.append(GAMEOBJECT.format(go=cgo, tr=ctr, components=components, name=f"Tree_{i}", active=1,
+                                              children="", father=tr, order=i)
+                            .replace("  m_Children:\n", "  m_Children: []\n"))
+                body.append(COMPONENT.format(cls=33, id=mf, type="MeshFilter", go=cgo,
+                                             extra=f"  m_Mesh: {BUILTIN_MESH}\n"))
+                body.append(COMPONENT.format(cls=23, id=mr, type="MeshRenderer", go=cgo, extra="  m_CastShadows: 1\n"))
+                body.append(COMPONENT.format(cls=65, id=col, type="BoxCollider", go=cgo, extra="  m_IsTrigger: 0\n"))
+                body.append(COMPONENT.format(cls=114, id=mb, type="MonoBehaviour", go=cgo,
+                                             extra=f"  m_Script: {{fileID: 11500000, guid: {SCRIPT_GUID}, type: 3}}\n"))
+            for n in range(prefabs // groups):
+                inst, stripped = next(next_id), next(next_id)
+                kids.append(stripped)
+                body.append(PREFAB_INSTANCE.format(id=inst, parent=tr, guid=PREFAB_GUID, n=g * 100 + n,
+                                                   stripped=stripped))
+            children = "".join(f"  - {{fileID: {k}}}\n" for k in kids)
+            f.write(GAMEOBJECT.format(go=go, tr=tr, components=f"  - component: {{fileID: {tr}}}\n",
+                                      name=f"Group_{g}", active=1, children=children, father=0, order=g))
+            f.write("".join(body))
+        # 网格等大块数据：摘要应直接跳过
+        blob = "0123456789abcdef" * 4096
+        mesh = 0
+        while f.tell() < size_mb * 1024 * 1024:
+            f.write(f"--- !u!43 &{next(next_id)}\nMesh:\n  m_Name: Mesh_{mesh}\n  m_VertexData:\n    _typelessdata: ")
+            for _ in range(16):
+                f.write(blob)
+            f.write("\n")
+            mesh += 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=20000)
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--out", default=None, help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".unity", prefix="aiskills_scene_")
+    os.close(fd)
+    try:
+        write_scene(path, args.objects, args.size_mb)
+        size = os.path.getsize(path)
+        resolve = {SCRIPT_GUID: "Assets/Scripts/TreeSway.cs", PREFAB_GUID: "Assets/Prefabs/Enemy.prefab"}.get
+
+        t0 = time.perf_counter()
+        summary = summarize(path, "Assets/Scenes/Bench.unity", resolve)
+        elapsed = time.perf_counter() - t0
+        # tracemalloc 会明显拖慢解析，内存峰值单独再跑一次
+        tracemalloc.start()
+        summarize(path, "Assets/Scenes/Bench.unity", resolve)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.remove(path)
+
+    result = {"file_mb": round(size / 1048576, 1), "summarize_ms": round(elapsed * 1000, 1),
+              "mb_per_s": round(size / 1048576 / elapsed, 1), "peak_python_mb": round(peak / 1048576, 1),
+              "summary_chars": len(summary), "summary_tokens": estimate_tokens(summary),
+              "raw_tokens_estimate": size // 4}
+    print(summary[:600] + "\n...")
+    print(f"[Bench] {result['file_mb']} MB scene, {args.objects} objects")
+    for key in ("summarize_ms", "mb_per_s", "peak_python_mb", "summary_tokens", "raw_tokens_estimate"):
+        print(f"{key:<22}{result[key]:>12}")
+
+    if args.out:
+        write_results(args.out, "unity_yaml", {"objects": args.objects, **result})
+
+
+if __name__ == "__main__":
+    main()
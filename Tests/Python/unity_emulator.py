@@ -0,0 +1,526 @@
+"""
+Unity Bridge 替身 (无需打开 Unity)：在本机监听 8081 帧协议，行为与 AiSkillsBridge 一致。
+
+- 每个客户端一个读线程，ping / cancel / shutdown 直接在读线程处理；
+- exec / batch 进入队列，由一个模拟 EditorApplication.update 的"主线程"按帧执行，
+  遵守 budget_ms 帧预算，生成器脚本作为 Job 逐帧推进，支持 chunk / progress / logs；
+- 脚本通过真实的 aiskills.runtime 执行，UnityEngine / UnityEditor / clr / System 为桩模块，
+  任意属性访问、调用都返回桩对象，遍历结果为空。
+
+桩模块安装在当前进程的 sys.modules 中，aiskills.runtime 的状态也是进程级的，
+因此同一进程内同一时间只应运行一个替身。
+
+测试中使用:
+    with UnityEmulator(latency_ms=2) as emu:
+        conn = UnityConnection(port=emu.port)
+        conn.request({"type": "exec", "code": build_command("print('hi')")})
+
+命令行:
+  python unity_emulator.py [--port 8081] [--latency-ms 0] [--frame-ms 1] [--result-size N] [--verbose]
+"""
+import sys
+import json
+import time
+import queue
+import types
+import ctypes
+import socket
+import argparse
+import threading
+import socketserver
+
+import bench_common  # noqa: F401  (设置 Core 目录的 sys.path)
+from unity_bridge import send_frame, recv_frame
+
+DEFAULT_FRAME_BUDGET_MS = 10
+
+
+class _Stub(types.ModuleType):
+    """代替 Unity 的 CLR 命名空间与类型：属性、调用、下标都返回桩对象，遍历为空"""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        stub = _Stub(f"{self.__name__}.{name}")
+        setattr(self, name, stub)
+        return stub
+
+    def __call__(self, *args, **kwargs):
+        return _Stub(f"{self.__name__}()")
+
+    def __getitem__(self, key):
+        return _Stub(f"{self.__name__}[]")
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __bool__(self):
+        return True
+
+
+class _Delegate:
+    """System.Action[T](fn) 直接返回 fn，使 C# 回调 (如 BeginLogCapture 的 sink) 可用"""
+
+    def __class_getitem__(cls, item):
+        return lambda fn: fn
+
+
+class _Array:
+    """System.Array[T](items) 与 System.Array.CreateInstance(T, n) 以 list 代替"""
+
+    def __class_getitem__(cls, item):
+        return list
+
+    @staticmethod
+    def CreateInstance(item_type, length):
+        return [item_type()] * length
+
+
+def _marshal_copy(source, destination, start, length):
+    """Marshal.Copy(IntPtr, float[], start, length)：按地址读取 float32"""
+    data = (ctypes.c_float * length).from_address(source)
+    destination[start:start + length] = list(data)
+
+
+class _Command:
+    """对应 C# 的 BridgeCommand"""
+
+    def __init__(self, client, msg):
+        self.client = client
+        self.id = msg.get("id", 0)
+        self.code = msg.get("code", "")
+        self.scripts = msg.get("scripts")
+        self.budget_ms = msg.get("budget_ms") or DEFAULT_FRAME_BUDGET_MS
+        self.stop_on_error = msg.get("stop_on_error", False)
+        self.next = 0
+        self.failed = False
+        self.results = []
+        self.responded = False
+        self.chunks = 0
+        self.logs = None
+        self.cancelled = False
+        self.job_id = 0
+
+    @property
+    def is_batch(self):
+        return self.scripts is not None
+
+    @property
+    def is_finished(self):
+        return (not self.is_batch or self.next >= len(self.scripts)
+                or (self.stop_on_error and self.failed) or self.cancelled)
+
+
+class _Client:
+    def __init__(self, sock):
+        self.sock = sock
+        self.commands = {}
+        self.connected = True
+        self._lock = threading.Lock()
+
+    def write(self, msg):
+        with self._lock:
+            send_frame(self.sock, msg)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # 与 BridgeClient 一致 (NoDelay = true)，否则 Nagle 与延迟 ACK 会让流水线请求多等约 40 ms
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.emulator._client_loop(_Client(self.request))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class UnityEmulator:
+    """
+    latency_ms: 每条指令开始执行前的额外延迟 (模拟等待编辑器下一次 update)
+    frame_ms: 模拟的编辑器帧间隔，Job 每帧推进一次
+    result_size: 设置后不执行脚本，直接回复 message 为该字节数的结果 (纯传输基准)
+    verbose: 输出脚本的 print / Debug.Log，默认丢弃
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0, frame_ms=1, result_size=None, verbose=False):
+        self.latency_ms = latency_ms
+        self.frame_ms = frame_ms
+        self.result_size = result_size
+        self.verbose = verbose
+        self.stats = {"commands": 0, "scripts": 0, "jobs": 0, "chunks": 0, "progress": 0, "console_lines": 0,
+                      "bulk_objects": 0, "scene_digests": 0}
+        self.scene_version = "emulator-0"
+        self.scene_digest = "Scene: Emulator (2 objects)\nMain Camera [Cam,AL]\nDirectional Light [L]\n"
+
+        self._queue = queue.Queue()
+        self._jobs = []
+        self._active_batch = None
+        self._current = None
+        self._last_job_id = 0
+        self._log_sink = None
+        self._running = False
+        self._server = _Server((host, port), _Handler)
+        self._server.emulator = self
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._install_modules()
+        self._stdout, sys.stdout = sys.stdout, _Console(self, sys.stdout)
+        self._running = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self._main = threading.Thread(target=self._main_loop, daemon=True)
+        self._main.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._server.shutdown()
+        self._server.server_close()
+        self._main.join(timeout=2)
+        sys.stdout = self._stdout
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # --- 桩模块 ---
+
+    def _install_modules(self):
+        UnityEngine = _Stub("UnityEngine")
+        UnityEngine.Debug = types.SimpleNamespace(Log=self._debug_log, LogWarning=self._debug_log,
+                                                  LogError=self._debug_log)
+        UnityEngine.Application = types.SimpleNamespace(dataPath="/tmp/UnityEmulator/Assets", isPlaying=False)
+        UnityEditor = _Stub("UnityEditor")
+
+        System = _Stub("System")
+        System.AppDomain = types.SimpleNamespace(CurrentDomain=types.SimpleNamespace(Id=1, GetAssemblies=lambda: []))
+        System.Action = _Delegate
+        System.Array = _Array
+        System.Single, System.Int32, System.Int64, System.IntPtr, System.String = float, int, int, int, str
+        System.Runtime.InteropServices.Marshal.Copy = _marshal_copy
+
+        clr = types.ModuleType("clr")
+        clr.AddReference = lambda name: None
+        clr.GetClrType = lambda t: t
+
+        core = types.ModuleType("Observater.AiSkills.Runtime.Core")
+        core.AiSkillsBridge = self._bridge_type()
+
+        modules = {
+            "clr": clr,
+            "System": System,
+            "UnityEngine": UnityEngine,
+            "UnityEngine.UI": UnityEngine.UI,
+            "UnityEngine.SceneManagement": UnityEngine.SceneManagement,
+            "UnityEditor": UnityEditor,
+            "UnityEditor.SceneManagement": UnityEditor.SceneManagement,
+            "UnityEditor.Animations": UnityEditor.Animations,
+            "Observater": types.ModuleType("Observater"),
+            "Observater.AiSkills": types.ModuleType("Observater.AiSkills"),
+            "Observater.AiSkills.Runtime": types.ModuleType("Observater.AiSkills.Runtime"),
+            "Observater.AiSkills.Runtime.Core": core,
+        }
+        sys.modules.update(modules)
+
+        # 每次启动视为全新的编辑器：已导入的 aiskills 持有上一次的桩模块与 Bridge，需要重新导入
+        for name in [n for n in sys.modules if n == "aiskills" or n.startswith("aiskills.")]:
+            del sys.modules[name]
+
+    def _bridge_type(self):
+        """C# AiSkillsBridge 的静态方法集合"""
+        emu = self
+        return type("AiSkillsBridge", (), {
+            "SendMessage": staticmethod(lambda msg: emu._respond({"status": "ok", "message": msg})),
+            "SendResult": staticmethod(lambda text: emu._respond_raw(f'{{"status":"ok", "data": {text}}}')),
+            "SendError": staticmethod(lambda err: emu._respond({"status": "error", "message": err}, failed=True)),
+            "EndResult": staticmethod(lambda msg: emu._respond({"status": "ok", "message": msg, "streamed": True})),
+            "SendChunk": staticmethod(emu._send_chunk),
+            "BeginJob": staticmethod(emu._begin_job),
+            "IsCancelled": staticmethod(lambda: bool(emu._current and emu._current.cancelled)),
+            "Progress": staticmethod(emu._progress),
+            "BeginLogCapture": staticmethod(emu._begin_log_capture),
+            "EndLogCapture": staticmethod(emu._end_log_capture),
+            "AttachLogs": staticmethod(emu._attach_logs),
+            "Config": None,
+            "Bulk": types.SimpleNamespace(SetTransforms=emu._bulk_set_transforms, SpawnPrefab=emu._bulk_spawn_prefab),
+            "Hierarchy": types.SimpleNamespace(Find=lambda name: sys.modules["UnityEngine"].GameObject.Find(name),
+                                               FindAll=lambda name, include_inactive=False: [],
+                                               FindWithComponent=lambda component_type, include_inactive=False: [],
+                                               GetPath=lambda go: go.name, Invalidate=lambda: None,
+                                               Count=0, Version=0),
+        })
+
+    def _debug_log(self, msg):
+        if self._log_sink is not None and threading.current_thread() is self._main:
+            self._log_sink(str(msg))
+            return
+        self.stats["console_lines"] += 1
+        if self.verbose:
+            sys.__stdout__.write(f"[Unity] {msg}\n")
+
+    # --- 读线程 (对应 ClientLoop) ---
+
+    def _client_loop(self, client):
+        try:
+            while self._running:
+                msg = recv_frame(client.sock)
+                kind = msg.get("type")
+                if kind == "ping":
+                    client.write({"id": msg.get("id", 0), "type": "pong"})
+                elif kind == "shutdown":
+                    return
+                elif kind in ("exec", "batch"):
+                    command = _Command(client, msg)
+                    client.commands[command.id] = command
+                    self._queue.put(command)
+                elif kind == "scene":
+                    client.write({"id": msg.get("id", 0), "type": "result", "payload": self._scene_reply(msg)})
+                elif kind == "cancel":
+                    command = client.commands.get(msg.get("target", 0))
+                    if command is not None:
+                        command.cancelled = True
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            client.connected = False
+
+    # --- 主线程 (对应 OnUpdate) ---
+
+    def _main_loop(self):
+        while self._running:
+            self._step_jobs()
+            frame = time.perf_counter()
+            budget = DEFAULT_FRAME_BUDGET_MS
+            while True:
+                command = self._active_batch
+                if command is None:
+                    try:
+                        idle = not self._jobs
+                        command = self._queue.get(timeout=0.05) if idle else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    self.stats["commands"] += 1
+                    if self.latency_ms:
+                        time.sleep(self.latency_ms / 1000.0)
+
+                if not command.client.connected:
+                    self._active_batch = None
+                elif command.cancelled and self._active_batch is None:
+                    self._write_result(command, {"status": "error", "message": "Cancelled before start."})
+                elif command.is_batch:
+                    budget = command.budget_ms
+                    if not command.is_finished:
+                        self._run_batch_step(command)
+                    self._active_batch = None if command.is_finished else command
+                    if self._active_batch is None:
+                        self._send_batch_result(command)
+                else:
+                    self._run_command(command, command.code)
+
+                if (time.perf_counter() - frame) * 1000 >= budget:
+                    break
+            if self.frame_ms:
+                time.sleep(self.frame_ms / 1000.0)
+
+    def _step_jobs(self):
+        for job in list(self._jobs):
+            if not job.client.connected:
+                job.cancelled = True
+            slice_ms = max(1, job.budget_ms // len(self._jobs))
+            self._current = job
+            try:
+                self._run_python(f"import aiskills.runtime as _rt\n_rt.step_job({job.job_id}, {slice_ms})")
+            finally:
+                self._end_log_capture()
+                self._current = None
+            if job.responded:
+                self._jobs.remove(job)
+
+    def _run_batch_step(self, command):
+        index = command.next
+        command.next += 1
+        command.responded = False
+        command.chunks = 0
+        self._run_command(command, command.scripts[index])
+        if not command.responded:
+            command.results.append('{"status":"ok","message":"Done."}')
+
+    def _run_command(self, command, code):
+        self.stats["scripts"] += 1
+        self._current = command
+        try:
+            if self.result_size is not None:
+                self._respond({"status": "ok", "message": "x" * self.result_size})
+            else:
+                self._run_python(code)
+        finally:
+            self._end_log_capture()
+            self._current = None
+
+    def _run_python(self, code):
+        """对应 PythonRunner.RunString"""
+        try:
+            exec(compile(code, "<RunString>", "exec"), {"__name__": "__main__"})
+        except Exception as e:
+            self._respond({"status": "error", "message": f"Unity Error: {e}"}, failed=True)
+        finally:
+            sys.stdout.flush()
+
+    # --- Bridge 方法 ---
+
+    def _respond(self, payload, failed=False):
+        self._respond_raw(json.dumps(payload, ensure_ascii=False), failed)
+
+    def _respond_raw(self, package, failed=False):
+        command = self._current
+        if command is None or command.responded:
+            return
+        command.responded = True
+        if command.logs is not None:
+            package = package[:package.rindex("}")] + f',"logs":{command.logs}}}'
+            command.logs = None
+        if command.is_batch:
+            command.results.append(package)
+            command.failed = command.failed or failed
+            return
+        self._write_result(command, json.loads(package))
+
+    def _send_batch_result(self, command):
+        status = "error" if command.failed else "ok"
+        results = [json.loads(r) for r in command.results]
+        self._write_result(command, {"status": status,
+                                     "message": f"{len(results)}/{len(command.scripts)} scripts executed",
+                                     "results": results})
+
+    def _write_result(self, command, payload):
+        command.client.commands.pop(command.id, None)
+        try:
+            command.client.write({"id": command.id, "type": "result", "payload": payload})
+        except OSError:
+            pass
+
+    def _send_chunk(self, fragment):
+        command = self._current
+        if command is None or command.responded:
+            return
+        msg = {"id": command.id, "type": "chunk", "seq": command.chunks, "data": fragment}
+        if command.is_batch:
+            msg["index"] = command.next - 1
+        command.client.write(msg)
+        command.chunks += 1
+        self.stats["chunks"] += 1
+
+    def _begin_job(self):
+        command = self._current
+        if command is None:
+            raise RuntimeError("No command is executing")
+        if command.is_batch:
+            raise RuntimeError("Generator scripts cannot run inside a batch")
+        self._last_job_id += 1
+        command.job_id = self._last_job_id
+        self._jobs.append(command)
+        self.stats["jobs"] += 1
+        return command.job_id
+
+    def _progress(self, done, total, label):
+        command = self._current
+        if command is None or command.responded:
+            return
+        command.client.write({"id": command.id, "type": "progress", "done": done, "total": total, "label": label})
+        self.stats["progress"] += 1
+
+    def _scene_reply(self, msg):
+        """对应 AiSkillsBridge.SceneDigest.Reply；替身中场景不会变化，快照为固定文本"""
+        if msg.get("since") == self.scene_version:
+            return {"status": "ok", "version": self.scene_version, "unchanged": True}
+        self.stats["scene_digests"] += 1
+        return {"status": "ok", "version": self.scene_version, "digest": self.scene_digest[:msg.get("max_chars") or None]}
+
+    def _bulk_set_transforms(self, targets, packed, layout="prs"):
+        """与 AiSkillsBridge.Bulk.SetTransforms 相同的参数检查，所有目标视为已找到"""
+        if not layout or layout.strip("prs"):
+            raise ValueError(f"Invalid layout '{layout}', expected a combination of p, r and s.")
+        if len(packed) != len(targets) * len(layout) * 3:
+            raise ValueError(f"packed must contain {len(layout) * 3} floats per target, got {len(packed)}.")
+        self.stats["bulk_objects"] += len(targets)
+        return len(targets)
+
+    def _bulk_spawn_prefab(self, path, positions, parent_name=None, name_prefix=None):
+        if len(positions) % 3:
+            raise ValueError("positions must contain x, y, z for every instance.")
+        count = len(positions) // 3
+        self.stats["bulk_objects"] += count
+        return list(range(1000, 1000 + count))
+
+    def _begin_log_capture(self, sink):
+        if self._log_sink is None:
+            self._log_sink = sink
+
+    def _end_log_capture(self):
+        self._log_sink = None
+
+    def _attach_logs(self, logs_json):
+        command = self._current
+        if command is not None and not command.responded:
+            command.logs = logs_json
+
+
+class _Console:
+    """
+    替换 sys.stdout：替身主线程 (即脚本) 的 print 进入模拟的 Unity Console，
+    其他线程 (测试代码本身) 照常输出
+    """
+
+    def __init__(self, emulator, stdout):
+        self._emulator = emulator
+        self._stdout = stdout
+        self._partial = ""
+
+    def write(self, s):
+        if threading.current_thread() is not self._emulator._main:
+            return self._stdout.write(s)
+        *lines, self._partial = (self._partial + s).split("\n")
+        for line in lines:
+            self._emulator._debug_log(line)
+        return len(s)
+
+    def flush(self):
+        if threading.current_thread() is not self._emulator._main:
+            self._stdout.flush()
+        elif self._partial:
+            self._emulator._debug_log(self._partial)
+            self._partial = ""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0, help="每条指令执行前的额外延迟")
+    parser.add_argument("--frame-ms", type=float, default=1, help="模拟的编辑器帧间隔")
+    parser.add_argument("--result-size", type=int, default=None, help="不执行脚本，直接回复该字节数的结果")
+    parser.add_argument("--verbose", action="store_true", help="输出脚本的 print / Debug.Log")
+    args = parser.parse_args()
+
+    emu = UnityEmulator(args.host, args.port, args.latency_ms, args.frame_ms, args.result_size, args.verbose)
+    with emu:
+        print(f"[Emulator] Listening on {args.host}:{emu.port} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"[Emulator] Stopped. {emu.stats}")
+
+
+if __name__ == "__main__":
+    main()